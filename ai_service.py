@@ -1,21 +1,19 @@
 # [file name]: ai_service.py
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
-import json
+import llm_gateway
+import metrics
+from config import COURSE_CONTEXT_TOP_K
+from course_index import course_indexes
 
 # Load environment variables
 load_dotenv()
 
 class AILearningAssistant:
     def __init__(self):
-        self.api_key = os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
+        if not llm_gateway.is_available():
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
     def generate_learning_response(self, user_message, course_context, chat_history=None):
         """Generate dynamic AI response based on course context and chat history"""
         
@@ -23,20 +21,35 @@ class AILearningAssistant:
         context_prompt = self._build_context_prompt(course_context, chat_history, user_message)
         
         try:
-            response = self.model.generate_content(context_prompt)
-            return response.text
+            return llm_gateway.generate_text(context_prompt)
         except Exception as e:
             print(f"Error calling Gemini API: {e}")
             return self._get_fallback_response(user_message)
     
+    def stream_learning_response(self, user_message, course_context, chat_history=None):
+        """Yield the AI response in chunks as Gemini generates it"""
+        
+        context_prompt = self._build_context_prompt(course_context, chat_history, user_message)
+        
+        streamed_any = False
+        try:
+            for chunk in llm_gateway.stream_text(context_prompt):
+                streamed_any = True
+                yield chunk
+        except Exception as e:
+            print(f"Error streaming from Gemini API: {e}")
+            # Only fall back if the learner hasn't seen a partial answer yet
+            if not streamed_any:
+                yield self._get_fallback_response(user_message)
+    
     def _build_context_prompt(self, course_context, chat_history, user_message):
         """Build a comprehensive prompt for the AI"""
         
         prompt = f"""
         You are an AI Learning Assistant helping a student learn about: {course_context['course_name']}
         
-        COURSE STRUCTURE:
-        {json.dumps(course_context['structure'], indent=2)}
+        COURSE CONTEXT (current unit and the lessons most relevant to the question):
+        {self._course_context(course_context, user_message)}
         
         CURRENT LEARNING CONTEXT:
         - Current Unit: {course_context.get('current_unit', 'Not specified')}
@@ -69,6 +82,13 @@ class AILearningAssistant:
         
         return prompt
     
+    def _course_context(self, course_context, user_message):
+        """Retrieve the current unit plus the top-k lessons matching the question"""
+        # The client's copy of the plan may have had lessons trimmed to fit its
+        # duration, so the index is built from the structure it sends
+        index = course_indexes.get(course_context.get('structure', {}), course_context.get('plan_id'))
+        return index.render_context(user_message, course_context.get('current_unit'), COURSE_CONTEXT_TOP_K)
+    
     def _format_chat_history(self, chat_history):
         """Format chat history for context"""
         if not chat_history:
@@ -85,6 +105,7 @@ class AILearningAssistant:
     
     def _get_fallback_response(self, user_message):
         """Fallback response if API fails"""
+        metrics.FALLBACKS.inc('_get_fallback_response')
         fallback_responses = [
             "I understand you're asking about your course. While I'm having some technical difficulties, I'd recommend focusing on the practical examples in your syllabus to reinforce your learning.",
             "That's a great question about your course material. Let me suggest reviewing the key concepts in your lesson plan and trying out the practice exercises.",
@@ -93,6 +114,3 @@ class AILearningAssistant:
         
         import random
         return random.choice(fallback_responses)
-
-# Global instance
-ai_assistant = AILearningAssistant()
\ No newline at end of file
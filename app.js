@@ -395,17 +395,21 @@ class AIDurationPlanner {
 
         } catch (error) {
             console.warn('❌ AI study plan failed, using basic schedule:', error);
-            return {
-                study_plan: DurationParser.generateStudySchedule(durationConstraint),
-                learning_strategy: durationConstraint.constraintType === 'hours' 
-                    ? "Intensive focused learning approach" 
-                    : "Progressive learning approach",
-                success_tips: durationConstraint.constraintType === 'hours'
-                    ? ["Take short breaks every hour", "Stay hydrated", "Focus on practical application"]
-                    : ["Take regular breaks", "Practice consistently", "Review previous lessons"]
-            };
+            return AIDurationPlanner.basicStudyPlan(durationConstraint);
         }
     }
+
+    static basicStudyPlan(durationConstraint) {
+        return {
+            study_plan: DurationParser.generateStudySchedule(durationConstraint),
+            learning_strategy: durationConstraint.constraintType === 'hours' 
+                ? "Intensive focused learning approach" 
+                : "Progressive learning approach",
+            success_tips: durationConstraint.constraintType === 'hours'
+                ? ["Take short breaks every hour", "Stay hydrated", "Focus on practical application"]
+                : ["Take regular breaks", "Practice consistently", "Review previous lessons"]
+        };
+    }
 }
 
 // DOM Elements
@@ -486,25 +490,29 @@ async function generateGoalOverview(learningGoal) {
         const data = await response.json();
         
         if (data.overview) {
-            const overviewHTML = `
-                <div class="ai-goal-overview fade-in">
-                    <h3><i class="fas fa-lightbulb"></i> AI-Generated Goal Overview</h3>
-                    <p>${data.overview}</p>
-                </div>
-            `;
-
-            // ✅ Remove old overview if it exists
-            const existingOverview = elements.unitsContainer.querySelector('.ai-goal-overview');
-            if (existingOverview) existingOverview.remove();
-
-            // ✅ Insert just before Units section
-            elements.unitsContainer.insertAdjacentHTML('afterbegin', overviewHTML);
+            renderGoalOverview(data.overview);
         }
     } catch (err) {
         console.error("❌ Failed to fetch AI overview:", err);
     }
 }
 
+function renderGoalOverview(overview) {
+    const overviewHTML = `
+        <div class="ai-goal-overview fade-in">
+            <h3><i class="fas fa-lightbulb"></i> AI-Generated Goal Overview</h3>
+            <p>${overview}</p>
+        </div>
+    `;
+
+    // ✅ Remove old overview if it exists
+    const existingOverview = elements.unitsContainer.querySelector('.ai-goal-overview');
+    if (existingOverview) existingOverview.remove();
+
+    // ✅ Insert just before Units section
+    elements.unitsContainer.insertAdjacentHTML('afterbegin', overviewHTML);
+}
+
 
 // Generate lesson plan with AI optimization
 async function generateLessonPlan() {
@@ -515,58 +523,23 @@ async function generateLessonPlan() {
         return;
     }
 
-    // ✅ Now generate the AI overview only if there’s a valid goal
-    await generateGoalOverview(learningGoal);
-    
     showLoadingState();
     
     try {
         console.log('📤 Generating AI-optimized lesson plan for:', learningGoal);
         
-        // Step 1: Get AI-optimized duration from Gemini
-        showMessage('🤖 Gemini AI is analyzing your learning goal...', 'success');
-        const durationConstraint = await AIDurationPlanner.getSmartDuration(learningGoal, true);
-        console.log('⏰ AI duration constraint:', durationConstraint);
-        
-        // Step 2: Generate smart study plan with AI
-        showMessage('📚 Creating AI-optimized study schedule...', 'success');
-        const studyPlan = await AIDurationPlanner.generateSmartStudyPlan(learningGoal, durationConstraint);
-        console.log('📅 AI study plan:', studyPlan);
-        
-        // Step 3: Generate the actual lesson plan with duration constraint
-        showMessage('🎯 Generating detailed lesson content...', 'success');
-        const response = await fetch(`${API_BASE}/generate-plan`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ 
-                goal: learningGoal,
-                duration_constraint: durationConstraint
-            })
-        });
-        
-        console.log('📥 Response status:', response.status);
-        
-        if (!response.ok) {
-            let errorMessage = `Server error: ${response.status}`;
-            try {
-                const errorData = await response.json();
-                errorMessage = errorData.error || errorMessage;
-            } catch (e) {
-                errorMessage = response.statusText || errorMessage;
-            }
-            throw new Error(errorMessage);
+        // One bundle request runs every AI call on the server in parallel
+        let result;
+        try {
+            result = await requestPlanBundle(learningGoal);
+        } catch (error) {
+            console.warn('❌ Plan bundle unavailable, requesting steps one by one:', error);
+            result = await generateStepByStep(learningGoal);
         }
-        
-        const data = await response.json();
+        const { durationConstraint, studyPlan, data } = result;
         console.log('✅ Received lesson plan:', data);
         
-        if (data.error) {
-            throw new Error(data.error);
-        }
-        
-        // Step 4: Combine AI insights with lesson plan
+        // Combine AI insights with lesson plan
         const validatedPlan = DurationParser.validatePlanDuration(data, durationConstraint);
         validatedPlan.aiStudyPlan = studyPlan;
         validatedPlan.durationConstraint = durationConstraint;
@@ -574,7 +547,6 @@ async function generateLessonPlan() {
         currentLessonPlan = validatedPlan;
         
         displayResults(validatedPlan);
-        await fetchResources(learningGoal);
 
         // ✅ Add Resource Corner Button
         const resourceButtonHTML = `
@@ -608,6 +580,102 @@ document.getElementById("openResourceCorner").addEventListener("click", () => {
 }
 
 
+// Fetch overview, duration, study plan, lesson plan and resources in one streamed request
+async function requestPlanBundle(learningGoal) {
+    showMessage('🤖 Gemini AI is analyzing your learning goal...', 'success');
+    
+    const response = await fetch(`${API_BASE}/plan-bundle`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ goal: learningGoal, stream: true })
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error(`Server error: ${response.status}`);
+    }
+    
+    const parts = {};
+    const handlePart = (line) => {
+        if (!line.trim()) return;
+        const part = JSON.parse(line);
+        parts[part.part] = part;
+        
+        // Show what is ready while the rest is still being generated
+        if (part.part === 'overview' && part.data.overview) {
+            renderGoalOverview(part.data.overview);
+        } else if (part.part === 'resources') {
+            storeResources(part.data);
+        } else if (part.part === 'unit') {
+            renderStreamedUnit(part);
+        } else if (part.part === 'study_plan') {
+            showMessage('🎯 Generating detailed lesson content...', 'success');
+        }
+    };
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handlePart);
+    }
+    handlePart(buffer);
+    
+    const plan = parts.plan;
+    if (!plan || plan.status !== 200) {
+        throw new Error((plan && plan.data.error) || 'Lesson plan generation failed');
+    }
+    
+    const durationConstraint = parts.duration.data.duration_constraint;
+    const studyPlanPart = parts.study_plan;
+    const studyPlan = studyPlanPart && studyPlanPart.status === 200
+        ? studyPlanPart.data.study_plan
+        : AIDurationPlanner.basicStudyPlan(durationConstraint);
+    
+    return { durationConstraint, studyPlan, data: plan.data };
+}
+
+// Show lesson plan units as the server streams them; the final plan replaces them
+function renderStreamedUnit(part) {
+    if (part.unit_number === 1) {
+        elements.unitsContainer.querySelectorAll('.unit-card').forEach(unit => unit.remove());
+        elements.resultsSection.classList.remove('hidden');
+    }
+    elements.unitsContainer.appendChild(createUnitElement(part.unit, part.unit_number));
+    showMessage(`🎯 Unit ${part.unit_number} ready, generating the rest...`, 'success');
+}
+
+// Previous request-by-request flow, used when the bundle endpoint is unavailable
+async function generateStepByStep(learningGoal) {
+    await generateGoalOverview(learningGoal);
+    
+    // Step 1: Get AI-optimized duration from Gemini
+    showMessage('🤖 Gemini AI is analyzing your learning goal...', 'success');
+    const durationConstraint = await AIDurationPlanner.getSmartDuration(learningGoal, true);
+    console.log('⏰ AI duration constraint:', durationConstraint);
+    
+    // Step 2: Generate smart study plan with AI
+    showMessage('📚 Creating AI-optimized study schedule...', 'success');
+    const studyPlan = await AIDurationPlanner.generateSmartStudyPlan(learningGoal, durationConstraint);
+    console.log('📅 AI study plan:', studyPlan);
+    
+    // Step 3: Generate the actual lesson plan with duration constraint
+    showMessage('🎯 Generating detailed lesson content...', 'success');
+    const data = await requestLessonPlan(learningGoal, durationConstraint);
+    
+    await fetchResources(learningGoal);
+    
+    return { durationConstraint, studyPlan, data };
+}
+
 // Show loading state
 function showLoadingState() {
     elements.loadingSection.classList.remove('hidden');
@@ -625,13 +693,16 @@ function hideLoadingState() {
     elements.generateBtn.innerHTML = '<i class="fas fa-magic"></i> Generate AI Lesson Plan';
 }
 
-// Animate progress steps
+// Animate progress steps until the server reports real progress
+let progressInterval = null;
+
 function animateProgressSteps() {
     const steps = document.querySelectorAll('.progress-steps .step');
     steps.forEach(step => step.classList.remove('active'));
     
     let currentStep = 0;
-    const stepInterval = setInterval(() => {
+    clearInterval(progressInterval);
+    progressInterval = setInterval(() => {
         if (currentStep > 0) {
             steps[currentStep - 1].classList.remove('active');
         }
@@ -640,10 +711,76 @@ function animateProgressSteps() {
             steps[currentStep].classList.add('active');
             currentStep++;
         } else {
-            clearInterval(stepInterval);
+            clearInterval(progressInterval);
         }
     }, 800);
 }
+
+// Highlight the progress step matching a server-side job stage
+const JOB_STAGE_STEPS = { syllabus: 1, duration: 2, lesson_plan: 3 };
+
+function setProgressStep(stage) {
+    const stepIndex = JOB_STAGE_STEPS[stage];
+    if (stepIndex === undefined) return;
+    
+    clearInterval(progressInterval);
+    const steps = document.querySelectorAll('.progress-steps .step');
+    steps.forEach((step, index) => step.classList.toggle('active', index === stepIndex));
+}
+
+// Submit the lesson plan as a background job and poll until it finishes
+async function requestLessonPlan(learningGoal, durationConstraint) {
+    const response = await fetch(`${API_BASE}/generate-plan`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ 
+            goal: learningGoal,
+            duration_constraint: durationConstraint,
+            async: true
+        })
+    });
+    
+    console.log('📥 Response status:', response.status);
+    
+    if (!response.ok) {
+        let errorMessage = `Server error: ${response.status}`;
+        try {
+            const errorData = await response.json();
+            errorMessage = errorData.error || errorMessage;
+        } catch (e) {
+            errorMessage = response.statusText || errorMessage;
+        }
+        throw new Error(errorMessage);
+    }
+    
+    const data = await response.json();
+    if (data.error) {
+        throw new Error(data.error);
+    }
+    // Servers without the job queue answer with the plan directly
+    if (!data.job_id) return data;
+    
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 500));
+        
+        const jobResponse = await fetch(`${API_BASE}/jobs/${data.job_id}`);
+        const job = await jobResponse.json();
+        if (!jobResponse.ok) {
+            throw new Error(job.error || `Server error: ${jobResponse.status}`);
+        }
+        
+        setProgressStep(job.stage);
+        const planStage = (job.stages || []).find(stage => stage.name === 'lesson_plan');
+        if (job.stage === 'lesson_plan' && planStage && planStage.total_units) {
+            showMessage(`🎯 Building unit ${planStage.completed_units} of ${planStage.total_units}...`, 'success');
+        }
+        
+        if (job.status === 'succeeded') return job.result;
+        if (job.status === 'failed') throw new Error(job.error || 'Lesson plan generation failed');
+    }
+}
 async function fetchResources(learningGoal) {
     console.log("📚 Fetching resources for:", learningGoal);
 
@@ -655,14 +792,17 @@ async function fetchResources(learningGoal) {
         });
 
         const data = await res.json();
-        console.log("✅ Resources:", data);
-
-        localStorage.setItem("aiResources", JSON.stringify(data));
+        storeResources(data);
     } catch (err) {
         console.error("❌ Resource fetch failed:", err);
     }
 }
 
+function storeResources(data) {
+    console.log("✅ Resources:", data);
+    localStorage.setItem("aiResources", JSON.stringify(data));
+}
+
 // Display results with AI insights
 function displayResults(lessonPlan) {
     elements.resultsSection.classList.remove('hidden');
@@ -1,17 +1,18 @@
 # [file name]: app.py
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import json
 import os
 import sys
 from pathlib import Path
-import tempfile
+import copy
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import google.generativeai as genai
 from dotenv import load_dotenv
-import requests
 import json
-import time
 # Load environment variables
 load_dotenv()
 
@@ -19,91 +20,86 @@ load_dotenv()
 current_dir = Path(__file__).parent
 sys.path.append(str(current_dir))
 
+import llm_gateway
+import metrics
+import resource_validator
+from config import (
+    LLM_BACKEND, PLAN_EXPORT_DIR, PLAN_STORE_MAX_ENTRIES, PLAN_STORE_MAX_BYTES, PLAN_STORE_DB, PLAN_STORE_TTL,
+    PLAN_BATCH_MAX_WORKERS, PLAN_BATCH_MAX_GOALS,
+    PLAN_JOB_WORKERS, PLAN_JOB_MAX_PENDING, PLAN_JOB_RESULT_TTL, PLAN_JOB_DB,
+    SERVICE_WARMUP, SERVICE_WARMUP_DELAY,
+    SERVER_LONG_REQUEST_SLOTS, SERVER_LONG_REQUEST_WAIT,
+    PROFILE_ADMIN_TOKEN, PROFILE_DIR, PROFILE_MAX_FILES
+)
+from duration_parser import DurationParser, clean_many, clean_study_schedule_content
+from job_queue import JobQueue, QueueFullError
+from json_extractor import JSONExtractionError, extract_json
+from lesson_plan_generator import build_unit_plan, export_lesson_plan_async
+from lesson_plan_model import to_plain
+from plan_store import PlanStore
+from request_limits import LongRequestLimiter
+from request_profiler import RequestProfiler
+from service_registry import services
+
 # Configure Gemini AI
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
+if not llm_gateway.is_available():
     print("❌ WARNING: GEMINI_API_KEY not found in .env file")
     print("💡 Create a .env file with: GEMINI_API_KEY=your_actual_key_here")
+elif LLM_BACKEND == 'fake':
+    print("🧪 Using the offline fake Gemini backend (LLM_BACKEND=fake)")
 else:
-    genai.configure(api_key=GEMINI_API_KEY)
+    # The SDK itself is loaded on first use (or by the optional warm-up)
     print("✅ Gemini AI configured successfully")
 
-# Duration Parser for Backend
-class DurationParser:
-    @staticmethod
-    def parse_duration(learning_goal):
-        import re
-        time_patterns = [
-            r'(\d+)\s*day',
-            r'(\d+)\s*hour', 
-            r'(\d+)\s*week',
-            r'(\d+)\s*month'
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, learning_goal, re.IGNORECASE)
-            if match:
-                value = int(match.group(1))
-                if 'day' in pattern:
-                    return value * 24, f"{value} day{'s' if value > 1 else ''}"
-                elif 'hour' in pattern:
-                    return value, f"{value} hour{'s' if value > 1 else ''}"
-                elif 'week' in pattern:
-                    return value * 7 * 24, f"{value} week{'s' if value > 1 else ''}"
-                elif 'month' in pattern:
-                    return value * 30 * 24, f"{value} month{'s' if value > 1 else ''}"
-        
-        return 24, "1 day"  # Default
-
-    @staticmethod
-    def adjust_syllabus_to_duration(syllabus, max_hours):
-        """Adjust syllabus to fit within duration constraint"""
-        total_lessons = sum(len(unit.get('lessons', [])) for unit in syllabus.get('units', []))
-        
-        if total_lessons > max_hours:
-            # Reduce lessons proportionally but keep at least 1 lesson per unit
-            reduction_factor = max_hours / total_lessons
-            for unit in syllabus['units']:
-                if 'lessons' in unit:
-                    new_count = max(1, int(len(unit['lessons']) * reduction_factor))
-                    unit['lessons'] = unit['lessons'][:new_count]
-        
-        return syllabus
-
 # Import available functions
 def import_functions():
     functions = {}
     
     # Try to import syllabus_agent
     try:
-        from syllabus_agent import create_syllabus
+        from syllabus_agent import create_syllabus, stream_syllabus
         functions['create_syllabus'] = create_syllabus
+        functions['stream_syllabus'] = stream_syllabus
         print("✅ syllabus_agent imported successfully")
     except ImportError as e:
         print(f"❌ syllabus_agent import failed: {e}")
         functions['create_syllabus'] = create_fallback_syllabus
+        functions['stream_syllabus'] = stream_fallback_syllabus
     
-    # Try to import enhanced_lesson_plan
+    # Try to import lesson_plan_generator
     try:
-        from enhanced_lesson_plan import generate_comprehensive_lesson_plan
-        functions['generate_lesson_plan'] = generate_comprehensive_lesson_plan
-        print("✅ enhanced_lesson_plan imported successfully")
+        from lesson_plan_generator import build_lesson_plan
+        functions['generate_lesson_plan'] = build_lesson_plan
+        print("✅ lesson_plan_generator imported successfully")
     except ImportError as e:
-        print(f"❌ enhanced_lesson_plan import failed: {e}")
-        # Try alternative import
-        try:
-            from lesson_plan_generator import generate_detailed_lesson_plan
-            functions['generate_lesson_plan'] = lambda syllabus_file: generate_detailed_lesson_plan_from_file(syllabus_file, generate_detailed_lesson_plan)
-            print("✅ lesson_plan_generator imported successfully")
-        except ImportError as e:
-            print(f"❌ lesson_plan_generator import failed: {e}")
-            functions['generate_lesson_plan'] = generate_fallback_lesson_plan
+        print(f"❌ lesson_plan_generator import failed: {e}")
+        functions['generate_lesson_plan'] = generate_fallback_lesson_plan
     
     return functions
 
+def load_ai_assistant():
+    from ai_service import AILearningAssistant
+    return AILearningAssistant()
+
+# Built on the first chat request; a failed import or missing key is cached
+# by the registry instead of being retried on every request
+services.register('ai_assistant', load_ai_assistant)
+
+def start_warm_up():
+    """Load the Gemini SDK and client, the chat assistant and the link-check session in the background"""
+    return services.warm_up(
+        'gemini_sdk', llm_gateway.configure, 'ai_assistant', 'http_session',
+        delay=SERVICE_WARMUP_DELAY
+    )
+
+def shutdown_background_work():
+    """Let running and queued plan jobs finish before the worker exits"""
+    plan_jobs.shutdown(wait=True)
+
 def create_fallback_syllabus(goal):
     """Fallback syllabus generator with proper duration handling"""
     print(f"🔄 Using fallback syllabus for: {goal}")
+    metrics.FALLBACKS.inc('create_fallback_syllabus')
     
     # Parse duration from goal
     total_hours, duration_text = DurationParser.parse_duration(goal)
@@ -159,31 +155,19 @@ def create_fallback_syllabus(goal):
         "units": units
     }
 
-def generate_detailed_lesson_plan_from_file(syllabus_file, generate_function):
-    """Adapter for generate_detailed_lesson_plan"""
-    try:
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            syllabus = json.load(f)
-        
-        # Generate lesson plan for first unit and first lesson as sample
-        if syllabus.get('units'):
-            lesson_plan = generate_function(syllabus, 0, 0)
-            return convert_to_comprehensive_format(syllabus, lesson_plan)
-        else:
-            return generate_fallback_lesson_plan(syllabus_file)
-            
-    except Exception as e:
-        print(f"❌ Error in lesson plan generation: {e}")
-        return generate_fallback_lesson_plan(syllabus_file)
+def stream_fallback_syllabus(goal):
+    """Fallback for streaming mode: the whole fallback syllabus at once"""
+    syllabus = create_fallback_syllabus(goal)
+    for unit in syllabus['units']:
+        yield 'unit', unit
+    yield 'syllabus', syllabus
 
-def generate_fallback_lesson_plan(syllabus_file):
+def generate_fallback_lesson_plan(syllabus, on_unit=None):
     """Fallback lesson plan generator with duration awareness"""
     print("🔄 Using fallback lesson plan")
-    try:
-        with open(syllabus_file, 'r', encoding='utf-8') as f:
-            syllabus = json.load(f)
-    except:
-        syllabus = {"goal": "Unknown Course", "units": []}
+    metrics.FALLBACKS.inc('generate_fallback_lesson_plan')
+    # Work on a copy so trimming lessons doesn't touch the caller's syllabus
+    syllabus = copy.deepcopy(syllabus) if syllabus else {"goal": "Unknown Course", "units": []}
     
     # Use duration constraint if available
     duration_constraint = syllabus.get('duration_constraint', {})
@@ -203,6 +187,9 @@ def generate_fallback_lesson_plan(syllabus_file):
                 unit['lessons'] = unit['lessons'][:new_count]
         total_lessons = sum(len(unit.get('lessons', [])) for unit in syllabus.get('units', []))
     
+    if on_unit:
+        on_unit(total_units, total_units)
+    
     return {
         "course": syllabus.get('goal', 'Unknown Course'),
         "generated_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -251,65 +238,97 @@ def generate_fallback_lesson_plan(syllabus_file):
         }
     }
 
-def convert_to_comprehensive_format(syllabus, detailed_lesson_plan):
-    """Convert detailed lesson plan to comprehensive format"""
-    generated_date = detailed_lesson_plan.get('generated_date', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    total_duration = detailed_lesson_plan.get('total_estimated_duration', '20 hours')
-    duration_constraint = syllabus.get('duration_constraint', {})
-    
-    return {
-        "course": syllabus['goal'],
-        "generated_date": generated_date,
-        "total_estimated_duration": total_duration,
-        "total_units": len(syllabus.get('units', [])),
-        "duration_constraint": duration_constraint,
-        "comprehensive_lesson_plan": {
-            f"unit_{i+1}": {
-                "unit_title": unit['title'],
-                "unit_objective": f"Master {unit['title']} concepts",
-                "unit_outcomes": unit.get('outcomes', []),
-                "unit_duration": f"{max(2, len(unit.get('lessons', [])) * 1.5)} hours",
-                "total_lessons": len(unit.get('lessons', [])),
-                "lessons": [
-                    {
-                        "lesson_number": j + 1,
-                        "lesson_title": lesson_title,
-                        "lesson_duration": "1.5 hours",
-                        "key_concepts": [
-                            "Core Concepts",
-                            "Practical Applications",
-                            "Key Techniques"
-                        ],
-                        "important_topics": [
-                            "Fundamental principles",
-                            "Hands-on exercises", 
-                            "Real-world applications"
-                        ],
-                        "time_breakdown": {
-                            "theory_concepts": "30 min",
-                            "practical_exercises": "40 min",
-                            "examples_demonstrations": "15 min",
-                            "review_assessment": "5 min"
-                        }
-                    }
-                    for j, lesson_title in enumerate(unit.get('lessons', []))
-                ]
-            }
-            for i, unit in enumerate(syllabus.get('units', []))
-        }
-    }
-
 # Import available functions
 functions = import_functions()
 
 app = Flask(__name__)
 CORS(app)
 
-# Store current data
-current_data = {
-    'syllabus': None,
-    'lesson_plan': None
-}
+# Opt-in cProfile of single requests (X-Profile-Token header, see config.py)
+profiler = RequestProfiler(app.wsgi_app, PROFILE_DIR, PROFILE_ADMIN_TOKEN, PROFILE_MAX_FILES)
+
+# Routes that wait on Gemini; they can't take every thread of a worker
+LONG_REQUEST_PREFIXES = ('/api/ai/', '/api/generate-plan', '/api/plan-bundle', '/api/test-syllabus')
+
+def record_rejected_request(environ):
+    # The limiter answers before Flask runs, so the request hooks below never see these 503s
+    try:
+        rule, _ = app.url_map.bind_to_environ(environ).match(return_rule=True)
+        route = rule.rule
+    except HTTPException:
+        route = 'unmatched'
+    metrics.HTTP_REQUESTS.inc(route, environ.get('REQUEST_METHOD', 'GET'), '503')
+
+long_requests = LongRequestLimiter(profiler, LONG_REQUEST_PREFIXES, SERVER_LONG_REQUEST_SLOTS, SERVER_LONG_REQUEST_WAIT,
+                                   on_reject=record_rejected_request)
+app.wsgi_app = long_requests
+
+# Generated plans, keyed by plan ID (safe across threads, users and workers)
+plan_store = PlanStore(PLAN_STORE_MAX_ENTRIES, PLAN_STORE_MAX_BYTES, PLAN_STORE_DB, PLAN_STORE_TTL)
+
+# Background plan generation for submit/poll clients
+PLAN_JOB_STAGES = ('syllabus', 'duration', 'lesson_plan')
+plan_jobs = JobQueue(PLAN_JOB_WORKERS, PLAN_JOB_MAX_PENDING, PLAN_JOB_RESULT_TTL, db_path=PLAN_JOB_DB)
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.metrics_start = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc(g.metrics_route)
+
+@app.after_request
+def record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    # Runs after a stream_with_context response has finished streaming
+    route = g.pop('metrics_route', None)
+    if route is None:
+        return
+    metrics.HTTP_IN_FLIGHT.dec(route)
+    metrics.HTTP_LATENCY.observe(time.perf_counter() - g.pop('metrics_start'), route, request.method)
+    metrics.HTTP_REQUESTS.inc(route, request.method, str(g.pop('metrics_status', 500)))
+
+@metrics.register_collector
+def collect_app_metrics():
+    store = plan_store.snapshot()
+    jobs = plan_jobs.snapshot()
+    limits = long_requests.snapshot()
+    return [
+        ('edugpt_plan_store_plans', 'gauge', 'Plans held in the workers\' in-memory plan stores', [({}, store['plans'])]),
+        ('edugpt_plan_store_bytes', 'gauge', 'Approximate size of the stored plans', [({}, store['bytes'])]),
+        ('edugpt_plan_jobs', 'gauge', 'Background plan jobs by status',
+         [({'status': status}, count) for status, count in jobs['by_status'].items()]),
+        ('edugpt_long_requests_active', 'gauge', 'LLM-bound requests holding a slot', [({}, limits['active'])]),
+        ('edugpt_long_requests_rejected_total', 'counter', 'LLM-bound requests turned away with a 503',
+         [({}, limits['rejected'])]),
+    ]
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text format, summed over all worker processes under gunicorn (see METRICS_DIR)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """Saved request profiles, newest first (requires the X-Profile-Token header)"""
+    if not profiler.enabled:
+        return jsonify({'error': 'Request profiling is disabled'}), 404
+    if not profiler.is_authorized(request.headers.get('X-Profile-Token')):
+        return jsonify({'error': 'Invalid profile token'}), 403
+    return jsonify({'profiles': profiler.list_profiles(), 'max_files': profiler.max_files})
+
+@app.route('/api/admin/profiles/<name>', methods=['GET'])
+def download_profile(name):
+    if not profiler.enabled:
+        return jsonify({'error': 'Request profiling is disabled'}), 404
+    if not profiler.is_authorized(request.headers.get('X-Profile-Token')):
+        return jsonify({'error': 'Invalid profile token'}), 403
+    if not name.endswith('.prof'):
+        return jsonify({'error': 'Unknown profile'}), 404
+    return send_from_directory(PROFILE_DIR, name, as_attachment=True)
 
 @app.route('/')
 def index():
@@ -328,23 +347,22 @@ def health_check():
             'create_syllabus': 'create_syllabus' in functions,
             'generate_lesson_plan': 'generate_lesson_plan' in functions
         },
-        'gemini_available': bool(GEMINI_API_KEY)
+        'gemini_available': llm_gateway.is_available(),
+        'llm_backend': LLM_BACKEND,
+        'llm_cache': llm_gateway.cache_stats(),
+        'llm_rate_limiter': llm_gateway.limiter_stats(),
+        'services': services.snapshot(),
+        'plan_store': plan_store.snapshot(),
+        'plan_jobs': plan_jobs.snapshot(),
+        'long_requests': long_requests.snapshot()
     })
 
-# AI Duration Planning Endpoints
-@app.route('/api/ai/smart-duration', methods=['POST'])
-def ai_smart_duration():
-    """Use Gemini AI to determine realistic duration with STRICT hour enforcement"""
+def analyze_duration(learning_goal):
+    """
+    Use Gemini AI to determine realistic duration with STRICT hour enforcement.
+    Returns (payload, status_code) for the smart-duration route and the plan bundle.
+    """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No JSON data received'}), 400
-            
-        learning_goal = data.get('learning_goal', '').strip()
-        
-        if not learning_goal:
-            return jsonify({'error': 'Learning goal is required'}), 400
-
         print(f"🤖 Analyzing duration for: {learning_goal}")
 
         # FIRST: Parse duration using our strict parser
@@ -355,7 +373,7 @@ def ai_smart_duration():
         print(f"⏰ Hour constrained: {is_hour_constrained}")
 
         # If it's hour-constrained, FORCE the hour constraint
-        if is_hour_constrained and GEMINI_API_KEY:
+        if is_hour_constrained and llm_gateway.is_available():
             print("🚨 HOUR CONSTRAINT DETECTED - Using AI with strict enforcement")
             
             prompt = f"""
@@ -390,21 +408,10 @@ def ai_smart_duration():
             """
             
             try:
-                model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                response = model.generate_content(prompt)
+                ai_response = llm_gateway.generate_text(prompt, cache_namespace='smart_duration').strip()
+                print(f"🤖 Gemini response: {len(ai_response)} chars")
                 
-                ai_response = response.text.strip()
-                print(f"🤖 Gemini response: {ai_response}")
-                
-                # Extract JSON from response
-                if '```json' in ai_response:
-                    json_str = ai_response.split('```json')[1].split('```')[0].strip()
-                elif '```' in ai_response:
-                    json_str = ai_response.split('```')[1].split('```')[0].strip()
-                else:
-                    json_str = ai_response
-                
-                duration_data = json.loads(json_str)
+                duration_data = extract_json(ai_response)
                 
                 # FORCE the hour constraint regardless of AI response
                 duration_data['total_study_hours'] = total_hours
@@ -429,7 +436,7 @@ def ai_smart_duration():
                 }
         else:
             # For non-hour-constrained goals, use normal AI analysis
-            if GEMINI_API_KEY:
+            if llm_gateway.is_available():
                 prompt = f"""
                 Analyze this learning goal and suggest a realistic duration: "{learning_goal}"
                 
@@ -455,24 +462,14 @@ def ai_smart_duration():
                 """
                 
                 try:
-                    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                    response = model.generate_content(prompt)
-                    
-                    ai_response = response.text.strip()
-                    print(f"🤖 Gemini response: {ai_response}")
-                    
-                    # Extract JSON from response
-                    if '```json' in ai_response:
-                        json_str = ai_response.split('```json')[1].split('```')[0].strip()
-                    elif '```' in ai_response:
-                        json_str = ai_response.split('```')[1].split('```')[0].strip()
-                    else:
-                        json_str = ai_response
+                    ai_response = llm_gateway.generate_text(prompt, cache_namespace='smart_duration').strip()
+                    print(f"🤖 Gemini response: {len(ai_response)} chars")
                     
-                    duration_data = json.loads(json_str)
+                    duration_data = extract_json(ai_response)
                     
                 except Exception as ai_error:
                     print(f"❌ Gemini AI error: {ai_error}")
+                    metrics.FALLBACKS.inc('smart_duration')
                     # Fallback calculation
                     total_days = max(1, int(total_hours / 3))
                     duration_data = {
@@ -519,13 +516,14 @@ def ai_smart_duration():
         
         print(f"✅ Final duration constraint: {duration_constraint}")
         
-        return jsonify({
+        return {
             "duration_constraint": duration_constraint,
             "ai_analysis": duration_data
-        })
+        }, 200
         
     except Exception as e:
         print(f"❌ AI duration analysis failed: {str(e)}")
+        metrics.FALLBACKS.inc('smart_duration')
         # Emergency fallback
         total_hours, duration_text = DurationParser.parse_duration(learning_goal)
         is_hour_constrained = 'hour' in learning_goal.lower() or 'hr' in learning_goal.lower()
@@ -565,28 +563,40 @@ def ai_smart_duration():
                 "aiOptimized": False
             }
             
-        return jsonify({
+        return {
             "duration_constraint": fallback_constraint,
             "error": str(e),
             "fallback_used": True
-        })
-@app.route('/api/ai/goal-overview', methods=['POST'])
-def ai_goal_overview():
-    """Generate an AI overview for the learning goal before syllabus generation"""
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No JSON data received'}), 400
-        
-        learning_goal = data.get('learning_goal', '').strip()
-        if not learning_goal:
-            return jsonify({'error': 'Learning goal is required'}), 400
+        }, 200
+
+# AI Duration Planning Endpoints
+@app.route('/api/ai/smart-duration', methods=['POST'])
+def ai_smart_duration():
+    """
+    Use Gemini AI to determine realistic duration with STRICT hour enforcement.
+    An explicit hour count in the goal wins over days, weeks and months, so
+    "3 days, 2 hours/day" is parsed as 2 hours, not 72 (this route used to
+    read days first).
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
         
-        if not GEMINI_API_KEY:
-            return jsonify({
+    learning_goal = data.get('learning_goal', '').strip()
+    if not learning_goal:
+        return jsonify({'error': 'Learning goal is required'}), 400
+    
+    payload, status = analyze_duration(learning_goal)
+    return jsonify(payload), status
+
+def generate_goal_overview(learning_goal):
+    """Generate an AI overview for the learning goal, as (payload, status_code)"""
+    try:
+        if not llm_gateway.is_available():
+            return {
                 "overview": f"Your goal '{learning_goal}' sounds exciting! Unfortunately, Gemini AI is not configured, so I’ll generate a plan using default logic.",
                 "ai_generated": False
-            })
+            }, 200
 
         print(f"🧠 Generating AI overview for goal: {learning_goal}")
 
@@ -603,37 +613,46 @@ def ai_goal_overview():
         Respond with plain text (no JSON, no markdown).
         """
 
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
-        response = model.generate_content(prompt)
-        ai_text = response.text.strip()
+        ai_text = llm_gateway.generate_text(prompt, cache_namespace='goal_overview').strip()
 
-        print(f"✅ Gemini overview: {ai_text}")
-        return jsonify({"overview": ai_text, "ai_generated": True})
+        print(f"✅ Gemini overview: {len(ai_text)} chars")
+        return {"overview": ai_text, "ai_generated": True}, 200
 
     except Exception as e:
         print(f"❌ AI overview generation failed: {e}")
+        metrics.FALLBACKS.inc('goal_overview')
         fallback = f"This goal sounds interesting! I’ll create a focused learning plan to help you get started with {learning_goal}."
-        return jsonify({"overview": fallback, "ai_generated": False})
-@app.route('/api/ai/resources', methods=['POST'])
-def ai_resource_corner():
+        return {"overview": fallback, "ai_generated": False}, 200
+
+@app.route('/api/ai/goal-overview', methods=['POST'])
+def ai_goal_overview():
+    """Generate an AI overview for the learning goal before syllabus generation"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
+    
+    learning_goal = data.get('learning_goal', '').strip()
+    if not learning_goal:
+        return jsonify({'error': 'Learning goal is required'}), 400
+    
+    payload, status = generate_goal_overview(learning_goal)
+    return jsonify(payload), status
+
+def generate_resources(learning_goal):
     """
     Generate AI-curated resources (YouTube-first) and validate links.
-    Returns JSON: { goal, resources: [ {title,type,url,verified} ] }
+    Returns ({ goal, resources: [ {title,type,url,verified} ] }, status_code)
     """
     try:
-        payload = request.get_json() or {}
-        learning_goal = payload.get("learning_goal", "").strip()
-        if not learning_goal:
-            return jsonify({"error": "learning_goal required"}), 400
-
         print(f"🎯 Generating resources for: {learning_goal}")
 
-        if not GEMINI_API_KEY:
+        if not llm_gateway.is_available():
             # Fallback static resources when Gemini not configured
+            metrics.FALLBACKS.inc('resources')
             fallback = [
                 {"title": "React Native Docs", "type": "Article", "url": "https://reactnative.dev/docs/getting-started", "verified": True}
             ]
-            return jsonify({"goal": learning_goal, "resources": fallback, "ai_generated": False})
+            return {"goal": learning_goal, "resources": fallback, "ai_generated": False}, 200
 
         # Build a focused prompt that asks for JSON only (YouTube prioritized)
         prompt = f"""
@@ -646,132 +665,71 @@ def ai_resource_corner():
         ]
         """
 
-        model = genai.GenerativeModel("gemini-2.0-flash-exp")
-
-        # Try multiple attempts for 429 errors
+        # 429s are retried by the shared rate limiter in llm_gateway
         raw_text = None
-        for attempt in range(4):
-            try:
-                response = model.generate_content(prompt)
-                raw_text = response.text.strip()
-                break
-            except Exception as e:
-                errstr = str(e)
-                # handle 429 or transient errors with backoff
-                if "429" in errstr or "Resource exhausted" in errstr:
-                    wait = 2 ** attempt
-                    print(f"⏳ AI rate limit / 429 — retrying in {wait}s (attempt {attempt+1})")
-                    time.sleep(wait)
-                    continue
-                else:
-                    print("❌ AI generation error:", e)
-                    raise
+        try:
+            raw_text = llm_gateway.generate_text(prompt, cache_namespace='resources').strip()
+        except Exception as e:
+            if llm_gateway.is_rate_limited(e):
+                print(f"⏳ AI rate limit / 429 — no slot available: {e}")
+            else:
+                print("❌ AI generation error:", e)
+                raise
 
         if not raw_text:
-            return jsonify({"error": "AI temporarily unavailable"}), 503
-
-        # Extract JSON block if wrapped in ```json``` or similar
-        if "```json" in raw_text:
-            raw_json = raw_text.split("```json", 1)[1].split("```", 1)[0].strip()
-        elif "```" in raw_text:
-            raw_json = raw_text.split("```", 1)[1].split("```", 1)[0].strip()
-        else:
-            raw_json = raw_text
+            return {"error": "AI temporarily unavailable"}, 503
 
         try:
-            resources_list = json.loads(raw_json)
-        except Exception as e:
+            resources_list = extract_json(raw_text)
+        except JSONExtractionError as e:
             # If parsing fails, log and return a safe fallback
             print("⚠️ Could not parse AI JSON. Raw response:", raw_text[:400])
-            return jsonify({"error": "AI returned invalid JSON", "raw": raw_text}), 500
+            return {"error": "AI returned invalid JSON", "raw": raw_text}, 500
 
-        # Validate each resource (YouTube verification via oEmbed)
+        # Validate all resources concurrently (YouTube verification via oEmbed)
         validated = []
-        for r in resources_list:
-            try:
-                r_title = r.get("title", "").strip()
-                r_type = r.get("type", "").strip()
-                r_url = r.get("url", "").strip()
-                verified = False
-
-                if not r_url:
-                    r["verified"] = False
-                    continue
-
-                if r_type.lower() == "youtube" or "youtube.com" in r_url or "youtu.be" in r_url:
-                    # Use YouTube oEmbed to check existence
-                    oembed_url = f"https://www.youtube.com/oembed?url={requests.utils.requote_uri(r_url)}&format=json"
-                    try:
-                        resp = requests.get(oembed_url, timeout=6)
-                        if resp.status_code == 200:
-                            verified = True
-                    except requests.RequestException as re:
-                        # network error treat as unverified but keep for now
-                        print("⚠️ YouTube oEmbed check failed:", re)
-                        verified = False
-                else:
-                    # For articles / pdfs, try a HEAD request (some servers may not support HEAD)
-                    try:
-                        head = requests.head(r_url, allow_redirects=True, timeout=6)
-                        if head.status_code >= 200 and head.status_code < 400:
-                            verified = True
-                        else:
-                            # Try GET as fallback (some servers block HEAD)
-                            getr = requests.get(r_url, timeout=6)
-                            if getr.status_code >= 200 and getr.status_code < 400:
-                                verified = True
-                    except requests.RequestException as re:
-                        print("⚠️ Link validation failed for", r_url, re)
-                        verified = False
-
-                r_out = {
-                    "title": r_title or r_url,
-                    "type": "YouTube" if "youtube" in r_type.lower() or "youtu" in r_url else (r_type or "Article"),
-                    "url": r_url,
-                    "verified": verified
-                }
-
-                # Option: only include verified items. If you want to keep unverified but mark them, comment out the next two lines.
-                if verified:
-                    validated.append(r_out)
-                else:
-                    # If you'd like to keep unverified entries but mark them, use validated.append(r_out)
-                    print("ℹ️ Dropping unverified resource:", r_out.get("url"))
-
-            except Exception as e:
-                print("⚠️ Error validating resource entry:", r, e)
-                continue
+        for r_out in resource_validator.validate_resources(resources_list):
+            # Option: only include verified items. If you want to keep unverified but mark them, append r_out unconditionally.
+            if r_out["verified"]:
+                validated.append(r_out)
+            else:
+                print("ℹ️ Dropping unverified resource:", r_out.get("url"))
 
         # If AI returned no verified YT items, optionally fall back to a minimal curated list
         if len(validated) == 0:
             print("⚠️ No verified resources found — returning fallback list.")
+            metrics.FALLBACKS.inc('resources')
             fallback = [
                 {"title": "React Native Docs", "type": "Article", "url": "https://reactnative.dev/docs/getting-started", "verified": True}
             ]
-            return jsonify({"goal": learning_goal, "resources": fallback, "ai_generated": True})
+            return {"goal": learning_goal, "resources": fallback, "ai_generated": True}, 200
 
-        return jsonify({"goal": learning_goal, "resources": validated, "ai_generated": True})
+        return {"goal": learning_goal, "resources": validated, "ai_generated": True}, 200
 
     except Exception as e:
         print("❌ Exception in ai_resource_corner:", e)
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}, 500
 
-@app.route('/api/ai/study-plan', methods=['POST'])
-def ai_study_plan():
-    """Use Gemini AI to generate optimized study schedule - MODIFIED to remove Day Xh format"""
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No JSON data received'}), 400
-            
-        learning_goal = data.get('learning_goal', '').strip()
-        duration_constraint = data.get('duration_constraint', {})
-        
-        if not learning_goal:
-            return jsonify({'error': 'Learning goal is required'}), 400
+@app.route('/api/ai/resources', methods=['POST'])
+def ai_resource_corner():
+    """
+    Generate AI-curated resources (YouTube-first) and validate links.
+    Returns JSON: { goal, resources: [ {title,type,url,verified} ] }
+    """
+    payload = request.get_json() or {}
+    learning_goal = payload.get("learning_goal", "").strip()
+    if not learning_goal:
+        return jsonify({"error": "learning_goal required"}), 400
+    
+    body, status = generate_resources(learning_goal)
+    return jsonify(body), status
 
-        if not GEMINI_API_KEY:
-            return jsonify({'error': 'Gemini API key not configured'}), 500
+def generate_study_plan(learning_goal, duration_constraint):
+    """Use Gemini AI to generate optimized study schedule, as (payload, status_code)"""
+    duration_constraint = duration_constraint or {}
+    try:
+        if not llm_gateway.is_available():
+            return {'error': 'Gemini API key not configured'}, 500
 
         print(f"🤖 Gemini generating study plan for: {learning_goal}")
 
@@ -816,21 +774,10 @@ def ai_study_plan():
         """
         
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            response = model.generate_content(prompt)
+            ai_response = llm_gateway.generate_text(prompt, cache_namespace='study_plan').strip()
+            print(f"🤖 Gemini study plan response: {len(ai_response)} chars")
             
-            ai_response = response.text.strip()
-            print(f"🤖 Gemini study plan response: {ai_response}")
-            
-            # Extract JSON from response
-            if '```json' in ai_response:
-                json_str = ai_response.split('```json')[1].split('```')[0].strip()
-            elif '```' in ai_response:
-                json_str = ai_response.split('```')[1].split('```')[0].strip()
-            else:
-                json_str = ai_response
-            
-            study_plan_data = json.loads(json_str)
+            study_plan_data = extract_json(ai_response)
             
             # Clean up any remaining hour references in focus areas
             for day_plan in study_plan_data.get('study_plan', []):
@@ -840,12 +787,11 @@ def ai_study_plan():
                 
                 # Also clean learning objectives
                 if 'learning_objectives' in day_plan:
-                    day_plan['learning_objectives'] = [
-                        clean_study_schedule_content(obj) for obj in day_plan['learning_objectives']
-                    ]
+                    day_plan['learning_objectives'] = clean_many(day_plan['learning_objectives'])
             
         except Exception as ai_error:
             print(f"❌ Gemini AI error: {ai_error}")
+            metrics.FALLBACKS.inc('study_plan')
             # Fallback study plan - MODIFIED to remove hours
             study_plan_data = {
                 "study_plan": [],
@@ -887,13 +833,14 @@ def ai_study_plan():
         
         print(f"✅ AI study plan generated with {len(study_plan_data['study_plan'])} days")
         
-        return jsonify({
+        return {
             "study_plan": study_plan_data,
             "ai_optimized": True
-        })
+        }, 200
         
     except Exception as e:
         print(f"❌ AI study plan generation failed: {str(e)}")
+        metrics.FALLBACKS.inc('study_plan')
         # Fallback to basic schedule - MODIFIED to remove hours
         basic_schedule = []
         total_days = duration_constraint.get('totalDays', 1)
@@ -917,7 +864,7 @@ def ai_study_plan():
                 "study_hours": daily_hours
             })
         
-        return jsonify({
+        return {
             "study_plan": {
                 "study_plan": basic_schedule,
                 "learning_strategy": "Progressive learning from basics to advanced",
@@ -925,32 +872,155 @@ def ai_study_plan():
             },
             "ai_optimized": False,
             "error": str(e)
-        })
-def clean_study_schedule_content(content):
-    """Remove Study Period and Daily Commitment patterns from content"""
-    import re
+        }, 200
+
+@app.route('/api/ai/study-plan', methods=['POST'])
+def ai_study_plan():
+    """Use Gemini AI to generate optimized study schedule - MODIFIED to remove Day Xh format"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
+        
+    learning_goal = data.get('learning_goal', '').strip()
+    duration_constraint = data.get('duration_constraint', {})
+    
+    if not learning_goal:
+        return jsonify({'error': 'Learning goal is required'}), 400
+    
+    payload, status = generate_study_plan(learning_goal, duration_constraint)
+    return jsonify(payload), status
+
+def build_plan(learning_goal, duration_constraint=None, export=False, progress=None):
+    """
+    Generate syllabus and lesson plan for one goal, store it and return the response dict.
+    progress(stage, status, **details) is told about the syllabus, duration and
+    lesson_plan stages as they run. duration_constraint may also be a callable
+    returning the constraint; it is only called once the syllabus is ready, so
+    the duration can be worked out concurrently with syllabus generation.
+    """
+    report = progress or (lambda stage, status='running', **details: None)
+    
+    print(f"🎯 Generating lesson plan for: {learning_goal}")
+    print(f"⏰ Duration constraint: {duration_constraint}")
+    
+    # Generate syllabus with duration awareness
+    report('syllabus', 'running')
+    syllabus = functions['create_syllabus'](learning_goal)
+    report('syllabus', 'done', units=len(syllabus.get('units', [])))
+    
+    # Apply duration constraint if provided, otherwise use parsed duration
+    report('duration', 'running')
+    if callable(duration_constraint):
+        duration_constraint = duration_constraint()
+    target_hours = target_study_hours(learning_goal, duration_constraint)
+    
+    # Always apply duration adjustment to ensure realistic scope
+    syllabus = DurationParser.adjust_syllabus_to_duration(syllabus, target_hours)
+    report('duration', 'done', study_hours=target_hours)
+    
+    return complete_plan(syllabus, target_hours, export, report)
+
+def target_study_hours(learning_goal, duration_constraint=None):
+    """Study hours to plan for: the client's constraint, else 70% of the parsed duration"""
+    if duration_constraint and duration_constraint.get('totalHours'):
+        return duration_constraint['studyHours']
+    # Parse duration from goal
+    target_hours, _ = DurationParser.parse_duration(learning_goal)
+    return int(target_hours * 0.7)  # 70% for study
+
+def complete_plan(syllabus, target_hours, export=False, progress=None):
+    """Build the lesson plan for a duration-adjusted syllabus, store it and return the response dict"""
+    report = progress or (lambda stage, status='running', **details: None)
+    
+    syllabus['duration_constraint'] = {
+        'total_hours': target_hours / 0.7,  # Convert back to total hours
+        'study_hours': target_hours,
+        'duration_text': f"{target_hours} study hours"
+    }
     
-    if not content:
-        return content
+    print(f"✅ Syllabus generated with {len(syllabus.get('units', []))} units")
+    print(f"📊 Target study hours: {target_hours}")
     
-    # Remove "Day Xh" patterns (e.g., "Day 13h" -> "Day 1")
-    content = re.sub(r'Day\s*(\d+)\s*\d*h', r'Day \1', content, flags=re.IGNORECASE)
+    total_units = len(syllabus.get('units', []))
+    report('lesson_plan', 'running', completed_units=0, total_units=total_units)
+    on_unit = lambda completed, total: report('lesson_plan', 'running', completed_units=completed, total_units=total)
+    try:
+        # Generate lesson plan straight from the syllabus dict
+        lesson_plan = functions['generate_lesson_plan'](syllabus, on_unit=on_unit)
+        print("✅ Lesson plan generated successfully")
+        
+    except Exception as e:
+        print(f"❌ Lesson plan generation failed: {e}")
+        lesson_plan = generate_fallback_lesson_plan(syllabus, on_unit=on_unit)
+        print("🔄 Using fallback lesson plan")
+    report('lesson_plan', 'done', completed_units=total_units, total_units=total_units)
     
-    # Remove Study Period patterns
-    content = re.sub(r'\d+\s*Day\s*Study\s*Period\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'Study\s*Period\s*', '', content, flags=re.IGNORECASE)
+    # Expand the LessonPlan once; the store, response and export all use the JSON shape
+    lesson_plan = to_plain(lesson_plan)
+    plan_id = plan_store.put(PlanStore.new_plan_id(), syllabus, lesson_plan)
+    response = dict(lesson_plan, plan_id=plan_id)
     
-    # Remove Daily Commitment patterns  
-    content = re.sub(r'\d+h\/Day\s*Daily\s*Commitment\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'Daily\s*Commitment\s*', '', content, flags=re.IGNORECASE)
+    # Optional file export, written in the background to a per-request directory
+    if export:
+        export_dir = os.path.join(PLAN_EXPORT_DIR, plan_id)
+        export_lesson_plan_async(lesson_plan, export_dir)
+        response['export_dir'] = export_dir
+    
+    return response
+
+def stream_plan(learning_goal, duration_constraint=None, export=False):
+    """
+    Generate a plan unit by unit while the syllabus is still streaming in.
+    Yields {'event': 'unit', ...} as soon as each unit has been trimmed to the
+    remaining study-hour budget and expanded into its lesson plan entry, then
+    {'event': 'plan', 'plan': ...} with the same response build_plan returns.
+    A callable duration_constraint is only resolved once the first unit has
+    arrived, so it can be worked out while the syllabus request is in flight.
+    """
+    print(f"🎯 Streaming lesson plan for: {learning_goal}")
     
-    # Clean up any double spaces or empty lines
-    content = re.sub(r'\s+', ' ', content).strip()
+    def resolve_target_hours():
+        constraint = duration_constraint() if callable(duration_constraint) else duration_constraint
+        return target_study_hours(learning_goal, constraint)
     
-    return content
+    target_hours = remaining_hours = None
+    units = []
+    syllabus = {'goal': learning_goal}
+    for kind, item in functions['stream_syllabus'](learning_goal):
+        if kind == 'syllabus':
+            syllabus = item
+            continue
+        
+        if target_hours is None:
+            target_hours = remaining_hours = resolve_target_hours()
+        unit = DurationParser.trim_unit_to_budget(item, remaining_hours)
+        lesson_count = len(unit.get('lessons', []))
+        remaining_hours -= lesson_count
+        units.append(unit)
+        
+        # Provisional timing of one study hour per lesson until the unit count
+        # is known; the final plan event carries the exact durations
+        yield {
+            'event': 'unit',
+            'unit_number': len(units),
+            'unit_key': f'unit_{len(units)}',
+            'unit': build_unit_plan(unit, len(units), float(lesson_count), syllabus.get('goal', learning_goal))
+        }
+    
+    if target_hours is None:
+        target_hours = resolve_target_hours()
+    syllabus = dict(syllabus, units=units)
+    yield {'event': 'plan', 'plan': complete_plan(syllabus, target_hours, export)}
 
 @app.route('/api/generate-plan', methods=['POST'])
 def generate_plan():
+    """
+    Generate a syllabus and lesson plan for data['goal'] (async=1 queues it).
+    Without a client duration_constraint the goal text sets the study hours,
+    and an explicit hour count there wins over days, weeks and months:
+    "3 days, 2 hours/day" plans 2 hours (70% as study time), where this route
+    used to read days first and plan for 72.
+    """
     try:
         data = request.get_json()
         if not data:
@@ -962,70 +1032,203 @@ def generate_plan():
         if not learning_goal:
             return jsonify({'error': 'Learning goal is required'}), 400
         
-        print(f"🎯 Generating lesson plan for: {learning_goal}")
-        print(f"⏰ Duration constraint: {duration_constraint}")
+        # Submit/poll mode: hand the work to the job queue and return immediately
+        if data.get('async') or request.args.get('async') == '1':
+            try:
+                job_id = plan_jobs.submit(
+                    build_plan, learning_goal, duration_constraint, data.get('export', False),
+                    stages=PLAN_JOB_STAGES
+                )
+            except QueueFullError as e:
+                return jsonify({'error': f'Too many plans in progress, try again shortly ({e})'}), 503
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}'
+            }), 202
         
-        # Generate syllabus with duration awareness
-        syllabus = functions['create_syllabus'](learning_goal)
+        # Streaming mode: NDJSON unit events while the syllabus is generated, then the plan
+        if data.get('stream') or request.args.get('stream') == '1':
+            def generate():
+                try:
+                    for event in stream_plan(learning_goal, duration_constraint, data.get('export', False)):
+                        yield json.dumps(event) + '\n'
+                except Exception as e:
+                    print(f"❌ Error in streamed generate_plan: {str(e)}")
+                    yield json.dumps({'event': 'error', 'error': f'Failed to generate lesson plan: {str(e)}'}) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        # Apply duration constraint if provided, otherwise use parsed duration
-        if duration_constraint and duration_constraint.get('totalHours'):
-            target_hours = duration_constraint['studyHours']
-        else:
-            # Parse duration from goal
-            target_hours, _ = DurationParser.parse_duration(learning_goal)
-            target_hours = int(target_hours * 0.7)  # 70% for study
+        return jsonify(build_plan(learning_goal, duration_constraint, data.get('export', False)))
         
-        # Always apply duration adjustment to ensure realistic scope
-        syllabus = DurationParser.adjust_syllabus_to_duration(syllabus, target_hours)
-        syllabus['duration_constraint'] = {
-            'total_hours': target_hours / 0.7,  # Convert back to total hours
-            'study_hours': target_hours,
-            'duration_text': f"{target_hours} study hours"
-        }
+    except Exception as e:
+        print(f"❌ Error in generate_plan: {str(e)}")
+        return jsonify({'error': f'Failed to generate lesson plan: {str(e)}'}), 500
+
+@app.route('/api/generate-plan/batch', methods=['POST'])
+def generate_plan_batch():
+    """Generate lesson plans for many goals concurrently"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'No JSON data received'}), 400
+        
+        goals = data.get('goals', [])
+        default_constraint = data.get('duration_constraint', {})
+        export = data.get('export', False)
         
-        current_data['syllabus'] = syllabus
-        print(f"✅ Syllabus generated with {len(syllabus.get('units', []))} units")
-        print(f"📊 Target study hours: {target_hours}")
+        if not isinstance(goals, list) or not goals:
+            return jsonify({'error': 'goals must be a non-empty list'}), 400
+        if len(goals) > PLAN_BATCH_MAX_GOALS:
+            return jsonify({'error': f'At most {PLAN_BATCH_MAX_GOALS} goals per batch'}), 400
         
-        # Rest of the function remains the same...
-        # Save syllabus to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(syllabus, f, indent=2)
-            temp_file = f.name
+        # Each entry is either a goal string or {"goal": ..., "duration_constraint": {...}}
+        jobs = []
+        for entry in goals:
+            if isinstance(entry, dict):
+                jobs.append((str(entry.get('goal', '')).strip(), entry.get('duration_constraint', default_constraint)))
+            else:
+                jobs.append((str(entry).strip(), default_constraint))
         
         try:
-            # Generate lesson plan
-            lesson_plan = functions['generate_lesson_plan'](temp_file)
-            current_data['lesson_plan'] = lesson_plan
-            print("✅ Lesson plan generated successfully")
-            
-        except Exception as e:
-            print(f"❌ Lesson plan generation failed: {e}")
-            lesson_plan = generate_fallback_lesson_plan(temp_file)
-            current_data['lesson_plan'] = lesson_plan
-            print("🔄 Using fallback lesson plan")
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            max_parallel = int(data.get('max_parallel', PLAN_BATCH_MAX_WORKERS))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'max_parallel must be an integer'}), 400
+        max_parallel = max(1, min(max_parallel, PLAN_BATCH_MAX_WORKERS, len(jobs)))
+        
+        print(f"📦 Generating {len(jobs)} lesson plans with {max_parallel} workers")
         
-        return jsonify(lesson_plan)
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='plan-batch') as pool:
+            futures = [
+                pool.submit(build_plan, goal, constraint, export) if goal else None
+                for goal, constraint in jobs
+            ]
+            results = []
+            for (goal, _), future in zip(jobs, futures):
+                if future is None:
+                    results.append({'goal': goal, 'status': 'error', 'error': 'Learning goal is required'})
+                    continue
+                try:
+                    results.append({'goal': goal, 'status': 'ok', 'plan': future.result()})
+                except Exception as e:
+                    print(f"❌ Batch plan failed for '{goal}': {e}")
+                    results.append({'goal': goal, 'status': 'error', 'error': str(e)})
+        
+        succeeded = sum(1 for r in results if r['status'] == 'ok')
+        return jsonify({
+            'results': results,
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
+        })
         
     except Exception as e:
-        print(f"❌ Error in generate_plan: {str(e)}")
-        return jsonify({'error': f'Failed to generate lesson plan: {str(e)}'}), 500
+        print(f"❌ Error in generate_plan_batch: {str(e)}")
+        return jsonify({'error': f'Failed to generate lesson plans: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report per-stage progress and, once finished, the result of a plan job"""
+    job = plan_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+def start_plan_bundle(pool, learning_goal, export=False, on_unit=None):
+    """
+    Start every dashboard call for one goal on pool and return {part: future}.
+    Overview, resources, duration and syllabus run in parallel; only the study
+    plan and the duration adjustment of the lesson plan wait for the duration.
+    With on_unit the syllabus is streamed and on_unit gets each unit event.
+    """
+    duration = pool.submit(analyze_duration, learning_goal)
+    duration_constraint = lambda: duration.result()[0]['duration_constraint']
+    
+    def plan():
+        if on_unit is None:
+            return build_plan(learning_goal, duration_constraint, export), 200
+        for event in stream_plan(learning_goal, duration_constraint, export):
+            if event['event'] == 'plan':
+                return event['plan'], 200
+            on_unit(event)
+    
+    return {
+        'overview': pool.submit(generate_goal_overview, learning_goal),
+        'duration': duration,
+        'resources': pool.submit(generate_resources, learning_goal),
+        'study_plan': pool.submit(lambda: generate_study_plan(learning_goal, duration_constraint())),
+        'plan': pool.submit(plan)
+    }
+
+def plan_bundle_part(name, future):
+    """Turn a finished bundle future into {'part', 'status', 'data'}"""
+    try:
+        data, status = future.result()
+    except Exception as e:
+        print(f"❌ Plan bundle part '{name}' failed: {e}")
+        data, status = {'error': str(e)}, 500
+    return {'part': name, 'status': status, 'data': data}
+
+@app.route('/api/plan-bundle', methods=['POST'])
+def plan_bundle():
+    """
+    Overview, duration, study plan, lesson plan and resources in one request.
+    With "stream": true each part is sent as an NDJSON line as soon as it is
+    ready, and lesson plan units are sent as "unit" parts while the syllabus streams.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
+    
+    learning_goal = data.get('goal', data.get('learning_goal', '')).strip()
+    if not learning_goal:
+        return jsonify({'error': 'Learning goal is required'}), 400
+    
+    export = data.get('export', False)
+    print(f"📦 Generating plan bundle for: {learning_goal}")
+    
+    if data.get('stream') or request.args.get('stream') == '1':
+        def generate():
+            events = queue.Queue()
+            on_unit = lambda event: events.put(dict(event, part='unit'))
+            with ThreadPoolExecutor(max_workers=5, thread_name_prefix='plan-bundle') as pool:
+                futures = start_plan_bundle(pool, learning_goal, export, on_unit)
+                for name, future in futures.items():
+                    future.add_done_callback(lambda f, name=name: events.put(plan_bundle_part(name, f)))
+                
+                pending = len(futures)
+                while pending:
+                    event = events.get()
+                    if event['part'] != 'unit':
+                        pending -= 1
+                    yield json.dumps(event) + '\n'
+            yield json.dumps({'part': 'done', 'goal': learning_goal}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    with ThreadPoolExecutor(max_workers=5, thread_name_prefix='plan-bundle') as pool:
+        futures = start_plan_bundle(pool, learning_goal, export)
+        parts = {name: plan_bundle_part(name, future) for name, future in futures.items()}
+    
+    bundle = {'goal': learning_goal}
+    bundle.update((name, part['data']) for name, part in parts.items())
+    bundle['errors'] = {name: part['status'] for name, part in parts.items() if part['status'] != 200}
+    return jsonify(bundle)
 
 @app.route('/api/download-syllabus', methods=['GET'])
 def download_syllabus():
     try:
-        if not current_data['syllabus']:
-            return jsonify({'error': 'No syllabus available. Generate a lesson plan first.'}), 400
+        plan_id = request.args.get('plan_id', '').strip()
+        if not plan_id:
+            return jsonify({'error': 'plan_id is required'}), 400
         
+        plan = plan_store.get(plan_id)
+        if not plan:
+            return jsonify({'error': 'No syllabus available. Generate a lesson plan first.'}), 404
+        
+        syllabus = plan['syllabus']
         return jsonify({
-            'syllabus': current_data['syllabus'],
-            'filename': f"{current_data['syllabus']['goal'].replace(' ', '_')}_syllabus.json"
+            'syllabus': syllabus,
+            'filename': f"{syllabus['goal'].replace(' ', '_')}_syllabus.json"
         })
         
     except Exception as e:
@@ -1049,7 +1252,7 @@ def ai_chat():
         
         # Generate AI response
         try:
-            from ai_service import ai_assistant
+            ai_assistant = services.get('ai_assistant')
             ai_response = ai_assistant.generate_learning_response(
                 user_message, 
                 course_context, 
@@ -1068,6 +1271,45 @@ def ai_chat():
         print(f"Error in AI chat: {e}")
         return jsonify({'error': f'AI service error: {str(e)}'}), 500
 
+@app.route('/api/ai/chat/stream', methods=['POST'])
+def ai_chat_stream():
+    """Stream AI chat responses as Server-Sent Events"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No JSON data received'}), 400
+    
+    user_message = data.get('message', '').strip()
+    course_context = data.get('course_context', {})
+    chat_history = data.get('chat_history', [])
+    
+    if not user_message:
+        return jsonify({'error': 'Message is required'}), 400
+    
+    try:
+        ai_assistant = services.get('ai_assistant')
+        chunks = ai_assistant.stream_learning_response(
+            user_message, 
+            course_context, 
+            chat_history
+        )
+    except:
+        chunks = iter([f"I'm here to help you learn about {course_context.get('current_topic', 'your course')}. For detailed assistance, please ensure the AI service is properly configured."])
+    
+    def event_stream():
+        try:
+            for chunk in chunks:
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        except Exception as e:
+            print(f"Error in AI chat stream: {e}")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        yield f"event: done\ndata: {json.dumps({'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})}\n\n"
+    
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/ai/quick-action', methods=['POST'])
 def ai_quick_action():
     """Handle quick actions like examples, quizzes, etc."""
@@ -1087,7 +1329,7 @@ def ai_quick_action():
         user_message = action_prompts.get(action_type, "Help with learning this topic")
         
         try:
-            from ai_service import ai_assistant
+            ai_assistant = services.get('ai_assistant')
             ai_response = ai_assistant.generate_learning_response(
                 user_message, 
                 course_context, 
@@ -1153,34 +1395,16 @@ def generate_quiz():
     except Exception as e:
         print(f"Error in AI quiz generation: {e}")
         return jsonify({'error': f'AI service error: {str(e)}'}), 500
-def clean_study_schedule_content(content):
-    """Remove Study Period and Daily Commitment patterns from content"""
-    import re
-    
-    if not content:
-        return content
-    
-    # Remove "Day Xh" patterns (e.g., "Day 13h" -> "Day 1")
-    content = re.sub(r'Day\s*(\d+)\s*\d*h', r'Day \1', content, flags=re.IGNORECASE)
-    
-    # Remove Study Period patterns
-    content = re.sub(r'\d+\s*Day\s*Study\s*Period\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'Study\s*Period\s*', '', content, flags=re.IGNORECASE)
-    
-    # Remove Daily Commitment patterns  
-    content = re.sub(r'\d+h\/Day\s*Daily\s*Commitment\s*', '', content, flags=re.IGNORECASE)
-    content = re.sub(r'Daily\s*Commitment\s*', '', content, flags=re.IGNORECASE)
-    
-    # Clean up any double spaces or empty lines
-    content = re.sub(r'\s+', ' ', content).strip()
-    
-    return content
+
 if __name__ == '__main__':
     print("🚀 Starting AI-Powered Lesson Plan Generator Server...")
     print("📝 Access the application at: http://localhost:5000")
     print("🔧 CORS enabled for frontend-backend communication")
-    print("🤖 Gemini AI Integration: " + ("✅ Enabled" if GEMINI_API_KEY else "❌ Disabled - Set GEMINI_API_KEY in .env"))
+    print("🤖 Gemini AI Integration: " + ("✅ Enabled" if llm_gateway.is_available() else "❌ Disabled - Set GEMINI_API_KEY in .env"))
     print("⏰ Smart Duration Planning: ✅ Enabled")
     print("📥 Download features enabled")
     print("🎯 Available functions:", list(functions.keys()))
+    print("💡 This is the development server; run `python serve.py` in production")
+    if SERVICE_WARMUP:
+        start_warm_up()
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
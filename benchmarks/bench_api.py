@@ -0,0 +1,391 @@
+# [file name]: benchmarks/bench_api.py
+"""
+Offline load benchmark: drives every /api/* route at a fixed concurrency and
+reports throughput, p50/p95/p99 latency, error rate and fallbacks per route.
+
+By default it starts serve.py on a free local port with LLM_BACKEND=fake (the
+canned, simulated-latency Gemini stand-in in fake_gemini.py), the response
+cache off and caches in a temporary directory, so runs are repeatable without
+a network or an API key. --url benchmarks an already running server instead.
+
+    python benchmarks/bench_api.py --requests 50 --concurrency 8
+    python benchmarks/bench_api.py --routes chat,chat_stream --latency-ms 800 --tokens-per-sec 120
+    python benchmarks/bench_api.py --error-rate 0.05 --rate-limit-rate 0.1 --json baseline.json
+    python benchmarks/bench_api.py --env GEMINI_MAX_CONCURRENCY=4 --workers 2
+
+Fallback counts come from /api/metrics, which sums every worker's samples.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+TOPICS = ['Python', 'React Native', 'Machine Learning', 'SQL', 'Docker', 'Rust', 'Data Structures']
+SPANS = ['in {n} hours', 'in {n} days', 'in {n} weeks', '']
+
+# Server settings for a run; --env and the fake backend flags override them.
+# The Gemini limiter is opened up so the app, not the quota, is measured.
+BENCH_ENV = {
+    'LLM_BACKEND': 'fake',
+    'LLM_CACHE_ENABLED': '0',
+    'GEMINI_RATE_LIMIT_RPM': '100000',
+    'GEMINI_RATE_LIMIT_BURST': '1000',
+    'GEMINI_MAX_CONCURRENCY': '64',
+    'METRICS_FLUSH_INTERVAL': '0.2',
+    'PYTHONUNBUFFERED': '1',
+}
+# Long enough for every worker to have published its latest metrics
+METRICS_SETTLE_SECONDS = 0.5
+
+
+def make_goal(index):
+    """A distinct goal per request, so prompts never repeat within a run"""
+    topic = TOPICS[index % len(TOPICS)]
+    span = SPANS[index // len(TOPICS) % len(SPANS)].format(n=index % 9 + 2)
+    return f"Learn {topic} {span} #{index}".replace('  ', ' ')
+
+
+def course_context(goal):
+    return {'course_name': goal, 'current_unit': 'Core Concepts', 'current_topic': 'Functions', 'progress': 'Unit 2 of 6'}
+
+
+class Client:
+    """Keep-alive HTTP/1.1 connection per thread"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        """Return (status, body bytes); the whole body is read, streams included"""
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        for attempt in range(2):
+            conn = getattr(self._local, 'conn', None)
+            reused = conn is not None
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                self._local.conn = None
+                # The server may have closed an idle keep-alive connection
+                if reused and attempt == 0:
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+                self._local.conn = None
+            return response.status, data
+
+    def get_json(self, path):
+        status, data = self.request('GET', path)
+        return status, json.loads(data) if data else None
+
+    def post_json(self, path, body):
+        status, data = self.request('POST', path, body)
+        return status, json.loads(data) if data else None
+
+
+def _json_ok(status, data):
+    return status < 400
+
+
+def _stream_ok(status, data):
+    # Failures inside a 200 stream arrive as error events
+    return status < 400 and b'"event": "error"' not in data and b'event: error' not in data
+
+
+def _bundle_ok(status, data):
+    return status < 400 and all(part.get('status', 200) < 400 for part in map(json.loads, data.splitlines()))
+
+
+def _bundle_json_ok(status, data):
+    return status < 400 and not json.loads(data).get('errors')
+
+
+def _batch_ok(status, data):
+    return status < 400 and json.loads(data).get('failed') == 0
+
+
+def post(path, make_body, check=_json_ok):
+    def run(client, index, state):
+        status, data = client.request('POST', path, make_body(make_goal(index), state))
+        return check(status, data)
+    return run
+
+
+def get(make_path, check=_json_ok):
+    def run(client, index, state):
+        status, data = client.request('GET', make_path(make_goal(index), state))
+        return check(status, data)
+    return run
+
+
+def run_async_plan(client, index, state):
+    """Submit a plan job and poll it to completion; latency covers both"""
+    status, job = client.post_json('/api/generate-plan?async=1', {'goal': make_goal(index)})
+    if status != 202:
+        return False
+    status_url = job['status_url']
+    while True:
+        status, job = client.get_json(status_url)
+        if status != 200:
+            return False
+        if job['status'] in ('succeeded', 'failed'):
+            return job['status'] == 'succeeded'
+        time.sleep(0.02)
+
+
+# name -> run(client, request index, shared state) returning True on success
+ROUTES = {
+    'health': get(lambda goal, state: '/api/health'),
+    'metrics': get(lambda goal, state: '/api/metrics'),
+    'smart_duration': post('/api/ai/smart-duration', lambda goal, state: {'learning_goal': goal}),
+    'goal_overview': post('/api/ai/goal-overview', lambda goal, state: {'learning_goal': goal}),
+    'resources': post('/api/ai/resources', lambda goal, state: {'learning_goal': goal}),
+    'study_plan': post('/api/ai/study-plan', lambda goal, state: {
+        'learning_goal': goal,
+        'duration_constraint': {'totalDays': 7, 'dailyStudyHours': 2, 'studyHours': 14}
+    }),
+    'generate_plan': post('/api/generate-plan', lambda goal, state: {'goal': goal}),
+    'generate_plan_stream': post('/api/generate-plan?stream=1', lambda goal, state: {'goal': goal}, _stream_ok),
+    'generate_plan_async': run_async_plan,
+    'generate_plan_batch': post('/api/generate-plan/batch', lambda goal, state: {
+        'goals': [goal, f"{goal} (part 2)", f"{goal} (part 3)"]
+    }, _batch_ok),
+    'plan_bundle': post('/api/plan-bundle', lambda goal, state: {'goal': goal}, _bundle_json_ok),
+    'plan_bundle_stream': post('/api/plan-bundle?stream=1', lambda goal, state: {'goal': goal}, _bundle_ok),
+    'download_syllabus': get(lambda goal, state: f"/api/download-syllabus?plan_id={state['plan_id']}"),
+    'test_syllabus': post('/api/test-syllabus', lambda goal, state: {'goal': goal}),
+    'chat': post('/api/ai/chat', lambda goal, state: {
+        'message': 'Can you explain this with an example?', 'course_context': course_context(goal), 'chat_history': []
+    }),
+    'chat_stream': post('/api/ai/chat/stream', lambda goal, state: {
+        'message': 'Can you explain this with an example?', 'course_context': course_context(goal), 'chat_history': []
+    }, _stream_ok),
+    'quick_action': post('/api/ai/quick-action', lambda goal, state: {
+        'action_type': 'example', 'course_context': course_context(goal)
+    }),
+    'generate_quiz': post('/api/ai/generate-quiz', lambda goal, state: {
+        'message': f"Create a 3 question quiz about {goal}", 'course_context': course_context(goal)
+    }),
+}
+
+
+def fallback_total(client):
+    """Sum of edugpt_fallback_total across paths and workers"""
+    time.sleep(METRICS_SETTLE_SECONDS)
+    status, data = client.request('GET', '/api/metrics')
+    if status != 200:
+        return 0
+    return sum(
+        float(line.rsplit(' ', 1)[1])
+        for line in data.decode('utf-8').splitlines()
+        if line.startswith('edugpt_fallback_total{')
+    )
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def bench_route(client, name, run, requests, concurrency, state, offset):
+    def one(index):
+        start = time.perf_counter()
+        try:
+            ok = run(client, offset + index, state)
+        except Exception as e:
+            print(f"  {name} #{index}: {type(e).__name__}: {e}", file=sys.stderr)
+            ok = False
+        return ok, time.perf_counter() - start
+
+    fallbacks_before = fallback_total(client)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+    fallbacks = fallback_total(client) - fallbacks_before
+
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for ok, _ in results if not ok)
+    return {
+        'route': name,
+        'requests': requests,
+        'errors': errors,
+        'error_rate': errors / requests,
+        'fallbacks': int(fallbacks),
+        'throughput_rps': requests / wall,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, env_overrides, workdir):
+    port = free_port()
+    env = dict(os.environ, **BENCH_ENV)
+    env.update({
+        'LLM_CACHE_DB': os.path.join(workdir, 'llm_cache.sqlite3'),
+        'LINK_CACHE_DB': os.path.join(workdir, 'link_cache.sqlite3'),
+        'PLAN_STORE_DB': os.path.join(workdir, 'plan_store.sqlite3'),
+        'PLAN_JOB_DB': os.path.join(workdir, 'plan_jobs.sqlite3'),
+        'PLAN_EXPORT_DIR': os.path.join(workdir, 'exports'),
+        'PROFILE_DIR': os.path.join(workdir, 'profiles'),
+        'METRICS_DIR': os.path.join(workdir, 'metrics'),
+    })
+    env.update(env_overrides)
+    log_path = os.path.join(workdir, 'server.log')
+    with open(log_path, 'wb') as log:
+        process = subprocess.Popen(
+            [sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}',
+             '--workers', str(args.workers), '--threads', str(args.threads)],
+            cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    with open(log_path, encoding='utf-8', errors='replace') as log:
+        tail = log.read()[-2000:]
+    raise SystemExit(f"Server did not start:\n{tail}")
+
+
+def parse_env(pairs):
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition('=')
+        if not sep:
+            raise SystemExit(f"--env expects KEY=VALUE, got {pair!r}")
+        overrides[key] = value
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='benchmark a running server instead of starting one')
+    parser.add_argument('--routes', help='comma-separated subset of: ' + ', '.join(ROUTES))
+    parser.add_argument('--requests', type=int, default=50, help='measured requests per route')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=2, help='unmeasured requests per route first')
+    parser.add_argument('--timeout', type=float, default=120, help='per-request socket timeout')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    parser.add_argument('--latency-ms', help='FAKE_GEMINI_LATENCY_MS')
+    parser.add_argument('--latency-dist', choices=('constant', 'uniform', 'lognormal'), help='FAKE_GEMINI_LATENCY_DIST')
+    parser.add_argument('--tokens-per-sec', help='FAKE_GEMINI_TOKENS_PER_SEC')
+    parser.add_argument('--error-rate', help='FAKE_GEMINI_ERROR_RATE')
+    parser.add_argument('--rate-limit-rate', help='FAKE_GEMINI_RATE_LIMIT_RATE (429 injection)')
+    parser.add_argument('--seed', help='FAKE_GEMINI_SEED')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra server setting, may be repeated')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    routes = args.routes.split(',') if args.routes else list(ROUTES)
+    unknown = [name for name in routes if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    env_overrides = {
+        key: value for key, value in (
+            ('FAKE_GEMINI_LATENCY_MS', args.latency_ms),
+            ('FAKE_GEMINI_LATENCY_DIST', args.latency_dist),
+            ('FAKE_GEMINI_TOKENS_PER_SEC', args.tokens_per_sec),
+            ('FAKE_GEMINI_ERROR_RATE', args.error_rate),
+            ('FAKE_GEMINI_RATE_LIMIT_RATE', args.rate_limit_rate),
+            ('FAKE_GEMINI_SEED', args.seed),
+        ) if value is not None
+    }
+    env_overrides.update(parse_env(args.env))
+
+    with tempfile.TemporaryDirectory(prefix='edugpt-bench-') as workdir:
+        process = None
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            process, base_url = start_server(args, env_overrides, workdir)
+        try:
+            client = Client(base_url, args.timeout)
+            status, health = client.get_json('/api/health')
+            print(f"{base_url}: llm_backend={health.get('llm_backend')}, "
+                  f"{args.requests} requests per route at concurrency {args.concurrency}")
+            if env_overrides:
+                print("settings:", ', '.join(f"{key}={value}" for key, value in sorted(env_overrides.items())))
+
+            # download_syllabus needs a stored plan
+            state = {}
+            status, plan = client.post_json('/api/generate-plan', {'goal': make_goal(0)})
+            state['plan_id'] = (plan or {}).get('plan_id', '')
+
+            print(f"{'route':<22} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'err %':>6} {'fallbk':>6}")
+            results = []
+            offset = 1
+            for name in routes:
+                if args.warmup:
+                    bench_route(client, name, ROUTES[name], args.warmup, min(args.warmup, args.concurrency), state, offset)
+                    offset += args.warmup
+                result = bench_route(client, name, ROUTES[name], args.requests, args.concurrency, state, offset)
+                offset += args.requests
+                results.append(result)
+                print(f"{name:<22} {result['throughput_rps']:8.1f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} "
+                      f"{result['p99_ms']:9.1f} {result['errors']:7d} {result['error_rate'] * 100:6.1f} {result['fallbacks']:6d}")
+        finally:
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': args.url,
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'workers': args.workers,
+                'threads': args.threads,
+                'settings': env_overrides,
+                'results': results
+            }, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# [file name]: benchmarks/bench_duration_parser.py
+"""
+Micro-benchmark for duration parsing and study-plan cleaning.
+
+    python benchmarks/bench_duration_parser.py --goals 5000 --days 180
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Run from anywhere: the backend modules live one directory up
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from duration_parser import DurationParser, _parse_duration, clean_many, clean_study_schedule_content
+
+TOPICS = ['Python', 'React Native', 'Machine Learning', 'SQL', 'Docker', 'Rust', 'Data Structures']
+SPANS = ['in {n} hours', 'in {n} hrs', 'in {n}h', 'in {n} days', 'over {n} weeks', 'in {n} months', '']
+LEVELS = ['basic', 'intermediate', 'advanced', 'comprehensive', '']
+
+
+def make_goals(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        f"Learn {rng.choice(LEVELS)} {rng.choice(TOPICS)} {rng.choice(SPANS).format(n=rng.randint(1, 90))}".strip()
+        for _ in range(count)
+    ]
+
+
+def make_study_plan(days):
+    """A multi-month study plan full of the headers the cleaner strips"""
+    return [
+        {
+            'day': day,
+            'focus_area': f"Day {day}{day % 5 + 1}h {day} Day Study Period Core Concepts",
+            'learning_objectives': [
+                f"3h/Day Daily Commitment  Master topic {day}.{i}" for i in range(4)
+            ]
+        }
+        for day in range(1, days + 1)
+    ]
+
+
+def timed(label, fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:9.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--goals', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    goals = make_goals(args.goals)
+    plan = make_study_plan(args.days)
+    fields = [day['focus_area'] for day in plan] + [obj for day in plan for obj in day['learning_objectives']]
+
+    print(f"{args.goals} goals ({len(set(goals))} distinct), {args.days}-day plan ({len(fields)} fields)")
+
+    def parse_cold():
+        _parse_duration.cache_clear()
+        DurationParser.parse_many(goals)
+
+    timed('parse_many (cold cache)', parse_cold, args.repeat)
+    timed('parse_many (warm cache)', lambda: DurationParser.parse_many(goals), args.repeat)
+    timed('clean_study_schedule_content per field', lambda: [clean_study_schedule_content(f) for f in fields], args.repeat)
+    timed('clean_many', lambda: clean_many(fields), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# [file name]: benchmarks/bench_lesson_plan.py
+"""
+Scaling benchmark for the rule-based lesson plan builder on synthetic syllabi.
+
+    python benchmarks/bench_lesson_plan.py --units 100 --lessons 50 --workers 1 2 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Run from anywhere: the backend modules live one directory up
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from lesson_plan_generator import build_comprehensive_lesson_plan
+
+UNIT_TOPICS = ['Python Programming', 'Data Wrangling', 'Machine Learning', 'Statistics', 'Web APIs', 'Testing']
+LESSON_KINDS = ['Introduction to', 'Basic', 'Fundamental', 'Advanced', 'Project:', 'Lab:', 'Practice:', '']
+
+
+def make_syllabus(units, lessons):
+    return {
+        'goal': f"Learn everything in {units} units",
+        'duration_constraint': {'study_hours': units * lessons, 'original_text': f"{units * lessons} hours"},
+        'units': [
+            {
+                'title': f"Unit {u}: {UNIT_TOPICS[u % len(UNIT_TOPICS)]}",
+                'lessons': [f"{LESSON_KINDS[(u + l) % len(LESSON_KINDS)]} Topic {u}.{l}".strip() for l in range(1, lessons + 1)],
+                'outcomes': [f"Outcome {u}.1", f"Outcome {u}.2"]
+            }
+            for u in range(1, units + 1)
+        ]
+    }
+
+
+def timed(label, fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--units', type=int, default=100)
+    parser.add_argument('--lessons', type=int, default=50)
+    parser.add_argument('--plans', type=int, default=10, help="plans built on one shared pool")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    syllabus = make_syllabus(args.units, args.lessons)
+    print(f"{args.units} units x {args.lessons} lessons, {os.cpu_count()} CPUs")
+
+    def verbose_build():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return build_comprehensive_lesson_plan(syllabus)
+
+    baseline = timed('serial, printing (stdout discarded)', verbose_build, args.repeat)
+
+    for workers in args.workers:
+        label = 'serial, quiet' if workers <= 1 else f"process pool, {workers} workers, quiet"
+        plan = timed(label, lambda: build_comprehensive_lesson_plan(syllabus, workers=workers, verbose=False), args.repeat)
+        assert plan['comprehensive_lesson_plan'] == baseline['comprehensive_lesson_plan']
+
+    # A catalog import builds many plans; reusing one pool avoids paying its startup per plan
+    for workers in args.workers:
+        if workers <= 1:
+            continue
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            timed(
+                f"{args.plans} plans on a shared {workers}-worker pool",
+                lambda: [build_comprehensive_lesson_plan(syllabus, verbose=False, executor=pool) for _ in range(args.plans)],
+                args.repeat
+            )
+    timed(
+        f"{args.plans} plans serial, quiet",
+        lambda: [build_comprehensive_lesson_plan(syllabus, verbose=False) for _ in range(args.plans)],
+        args.repeat
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# [file name]: benchmarks/bench_startup.py
+"""
+Cold-start benchmark: time to import app.py in a fresh interpreter, and what
+loading the lazy services (Gemini SDK, chat assistant, HTTP session) costs.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Runs in a fresh interpreter; prints one JSON line of timings
+PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+imported = time.perf_counter() - start
+heavy = {{name: name in sys.modules for name in ('google.generativeai', 'requests')}}
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    if {warm}:
+        app.services.get('gemini_sdk')
+        app.llm_gateway.configure()
+        app.services.get('ai_assistant')
+        app.services.get('http_session')
+services = time.perf_counter() - start
+print(json.dumps({{'import': imported, 'services': services, 'loaded_at_import': heavy}}))
+"""
+
+
+def run_probe(warm):
+    env = dict(os.environ, GEMINI_API_KEY=os.environ.get('GEMINI_API_KEY', 'benchmark-key'))
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE.format(warm=warm)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = [run_probe(False) for _ in range(args.runs)]
+    eager = [run_probe(True) for _ in range(args.runs)]
+
+    print(f"{args.runs} fresh interpreters each, median:")
+    print(f"{'import app':<44} {statistics.median(r['import'] for r in lazy) * 1000:9.1f} ms")
+    print(f"{'first use of all lazy services':<44} {statistics.median(r['services'] for r in eager) * 1000:9.1f} ms")
+    print(f"{'import app + all services (eager equivalent)':<44} "
+          f"{statistics.median(r['import'] + r['services'] for r in eager) * 1000:9.1f} ms")
+    print("heavy modules loaded by import app:", lazy[0]['loaded_at_import'])
+
+
+if __name__ == '__main__':
+    main()
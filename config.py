@@ -3,4 +3,142 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
\ No newline at end of file
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+# "grpc" (SDK default) or "rest"; both keep one persistent connection per process
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT") or None
+
+# "gemini", or "fake" for the offline stand-in in fake_gemini.py (canned
+# responses, simulated latency and errors, no network) used by benchmarks.
+# The fake backend needs no key and keeps its caches, stored plans, job status,
+# metrics and profiles apart from the real ones
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+if LLM_BACKEND == "fake":
+    _CACHE_DIR = os.path.join(_CACHE_DIR, "fake")
+# Time to first token: "constant", "uniform" (median +/- spread * median)
+# or "lognormal" (sigma = spread)
+FAKE_GEMINI_LATENCY_DIST = os.getenv("FAKE_GEMINI_LATENCY_DIST", "lognormal")
+FAKE_GEMINI_LATENCY_MS = float(os.getenv("FAKE_GEMINI_LATENCY_MS", "400"))
+FAKE_GEMINI_LATENCY_SPREAD = float(os.getenv("FAKE_GEMINI_LATENCY_SPREAD", "0.5"))
+# Output speed after the first token; 0 returns the whole text at once
+FAKE_GEMINI_TOKENS_PER_SEC = float(os.getenv("FAKE_GEMINI_TOKENS_PER_SEC", "200"))
+# Fraction of calls failing with a 500, and with a 429 quota error
+FAKE_GEMINI_ERROR_RATE = float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0"))
+FAKE_GEMINI_RATE_LIMIT_RATE = float(os.getenv("FAKE_GEMINI_RATE_LIMIT_RATE", "0"))
+FAKE_GEMINI_SEED = os.getenv("FAKE_GEMINI_SEED", "0")
+# Simulated round trip of a Resource Corner link probe
+FAKE_LINK_LATENCY_MS = float(os.getenv("FAKE_LINK_LATENCY_MS", "50"))
+
+# LLM response cache (in-memory LRU + SQLite file that survives restarts)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", os.path.join(_CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+# Seconds to keep a response, per calling endpoint; 0 disables caching for it
+LLM_CACHE_TTLS = {
+    "goal_overview": int(os.getenv("LLM_CACHE_TTL_GOAL_OVERVIEW", "86400")),
+    "smart_duration": int(os.getenv("LLM_CACHE_TTL_SMART_DURATION", "86400")),
+    "study_plan": int(os.getenv("LLM_CACHE_TTL_STUDY_PLAN", "43200")),
+    "resources": int(os.getenv("LLM_CACHE_TTL_RESOURCES", "43200")),
+    "syllabus": int(os.getenv("LLM_CACHE_TTL_SYLLABUS", "86400")),
+}
+
+# Resource Corner link validation
+LINK_CHECK_TIMEOUT = float(os.getenv("LINK_CHECK_TIMEOUT", "6"))
+LINK_CHECK_WORKERS = int(os.getenv("LINK_CHECK_WORKERS", "16"))
+# Upper bound for validating a whole batch of suggested resources
+LINK_CHECK_DEADLINE = float(os.getenv("LINK_CHECK_DEADLINE", "8"))
+# Verdicts of previous link probes, keyed by canonical URL
+LINK_CACHE_DB = os.getenv("LINK_CACHE_DB", os.path.join(_CACHE_DIR, "link_cache.sqlite3"))
+LINK_CACHE_OK_TTL = int(os.getenv("LINK_CACHE_OK_TTL", str(7 * 24 * 3600)))
+LINK_CACHE_DEAD_TTL = int(os.getenv("LINK_CACHE_DEAD_TTL", str(24 * 3600)))
+
+# Gemini rate limiter (token bucket + adaptive concurrency cap), one per worker
+# process and shared by its threads; gunicorn splits these across its workers
+GEMINI_RATE_LIMIT_RPM = float(os.getenv("GEMINI_RATE_LIMIT_RPM", "60"))
+GEMINI_RATE_LIMIT_BURST = int(os.getenv("GEMINI_RATE_LIMIT_BURST", "10"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+# Longest a request waits for a slot before its route falls back
+GEMINI_MAX_QUEUE_WAIT = float(os.getenv("GEMINI_MAX_QUEUE_WAIT", "10"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "2"))
+# How long a request waits on an identical in-flight prompt before giving up
+GEMINI_SINGLE_FLIGHT_TIMEOUT = float(os.getenv("GEMINI_SINGLE_FLIGHT_TIMEOUT", "60"))
+
+# Optional lesson plan exports; each request gets its own subdirectory
+PLAN_EXPORT_DIR = os.getenv(
+    "PLAN_EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+)
+
+# Store of generated plans: an in-memory LRU per worker process
+PLAN_STORE_MAX_ENTRIES = int(os.getenv("PLAN_STORE_MAX_ENTRIES", "256"))
+PLAN_STORE_MAX_BYTES = int(os.getenv("PLAN_STORE_MAX_BYTES", str(64 * 1024 * 1024)))
+# SQLite file shared by all worker processes so any worker can serve a plan
+# built by another; empty keeps plans in the building worker's memory only
+PLAN_STORE_DB = os.getenv("PLAN_STORE_DB", os.path.join(_CACHE_DIR, "plan_store.sqlite3"))
+PLAN_STORE_TTL = int(os.getenv("PLAN_STORE_TTL", "86400"))
+
+# /api/generate-plan/batch
+PLAN_BATCH_MAX_WORKERS = int(os.getenv("PLAN_BATCH_MAX_WORKERS", "8"))
+PLAN_BATCH_MAX_GOALS = int(os.getenv("PLAN_BATCH_MAX_GOALS", "100"))
+
+# Async (submit/poll) plan generation
+PLAN_JOB_WORKERS = int(os.getenv("PLAN_JOB_WORKERS", "4"))
+PLAN_JOB_MAX_PENDING = int(os.getenv("PLAN_JOB_MAX_PENDING", "100"))
+PLAN_JOB_RESULT_TTL = int(os.getenv("PLAN_JOB_RESULT_TTL", "3600"))
+# Job status shared by all worker processes, so a poll can land on any of
+# them; empty keeps jobs visible only to the worker that accepted them
+PLAN_JOB_DB = os.getenv("PLAN_JOB_DB", os.path.join(_CACHE_DIR, "plan_jobs.sqlite3"))
+
+# Per-course chat context (outline / lesson search index), cached per course content
+COURSE_DIGEST_CACHE_SIZE = int(os.getenv("COURSE_DIGEST_CACHE_SIZE", "128"))
+# Lessons retrieved into each chat / quick-action prompt
+COURSE_CONTEXT_TOP_K = int(os.getenv("COURSE_CONTEXT_TOP_K", "5"))
+
+# Lazily loaded services (Gemini SDK, chat assistant)
+# Seconds before a service whose initialization failed is tried again
+SERVICE_RETRY_AFTER = float(os.getenv("SERVICE_RETRY_AFTER", "300"))
+# Load them in the background right after startup instead of on first use
+SERVICE_WARMUP = os.getenv("SERVICE_WARMUP", "0") == "1"
+SERVICE_WARMUP_DELAY = float(os.getenv("SERVICE_WARMUP_DELAY", "1"))
+
+# Production server (serve.py / gunicorn.conf.py): gthread workers, so requests
+# waiting on Gemini block a thread rather than a whole process. Plans and job
+# status go through PLAN_STORE_DB / PLAN_JOB_DB, so workers need no sticky
+# routing as long as they share the filesystem; with those set to "" run a
+# single worker (SERVER_WORKERS=1) or route each client to one worker.
+# The Gemini rate limiter and in-flight prompt coalescing are per worker
+# process: each worker gets GEMINI_RATE_LIMIT_RPM, _BURST and
+# GEMINI_MAX_CONCURRENCY divided by SERVER_WORKERS, and identical prompts only
+# coalesce within one worker. The routes are I/O bound, so a few workers with
+# many threads serve as much as many workers and keep each share usable.
+SERVER_BIND = os.getenv("SERVER_BIND", "0.0.0.0:5000")
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", str(min(4, os.cpu_count() or 1))))
+SERVER_THREADS = int(os.getenv("SERVER_THREADS", "16"))
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "5"))
+# A worker silent for this long is restarted; must outlast the slowest plan generation
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "120"))
+# Seconds in-flight requests get to finish on shutdown or reload
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+# Recycle workers after this many requests (0 disables)
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "1000"))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "100"))
+# Per worker: threads that LLM-bound routes may hold at once, leaving the rest
+# for health checks, job polling and static files
+SERVER_LONG_REQUEST_SLOTS = int(os.getenv("SERVER_LONG_REQUEST_SLOTS", str(max(1, SERVER_THREADS - 2))))
+# How long a long request waits for a slot before getting a 503
+SERVER_LONG_REQUEST_WAIT = float(os.getenv("SERVER_LONG_REQUEST_WAIT", "5"))
+
+# /api/metrics under gunicorn: every worker writes its samples to this
+# directory (refreshed every METRICS_FLUSH_INTERVAL seconds, and by the worker
+# answering a scrape) and the scrape sums them, so any worker reports the
+# whole server. Empty reports only the worker that answers
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(_CACHE_DIR, "metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+# Opt-in request profiling: a request sent with an X-Profile-Token header equal
+# to this token runs under cProfile. Empty (the default) disables profiling.
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(_CACHE_DIR, "profiles"))
+# Only the newest profiles are kept
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "20"))
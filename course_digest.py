@@ -0,0 +1,88 @@
+# [file name]: course_digest.py
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def course_hash(structure) -> str:
+    """Content hash of a course structure (key order doesn't matter)"""
+    canonical = json.dumps(structure, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def iter_units(structure):
+    """Yield unit dicts from a comprehensive_lesson_plan (dict of unit_N) or a list of units"""
+    if isinstance(structure, dict):
+        units = structure.values()
+    elif isinstance(structure, list):
+        units = structure
+    else:
+        units = []
+    for unit in units:
+        if isinstance(unit, dict):
+            yield unit
+
+
+def build_outline(structure) -> str:
+    """
+    Compact outline of a course: one line per unit and one per lesson title.
+    Falls back to compact JSON for structures that aren't unit/lesson shaped.
+    """
+    lines = []
+    for unit_number, unit in enumerate(iter_units(structure), 1):
+        title = unit.get('unit_title') or unit.get('title') or f"Unit {unit_number}"
+        duration = unit.get('unit_duration')
+        lines.append(f"Unit {unit_number}: {title}" + (f" ({duration})" if duration else ""))
+        for lesson_number, lesson in enumerate(unit.get('lessons', []), 1):
+            if isinstance(lesson, dict):
+                lesson_title = lesson.get('lesson_title') or lesson.get('title', '')
+                lesson_number = lesson.get('lesson_number', lesson_number)
+            else:
+                lesson_title = str(lesson)
+            lines.append(f"- {unit_number}.{lesson_number} {lesson_title}")
+
+    if not lines:
+        if not structure:
+            return "No course structure available."
+        return json.dumps(structure, separators=(',', ':'), ensure_ascii=False, default=str)
+    return "\n".join(lines)
+
+
+class CourseDigestCache:
+    """
+    In-memory LRU of per-course digests, so chat turns on the same course
+    reuse one digest instead of re-serializing the whole lesson plan into
+    every prompt. Digests are keyed by plan ID when the caller has one, which
+    skips hashing the structure on every turn, and by the structure's content
+    hash otherwise. build turns a structure into the digest: a compact outline
+    by default, or e.g. a CourseIndex.
+    """
+
+    def __init__(self, max_entries=128, build=build_outline):
+        self.max_entries = max_entries
+        self.build = build
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, structure, plan_id=None):
+        key = f"plan:{plan_id}" if plan_id else course_hash(structure)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                self.stats['hits'] += 1
+                return digest
+            self.stats['misses'] += 1
+
+        digest = self.build(structure)
+        with self._lock:
+            self._digests[key] = digest
+            while len(self._digests) > self.max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._digests), max_entries=self.max_entries)
@@ -0,0 +1,128 @@
+# [file name]: course_index.py
+import math
+import re
+from collections import Counter, defaultdict
+
+from config import COURSE_DIGEST_CACHE_SIZE
+from course_digest import CourseDigestCache, build_outline, iter_units
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from how i in into is it its me my
+of on or so that the their this to was what when where which who why will with
+you your about explain give show tell please help learn
+""".split())
+
+
+def tokenize(text: str):
+    """Lowercase word tokens without stopwords (keeps c++, c#, etc.)"""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class CourseIndex:
+    """
+    Pure-Python BM25 index over the lessons of one lesson plan. Each lesson is
+    a document made of its unit title and outcomes, lesson title, key concepts
+    and important topics, so a chat question can be answered with only the
+    few lessons it is about instead of the whole course.
+    """
+
+    def __init__(self, structure, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.structure = structure
+        self.units = []    # (unit_number, unit dict)
+        self.lessons = []  # (unit_number, unit_title, lesson dict)
+        self._postings = defaultdict(list)  # term -> [(doc_id, term frequency)]
+        self._lengths = []
+
+        for unit_number, unit in enumerate(iter_units(structure), 1):
+            unit_title = unit.get('unit_title') or unit.get('title') or f"Unit {unit_number}"
+            self.units.append((unit_number, unit))
+            unit_text = ' '.join([unit_title, unit.get('unit_objective', '')] + list(unit.get('unit_outcomes', [])))
+            for lesson in unit.get('lessons', []):
+                if not isinstance(lesson, dict):
+                    lesson = {'lesson_title': str(lesson)}
+                self._add(unit_number, unit_title, lesson, unit_text)
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0
+        count = len(self._lengths)
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def _add(self, unit_number, unit_title, lesson, unit_text):
+        doc_id = len(self.lessons)
+        text = ' '.join(
+            [unit_text, lesson.get('lesson_title', '')]
+            + list(lesson.get('key_concepts', []))
+            + list(lesson.get('important_topics', []))
+        )
+        terms = Counter(tokenize(text))
+        for term, frequency in terms.items():
+            self._postings[term].append((doc_id, frequency))
+        self._lengths.append(sum(terms.values()))
+        self.lessons.append((unit_number, unit_title, lesson))
+
+    def search(self, query: str, k: int = 5):
+        """Return up to k (score, doc_id) pairs for the best matching lessons"""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(score, doc_id) for doc_id, score in ranked[:k]]
+
+    def find_unit(self, current_unit):
+        """Look up a unit by title (case-insensitive) or by number"""
+        if not current_unit:
+            return None
+        wanted = str(current_unit).strip().lower()
+        for unit_number, unit in self.units:
+            title = (unit.get('unit_title') or unit.get('title') or '').strip().lower()
+            if title == wanted or wanted in (str(unit_number), f"unit {unit_number}", f"unit_{unit_number}"):
+                return unit_number, unit
+        return None
+
+    def render_context(self, query: str, current_unit=None, k: int = 5) -> str:
+        """Prompt section with the current unit and the top-k lessons for query"""
+        if not self.lessons:
+            return build_outline(self.structure)
+
+        sections = [f"Course size: {len(self.units)} units, {len(self.lessons)} lessons"]
+
+        found = self.find_unit(current_unit)
+        if found:
+            unit_number, unit = found
+            lines = [f"CURRENT UNIT {unit_number}: {unit.get('unit_title') or unit.get('title', '')}"]
+            if unit.get('unit_objective'):
+                lines.append(f"Objective: {unit['unit_objective']}")
+            for number, lesson in enumerate(unit.get('lessons', []), 1):
+                title = lesson.get('lesson_title', '') if isinstance(lesson, dict) else str(lesson)
+                lines.append(f"- {unit_number}.{number} {title}")
+            sections.append("\n".join(lines))
+
+        hits = self.search(query, k)
+        if hits:
+            lines = ["RELEVANT LESSONS:"]
+            for _, doc_id in hits:
+                unit_number, unit_title, lesson = self.lessons[doc_id]
+                line = f"- Unit {unit_number} ({unit_title}): {lesson.get('lesson_title', '')}"
+                concepts = lesson.get('key_concepts', [])
+                if concepts:
+                    line += f" | Key concepts: {', '.join(concepts[:4])}"
+                lines.append(line)
+            sections.append("\n".join(lines))
+        elif not found:
+            sections.append("RELEVANT LESSONS: none matched this question")
+
+        return "\n\n".join(sections)
+
+
+# Per-process index cache read by the chat routes
+course_indexes = CourseDigestCache(COURSE_DIGEST_CACHE_SIZE, build=CourseIndex)
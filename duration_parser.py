@@ -1,58 +1,48 @@
 # [file name]: duration_parser.py
 import re
+from functools import lru_cache
+
+# One pass finds every "<number> <unit>" in a goal; STRICT hour matching then
+# picks the winner in priority order (hours above everything else)
+_DURATION_RE = re.compile(r'(\d+)\s*(?:(hour)|(hr)|(h)\b|(day)|(week)|(month))')
+_UNIT_PRIORITY = ('hour', 'hr', 'h', 'day', 'week', 'month')
+_UNIT_HOURS = {'hour': 1, 'hr': 1, 'h': 1, 'day': 24, 'week': 7 * 24, 'month': 30 * 24}
+_UNIT_LABELS = {'hour': 'hour', 'hr': 'hour', 'h': 'hour', 'day': 'day', 'week': 'week', 'month': 'month'}
+
+# "Day 13h" -> "Day 1", and Study Period / Daily Commitment headers removed, in one pass
+_SCHEDULE_RE = re.compile(
+    r'Day\s*(\d+)\s*\d*h'
+    r'|(?:\d+\s*Day\s*)?Study\s*Period\s*'
+    r'|(?:\d+h/Day\s*)?Daily\s*Commitment\s*',
+    re.IGNORECASE
+)
+
+
+def _clean_schedule_match(match):
+    day = match.group(1)
+    return f"Day {day}" if day is not None else ''
+
 
 class DurationParser:
     @staticmethod
     def parse_duration(learning_goal):
-        learning_goal_lower = learning_goal.lower()
-        
-        # STRICT hour matching - prioritize hours above everything else
-        hour_patterns = [
-            r'(\d+)\s*hour',
-            r'(\d+)\s*hr',
-            r'(\d+)\s*h\b',  # \b ensures it's not part of another word
-        ]
-        
-        for pattern in hour_patterns:
-            match = re.search(pattern, learning_goal_lower)
-            if match:
-                value = int(match.group(1))
-                print(f"🔍 STRICT HOUR MATCH: {value} hours from pattern: {pattern}")
-                return value, f"{value} hour{'s' if value > 1 else ''}"
-        
-        # Only if no hours found, check for other time units
-        other_patterns = [
-            r'(\d+)\s*day',
-            r'(\d+)\s*week', 
-            r'(\d+)\s*month'
-        ]
-        
-        for pattern in other_patterns:
-            match = re.search(pattern, learning_goal_lower)
-            if match:
-                value = int(match.group(1))
-                if 'day' in pattern:
-                    return value * 24, f"{value} day{'s' if value > 1 else ''}"
-                elif 'week' in pattern:
-                    return value * 7 * 24, f"{value} week{'s' if value > 1 else ''}"
-                elif 'month' in pattern:
-                    return value * 30 * 24, f"{value} month{'s' if value > 1 else ''}"
-        
-        # Default based on goal complexity
-        if any(x in learning_goal_lower for x in ['basic', 'introduction', 'fundamental', 'crash']):
-            return 8, "8 hours"
-        elif any(x in learning_goal_lower for x in ['intermediate', 'comprehensive']):
-            return 20, "20 hours"
-        elif any(x in learning_goal_lower for x in ['advanced', 'master', 'complete']):
-            return 40, "40 hours"
-        else:
-            return 24, "24 hours"
+        """
+        Return (total_hours, duration_text) for a learning goal. The first
+        number of the highest-priority unit wins, hours before days, weeks
+        and months: "3 days, 2 hours/day" is (2, "2 hours").
+        """
+        return _parse_duration(learning_goal)
+
+    @staticmethod
+    def parse_many(learning_goals):
+        """parse_duration for a batch of goals, in order"""
+        return [_parse_duration(goal) for goal in learning_goals]
 
     @staticmethod
     def adjust_syllabus_to_duration(syllabus, max_hours):
         """Adjust syllabus to fit within duration constraint"""
         total_lessons = sum(len(unit.get('lessons', [])) for unit in syllabus.get('units', []))
-        
+
         if total_lessons > max_hours:
             print(f"📊 Adjusting syllabus: {total_lessons} lessons → {max_hours} max hours")
             # Reduce lessons proportionally but keep at least 1 lesson per unit
@@ -61,17 +51,31 @@ class DurationParser:
                 if 'lessons' in unit:
                     new_count = max(1, int(len(unit['lessons']) * reduction_factor))
                     unit['lessons'] = unit['lessons'][:new_count]
-                    print(f"  → Unit '{unit['title']}': {len(unit['lessons'])} lessons")
-        
+                    print(f"  → Unit '{unit.get('title', '')}': {len(unit['lessons'])} lessons")
+
         return syllabus
 
+    @staticmethod
+    def trim_unit_to_budget(unit, remaining_hours):
+        """
+        Streaming counterpart of adjust_syllabus_to_duration: while units are
+        still arriving the total is unknown, so each unit keeps at most the
+        lessons left in the budget (and always at least one).
+        """
+        lessons = unit.get('lessons', [])
+        keep = max(1, int(remaining_hours))
+        if len(lessons) > keep:
+            print(f"📊 Trimming unit '{unit.get('title', '')}': {len(lessons)} → {keep} lessons")
+            unit = dict(unit, lessons=lessons[:keep])
+        return unit
+
     @staticmethod
     def calculate_realistic_lesson_count(total_hours):
         """Calculate realistic number of lessons based on total hours"""
         # For hour-based goals, be more aggressive with lesson count
         lesson_duration = 1.0  # 1 hour per lesson for hour-constrained goals
         practice_ratio = 0.2   # 20% practice time for intensive courses
-        
+
         available_lesson_time = total_hours * (1 - practice_ratio)
         lesson_count = max(1, int(available_lesson_time / lesson_duration))
         print(f"📚 Realistic lesson count for {total_hours}h: {lesson_count} lessons")
@@ -82,4 +86,48 @@ class DurationParser:
         """Check if the learning goal has an hour constraint"""
         learning_goal_lower = learning_goal.lower()
         hour_indicators = ['hour', 'hr', ' h ']
-        return any(indicator in learning_goal_lower for indicator in hour_indicators)
\ No newline at end of file
+        return any(indicator in learning_goal_lower for indicator in hour_indicators)
+
+
+@lru_cache(maxsize=4096)
+def _parse_duration(learning_goal):
+    learning_goal_lower = learning_goal.lower()
+
+    # First occurrence of each unit, then the highest-priority unit wins
+    first = {}
+    for match in _DURATION_RE.finditer(learning_goal_lower):
+        unit = _UNIT_PRIORITY[match.lastindex - 2]
+        if unit not in first:
+            first[unit] = int(match.group(1))
+
+    for unit in _UNIT_PRIORITY:
+        if unit in first:
+            value = first[unit]
+            label = _UNIT_LABELS[unit]
+            return value * _UNIT_HOURS[unit], f"{value} {label}{'s' if value > 1 else ''}"
+
+    # Default based on goal complexity
+    if any(x in learning_goal_lower for x in ['basic', 'introduction', 'fundamental', 'crash']):
+        return 8, "8 hours"
+    elif any(x in learning_goal_lower for x in ['intermediate', 'comprehensive']):
+        return 20, "20 hours"
+    elif any(x in learning_goal_lower for x in ['advanced', 'master', 'complete']):
+        return 40, "40 hours"
+    else:
+        return 24, "24 hours"
+
+
+def clean_study_schedule_content(content):
+    """Remove Study Period and Daily Commitment patterns from content"""
+    if not content:
+        return content
+
+    content = _SCHEDULE_RE.sub(_clean_schedule_match, content)
+
+    # Clean up any double spaces or empty lines
+    return ' '.join(content.split())
+
+
+def clean_many(contents):
+    """clean_study_schedule_content for a list of strings, in order"""
+    return [clean_study_schedule_content(content) for content in contents]
@@ -0,0 +1,307 @@
+# [file name]: fake_gemini.py
+"""
+Offline stand-in for the Gemini SDK, selected with LLM_BACKEND=fake.
+
+It has the surface llm_gateway uses (configure, get_default_generative_client,
+GenerativeModel.generate_content with and without stream=True) and answers
+each prompt with a canned response of the shape the calling route parses:
+syllabus, duration, study plan and resource JSON, a goal overview, or a plain
+chat answer. Latency, token rate and injected 500 / 429 errors follow the
+FAKE_GEMINI_* settings. Every call draws from a random generator seeded by
+FAKE_GEMINI_SEED, the prompt and how many times that prompt was sent before,
+so a run replays the same latencies and failures whatever the thread timing.
+
+FakeSession does the same for Resource Corner link probes.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from config import (
+    FAKE_GEMINI_LATENCY_DIST, FAKE_GEMINI_LATENCY_MS, FAKE_GEMINI_LATENCY_SPREAD,
+    FAKE_GEMINI_TOKENS_PER_SEC, FAKE_GEMINI_ERROR_RATE, FAKE_GEMINI_RATE_LIMIT_RATE,
+    FAKE_GEMINI_SEED, FAKE_LINK_LATENCY_MS
+)
+
+LATENCY_DISTRIBUTIONS = ('constant', 'uniform', 'lognormal')
+if FAKE_GEMINI_LATENCY_DIST not in LATENCY_DISTRIBUTIONS:
+    raise ValueError(f"FAKE_GEMINI_LATENCY_DIST must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+
+# About four characters per token for English text
+CHARS_PER_TOKEN = 4
+# Roughly the size of the chunks the streaming API sends
+STREAM_CHUNK_CHARS = 20 * CHARS_PER_TOKEN
+# Prompts whose attempt number is remembered (retries of the same prompt
+# draw new latencies and outcomes)
+MAX_TRACKED_PROMPTS = 4096
+
+_lock = threading.Lock()
+_attempts = OrderedDict()
+
+
+class FakeGeminiError(Exception):
+    """Injected upstream failure; code is the HTTP status it stands for"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class _Chunk:
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+def configure(api_key=None, transport=None):
+    """genai.configure() counterpart; there is nothing to connect to"""
+
+
+def get_default_generative_client():
+    return None
+
+
+class GenerativeModel:
+    """genai.GenerativeModel counterpart serving canned responses"""
+
+    def __init__(self, model_name, generation_config=None):
+        self.model_name = model_name
+        self.generation_config = generation_config
+
+    def generate_content(self, prompt, stream=False):
+        rng = _call_rng(prompt)
+        text = canned_response(prompt)
+        if stream:
+            return _stream(text, rng)
+
+        time.sleep(_first_token_seconds(rng))
+        _maybe_fail(rng)
+        time.sleep(_generation_seconds(len(text)))
+        return _Chunk(text)
+
+
+def _stream(text, rng):
+    time.sleep(_first_token_seconds(rng))
+    _maybe_fail(rng)
+    for start in range(0, len(text), STREAM_CHUNK_CHARS):
+        chunk = text[start:start + STREAM_CHUNK_CHARS]
+        if start:
+            time.sleep(_generation_seconds(len(chunk)))
+        yield _Chunk(chunk)
+
+
+def _call_rng(prompt):
+    digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()
+    with _lock:
+        attempt = _attempts.pop(digest, 0)
+        _attempts[digest] = attempt + 1
+        if len(_attempts) > MAX_TRACKED_PROMPTS:
+            _attempts.popitem(last=False)
+    return random.Random(f"{FAKE_GEMINI_SEED}:{digest}:{attempt}")
+
+
+def _first_token_seconds(rng):
+    median = FAKE_GEMINI_LATENCY_MS / 1000
+    if FAKE_GEMINI_LATENCY_DIST == 'uniform':
+        return max(0.0, rng.uniform(median * (1 - FAKE_GEMINI_LATENCY_SPREAD), median * (1 + FAKE_GEMINI_LATENCY_SPREAD)))
+    if FAKE_GEMINI_LATENCY_DIST == 'lognormal':
+        return median * math.exp(rng.gauss(0, FAKE_GEMINI_LATENCY_SPREAD))
+    return median
+
+
+def _generation_seconds(chars):
+    if FAKE_GEMINI_TOKENS_PER_SEC <= 0:
+        return 0.0
+    return chars / CHARS_PER_TOKEN / FAKE_GEMINI_TOKENS_PER_SEC
+
+
+def _maybe_fail(rng):
+    roll = rng.random()
+    if roll < FAKE_GEMINI_RATE_LIMIT_RATE:
+        raise FakeGeminiError(429, "429 Resource has been exhausted (injected by fake_gemini). Please retry in 1s.")
+    if roll < FAKE_GEMINI_RATE_LIMIT_RATE + FAKE_GEMINI_ERROR_RATE:
+        raise FakeGeminiError(500, "500 An internal error has occurred (injected by fake_gemini)")
+
+
+# ---------------------------------------------------------------------------
+# Canned responses, picked by the prompt text of each caller
+
+_TOPIC_PATTERNS = [
+    re.compile(r'learning syllabus for: (.+)'),
+    re.compile(r'helping a student learn about: (.+)'),
+    re.compile(r'"([^"\n]{1,200})"'),
+]
+
+SYLLABUS_UNITS = [
+    ("Foundations of {topic}", ["Introduction to {topic}", "Setting up the environment", "Core terminology",
+                                "First hands-on exercise", "Common beginner pitfalls"]),
+    ("Core Concepts", ["Fundamental building blocks", "Data structures and types", "Control flow and logic",
+                       "Functions and modules", "Debugging basics"]),
+    ("Working with Tools", ["Essential tooling", "Version control workflow", "Testing fundamentals",
+                            "Reading documentation", "Package management"]),
+    ("Intermediate Techniques", ["Design patterns", "Error handling strategies", "Performance basics",
+                                 "Working with APIs", "Code organization"]),
+    ("Applied Projects", ["Planning a project", "Building the core features", "Adding tests",
+                          "Deployment basics", "Project review"]),
+    ("Review and Next Steps", ["Reviewing key concepts", "Practice assessment", "Best practices recap",
+                               "Exploring advanced topics", "Building a learning roadmap"]),
+]
+
+
+def canned_response(prompt):
+    """The response text for a prompt, shaped like what its route expects"""
+    topic = _topic(prompt)
+    if 'learning syllabus for:' in prompt:
+        return _fenced(_syllabus(topic))
+    if 'suggest a realistic duration' in prompt or 'time constraint in HOURS' in prompt:
+        return _fenced(_duration(prompt))
+    if 'optimized daily study plan' in prompt:
+        return _fenced(_study_plan(topic, prompt))
+    if 'JSON array of high-quality resources' in prompt:
+        return _fenced(_resources(topic))
+    if 'You are an AI mentor' in prompt:
+        return _overview(topic)
+    return _answer(topic)
+
+
+def _topic(prompt):
+    for pattern in _TOPIC_PATTERNS:
+        match = pattern.search(prompt)
+        if match:
+            return match.group(1).strip()
+    return "this topic"
+
+
+def _fenced(data):
+    # Gemini usually wraps JSON in a markdown fence
+    return "```json\n" + json.dumps(data, indent=2) + "\n```"
+
+
+def _syllabus(topic):
+    return {
+        "goal": topic,
+        "units": [
+            {
+                "title": title.format(topic=topic),
+                "lessons": [lesson.format(topic=topic) for lesson in lessons],
+                "outcomes": [f"Explain {lessons[1].lower()}", f"Apply {title.format(topic=topic).lower()} in practice"]
+            }
+            for title, lessons in SYLLABUS_UNITS
+        ]
+    }
+
+
+def _duration(prompt):
+    match = re.search(r'"total_study_hours": (\d+)', prompt)
+    hours = int(match.group(1)) if match else 28
+    return {
+        "total_days": max(1, hours // 2),
+        "daily_study_hours": min(2, hours),
+        "total_study_hours": hours,
+        "difficulty_level": "intermediate",
+        "rationale": "Two focused hours a day leave room for practice and review",
+        "recommended_pace": "moderate",
+        "is_realistic": True,
+        "respects_time_constraint": True,
+        "constraint_type": "hours" if match else "calculated"
+    }
+
+
+def _study_plan(topic, prompt):
+    match = re.search(r'Duration: (\d+) days', prompt)
+    days = min(30, max(1, int(match.group(1)) if match else 7))
+    return {
+        "study_plan": [
+            {
+                "day": day,
+                "focus_area": f"{SYLLABUS_UNITS[(day - 1) % len(SYLLABUS_UNITS)][0].format(topic=topic)}",
+                "learning_objectives": [f"Understand the day {day} concepts of {topic}", "Complete the guided exercises"],
+                "key_topics": [lesson.format(topic=topic) for lesson in SYLLABUS_UNITS[(day - 1) % len(SYLLABUS_UNITS)][1][:3]],
+                "practice_activities": [f"Build a small {topic} example", "Review and refactor yesterday's code"],
+                "break_recommendations": "25min study, 5min break",
+                "estimated_hours": 2
+            }
+            for day in range(1, days + 1)
+        ],
+        "learning_strategy": "Short daily sessions that alternate new concepts with hands-on practice",
+        "success_tips": ["Practice every day", "Write notes in your own words", "Build something small each week"]
+    }
+
+
+def _resources(topic):
+    slug = re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-') or 'topic'
+    resources = []
+    for index in range(5):
+        video_id = hashlib.sha1(f"{topic}:{index}".encode('utf-8')).hexdigest()[:11]
+        resources.append({"title": f"{topic} tutorial part {index + 1}", "type": "YouTube",
+                          "url": f"https://www.youtube.com/watch?v={video_id}"})
+    for index in range(3):
+        resources.append({"title": f"{topic} guide {index + 1}", "type": "Article",
+                          "url": f"https://docs.example.org/{slug}/guide-{index + 1}"})
+    resources.append({"title": f"{topic} cheat sheet", "type": "PDF",
+                      "url": f"https://docs.example.org/{slug}/cheat-sheet.pdf"})
+    return resources
+
+
+def _overview(topic):
+    return (
+        f"Your goal, {topic}, covers a mix of core concepts and practical skills. "
+        "You will start with the fundamentals and the vocabulary the rest of the material builds on. "
+        "From there the plan moves into hands-on exercises so each idea is practised right away. "
+        "If your timeframe is short, this is ambitious, so the plan focuses on what matters most. "
+        "Still, I'll generate a focused plan to help you cover the essentials efficiently."
+    )
+
+
+def _answer(topic):
+    return (
+        f"Here is a short explanation about {topic}.\n\n"
+        "Start from the core idea: break the problem into small steps and make each one work before "
+        "moving on. A good way to practise is to write a tiny example, run it, and change one thing at "
+        "a time so you can see the effect.\n\n"
+        "1. Review the key terms from the current unit.\n"
+        "2. Work through one example by hand.\n"
+        "3. Try a variation on your own and compare the result.\n\n"
+        "If anything is unclear, ask about a specific step and we can go through it together."
+    )
+
+
+# ---------------------------------------------------------------------------
+# Link probes
+
+class FakeLinkError(OSError):
+    """Network error type of FakeSession (which never raises it)"""
+
+
+class FakeSession:
+    """Stands in for the link-check requests.Session; every URL answers 200"""
+
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        return self._answer()
+
+    def head(self, url, **kwargs):
+        return self._answer()
+
+    def _answer(self):
+        time.sleep(FAKE_LINK_LATENCY_MS / 1000)
+        return _LinkResponse(200)
+
+
+class _LinkResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
@@ -0,0 +1,58 @@
+# [file name]: gunicorn.conf.py
+# Production server settings, all taken from config.py / the environment:
+#   gunicorn -c gunicorn.conf.py app:app    (or: python serve.py)
+from config import (
+    SERVER_BIND, SERVER_WORKERS, SERVER_THREADS, SERVER_KEEPALIVE,
+    SERVER_TIMEOUT, SERVER_GRACEFUL_TIMEOUT,
+    SERVER_MAX_REQUESTS, SERVER_MAX_REQUESTS_JITTER, SERVICE_WARMUP,
+    METRICS_DIR, METRICS_FLUSH_INTERVAL
+)
+
+bind = SERVER_BIND
+# Workers share plans and job status through SQLite (PLAN_STORE_DB, PLAN_JOB_DB)
+workers = SERVER_WORKERS
+# Threads per worker: Gemini calls are I/O bound, so one slow call only ties up one thread
+worker_class = 'gthread'
+threads = SERVER_THREADS
+keepalive = SERVER_KEEPALIVE
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+max_requests = SERVER_MAX_REQUESTS
+max_requests_jitter = SERVER_MAX_REQUESTS_JITTER
+accesslog = '-'
+
+
+def on_starting(server):
+    # Counters start from zero with each server run
+    if METRICS_DIR:
+        import metrics
+        metrics.reset_multiprocess(METRICS_DIR)
+
+
+def post_worker_init(worker):
+    # The worker has imported the app and is about to accept connections.
+    # Each worker has its own Gemini limiter, so it gets 1/workers of the quota
+    import llm_gateway
+    llm_gateway.split_quota(worker.cfg.workers)
+    # Any worker answering /api/metrics reports the sum over all workers
+    if METRICS_DIR:
+        import metrics
+        metrics.enable_multiprocess(METRICS_DIR, METRICS_FLUSH_INTERVAL)
+    if SERVICE_WARMUP:
+        from app import start_warm_up
+        start_warm_up()
+
+
+def worker_exit(server, worker):
+    # Graceful stop or max_requests recycle: don't drop accepted plan jobs
+    from app import shutdown_background_work
+    shutdown_background_work()
+    import metrics
+    metrics.flush()
+
+
+def child_exit(server, worker):
+    # In the master: keep the exited worker's counters in the totals
+    if METRICS_DIR:
+        import metrics
+        metrics.retire_process(METRICS_DIR, worker.pid)
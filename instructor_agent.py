@@ -1,4 +1,4 @@
-import json
+from json_extractor import extract_json
 from llm_api import chat
 
 def generate_plan(lesson_id: str, learner_state: dict, syllabus: dict) -> dict:
@@ -17,7 +17,7 @@ Previous score: {learner_state['last_score']}. Return JSON:
     
     response = chat(prompt)
     try:
-        return json.loads(response)
+        return extract_json(response)
     except:
         return {
             "lesson_plan": {
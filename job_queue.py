@@ -0,0 +1,200 @@
+# [file name]: job_queue.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are already waiting"""
+
+
+class JobQueue:
+    """
+    Bounded background worker pool with pollable, per-stage job progress.
+    Jobs receive a progress(stage, status, **details) callback; finished
+    jobs are kept for result_ttl seconds so clients can collect them.
+
+    A job runs in the process that accepted it. With a db_path each status
+    change is also written to a SQLite file shared by all worker processes,
+    so a poll answered by another worker still finds the job.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, result_ttl=3600, max_jobs=1000, db_path=None):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.db_path = db_path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='plan-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._writes = 0
+
+    def submit(self, fn, *args, stages=(), **kwargs) -> str:
+        """Queue fn(*args, progress=..., **kwargs) and return its job ID"""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._prune(now)
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"{self._pending} jobs already queued")
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': None,
+                'stages': OrderedDict((name, {'status': 'pending'}) for name in stages),
+                'result': None,
+                'error': None,
+                'created_at': now,
+                'updated_at': now
+            }
+            self._pending += 1
+        self._persist(job_id)
+
+        def progress(stage, status='running', **details):
+            self._update_stage(job_id, stage, status, details)
+
+        self._executor.submit(self._run, job_id, fn, args, dict(kwargs, progress=progress))
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job's status, stages and (when finished) result"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._snapshot(job)
+        # Accepted by another worker process
+        return self._db_get(job_id)
+
+    def snapshot(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {'jobs': len(self._jobs), 'pending': self._pending, 'by_status': counts, 'shared': bool(self.db_path)}
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; optionally wait for running jobs to finish"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _run(self, job_id, fn, args, kwargs):
+        with self._lock:
+            self._pending -= 1
+            self._jobs[job_id]['status'] = 'running'
+            self._jobs[job_id]['updated_at'] = time.time()
+        self._persist(job_id)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            traceback.print_exc()
+            self._finish(job_id, 'failed', error=str(e))
+        else:
+            self._finish(job_id, 'succeeded', result=result)
+
+    def _update_stage(self, job_id, stage, status, details):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            info = job['stages'].setdefault(stage, {'status': 'pending'})
+            info.update(details, status=status)
+            job['stage'] = stage
+            job['updated_at'] = time.time()
+        self._persist(job_id)
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(status=status, result=result, error=error, updated_at=time.time())
+            if status == 'failed' and job['stage'] in job['stages']:
+                job['stages'][job['stage']]['status'] = 'failed'
+        self._persist(job_id)
+
+    def _prune(self, now):
+        # Drop expired finished jobs, then the oldest finished ones over the cap
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job['status'] in ('succeeded', 'failed')
+        ]
+        for job_id in finished:
+            if now - self._jobs[job_id]['updated_at'] > self.result_ttl or len(self._jobs) > self.max_jobs:
+                del self._jobs[job_id]
+
+    @staticmethod
+    def _snapshot(job):
+        snapshot = dict(job)
+        snapshot['stages'] = [
+            dict(info, name=name) for name, info in job['stages'].items()
+        ]
+        return snapshot
+
+    def _db(self):
+        # sqlite connections must not cross a fork
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Progress rows are rewritten per unit; losing the last few on a
+            # power cut is fine, an fsync per update is not
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS plan_jobs ('
+                'job_id TEXT PRIMARY KEY, job TEXT, updated_at REAL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _persist(self, job_id):
+        if not self.db_path:
+            return
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            snapshot = self._snapshot(job)
+        now = time.time()
+        try:
+            serialized = json.dumps(snapshot, default=str)
+            with self._db_lock:
+                conn = self._db()
+                conn.execute(
+                    'INSERT OR REPLACE INTO plan_jobs (job_id, job, updated_at) VALUES (?, ?, ?)',
+                    (job_id, serialized, snapshot['updated_at'])
+                )
+                self._writes += 1
+                # Also drops jobs abandoned by a worker that died mid-run
+                if self._writes % 100 == 0:
+                    conn.execute('DELETE FROM plan_jobs WHERE updated_at <= ?', (now - self.result_ttl,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Job store write failed: {e}")
+
+    def _db_get(self, job_id):
+        if not self.db_path:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db().execute(
+                    'SELECT job FROM plan_jobs WHERE job_id = ? AND updated_at > ?',
+                    (job_id, time.time() - self.result_ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Job store read failed: {e}")
+            return None
+        return json.loads(row[0]) if row else None
@@ -0,0 +1,215 @@
+# [file name]: json_extractor.py
+import json
+import re
+
+# Characters that can change scanner state; everything else is skipped in bulk
+_SPECIAL_RE = re.compile(r'[\[\]{}",:\\`]')
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class JSONExtractionError(ValueError):
+    """Raised when no JSON document can be recovered from model output"""
+
+
+class JSONStreamExtractor:
+    """
+    Incremental JSON extractor for LLM output.
+
+    feed() takes response text as it arrives (markdown fences and surrounding
+    prose are skipped) and returns the elements of the watched array that
+    completed in that chunk: the top-level array by default, or the array
+    stored under array_key in a top-level object (e.g. "units" or
+    "study_plan"). Only object/array elements are emitted early.
+
+    finish() returns the whole document. If the output was cut off, open
+    strings and containers are closed and a dangling partial value is
+    dropped; repaired is then True.
+
+    Brackets in prose are not mistaken for the document: a value that turns
+    out not to be valid JSON, or is interrupted by a ``` fence, is skipped,
+    and a value that starts mid-sentence is only used if no value starting
+    on its own line (or after a fence) follows.
+    """
+
+    def __init__(self, array_key=None):
+        self.array_key = array_key
+        self.repaired = False
+        self._text = ''
+        self._pos = 0
+        self._document = None
+        self._fallback = None  # first valid value that started mid-sentence
+        self._invalid = 0
+        self._fence_seen = False
+        self._reset_document()
+
+    def _reset_document(self):
+        self._start = None
+        self._inline = False
+        self._end = None
+        self._stack = []
+        self._in_string = False
+        self._string_start = None
+        self._escape_until = 0
+        self._last_string = None
+        self._key = None
+        self._target_depth = None
+        self._element_start = None
+        self._checkpoint = None  # (cut index, open containers) of the last safe cut
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level value has closed"""
+        return self._end is not None
+
+    def feed(self, chunk: str):
+        """Consume more text and return newly completed array elements"""
+        self._text += chunk
+        elements = []
+        if self._end is not None:
+            return elements
+
+        text = self._text
+        resume = len(text)
+        for match in _SPECIAL_RE.finditer(text, self._pos):
+            i = match.start()
+            char = match.group()
+
+            if self._in_string:
+                if i < self._escape_until:
+                    continue
+                if char == '\\':
+                    self._escape_until = i + 2
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = (self._string_start, i + 1)
+                continue
+
+            if char == '`':
+                if not text.startswith('```', i):
+                    if text.endswith('`' * (len(text) - i)):
+                        resume = i  # a fence may be split across chunks
+                        break
+                    continue
+                self._fence_seen = True
+                if self._start is not None:
+                    # A fence can't occur inside JSON: that bracket was prose
+                    self._reset_document()
+                continue
+
+            if self._start is None:
+                # Skip fences and prose until the first object or array
+                if char not in _CLOSERS:
+                    continue
+                self._start = i
+                line = text[text.rfind('\n', 0, i) + 1:i].strip()
+                self._inline = bool(line) and not self._fence_seen
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in _CLOSERS:
+                self._stack.append(char)
+                depth = len(self._stack)
+                if self._target_depth is not None and depth == self._target_depth + 1:
+                    self._element_start = i
+                elif char == '[' and self._target_depth is None and self._is_watched_array(depth):
+                    self._target_depth = depth
+                self._checkpoint = (i + 1, tuple(self._stack))
+            elif char in '}]':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == self._target_depth and self._element_start is not None:
+                    try:
+                        elements.append(json.loads(text[self._element_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass  # left to finish() to report
+                    self._element_start = None
+                if depth == 0:
+                    if self._close_document(i + 1):
+                        break
+                    continue
+                self._checkpoint = (i + 1, tuple(self._stack))
+            elif char == ',':
+                self._checkpoint = (i, tuple(self._stack))
+            elif char == ':' and self._stack == ['{'] and self._last_string:
+                try:
+                    self._key = json.loads(text[self._last_string[0]:self._last_string[1]])
+                except json.JSONDecodeError:
+                    self._key = None
+
+        self._pos = resume if self._end is None else self._end
+        return elements
+
+    def _close_document(self, end):
+        """Accept the value that just closed; False if scanning goes on"""
+        try:
+            document = json.loads(self._text[self._start:end])
+        except json.JSONDecodeError:
+            self._invalid += 1
+            self._reset_document()
+            return False
+        if self._inline:
+            # Keep looking for a value on its own line or in a fence
+            if self._fallback is None:
+                self._fallback = document
+            self._reset_document()
+            return False
+        self._document = document
+        self._end = end
+        return True
+
+    def finish(self):
+        """Return the parsed document, repairing a truncated tail if needed"""
+        if self._end is not None:
+            return self._document
+
+        if self._start is None:
+            if self._fallback is not None:
+                return self._fallback
+            if self._invalid:
+                raise JSONExtractionError("Model output contains no valid JSON object or array")
+            raise JSONExtractionError("No JSON object or array found in model output")
+
+        fragment = self._text[self._start:]
+        if self._in_string:
+            if self._escape_until > len(self._text):
+                fragment = fragment[:-1]  # half an escape sequence
+            fragment += '"'
+
+        candidates = [fragment.rstrip().rstrip(',:').rstrip() + self._closers(self._stack)]
+        if self._checkpoint:
+            cut, stack = self._checkpoint
+            candidates.append(self._text[self._start:cut] + self._closers(stack))
+
+        for candidate in candidates:
+            try:
+                document = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            self.repaired = True
+            return document
+
+        if self._fallback is not None:
+            return self._fallback
+        raise JSONExtractionError(f"Could not repair truncated JSON ({len(fragment)} chars)")
+
+    def _is_watched_array(self, depth):
+        if self.array_key is None:
+            return depth == 1
+        return depth == 2 and self._stack[0] == '{' and self._key == self.array_key
+
+    @staticmethod
+    def _closers(stack):
+        return ''.join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def extract_json(text: str):
+    """Parse the first JSON object or array in complete model output"""
+    extractor = JSONStreamExtractor()
+    extractor.feed(text or '')
+    document = extractor.finish()
+    if extractor.repaired:
+        print("🩹 Repaired truncated JSON from model output")
+    return document
@@ -120,6 +120,14 @@ function sendSuggestion(suggestion) {
 }
 
 function addMessage(text, sender) {
+    const messageText = createMessageElement(sender);
+    messageText.innerHTML = formatMessage(text);
+    
+    chatHistory.push({ sender, text, time: new Date().toISOString() });
+    saveChatHistory();
+}
+
+function createMessageElement(sender) {
     const chatMessages = document.getElementById('chatMessages');
     const welcomeMessage = document.getElementById('welcomeMessage');
     
@@ -146,7 +154,7 @@ function addMessage(text, sender) {
     messageDiv.innerHTML = `
         <div class="message-avatar">${avatar}</div>
         <div class="message-content">
-            <div class="message-text">${formatMessage(text)}</div>
+            <div class="message-text"></div>
             <div class="message-time">${time}</div>
         </div>
     `;
@@ -154,8 +162,7 @@ function addMessage(text, sender) {
     chatMessages.appendChild(messageDiv);
     chatMessages.scrollTop = chatMessages.scrollHeight;
     
-    chatHistory.push({ sender, text, time: new Date().toISOString() });
-    saveChatHistory();
+    return messageDiv.querySelector('.message-text');
 }
 
 function formatMessage(text) {
@@ -172,13 +179,22 @@ function formatMessage(text) {
 async function generateAIResponse(userMessage) {
     showLoading(true);
     
+    const courseContext = {
+        course_name: currentCourse?.course || 'Unknown Course',
+        structure: currentCourse?.comprehensive_lesson_plan || {},
+        plan_id: currentCourse?.plan_id || null,
+        current_unit: currentUnit?.unit_title || 'General'
+    };
+
     try {
-        const courseContext = {
-            course_name: currentCourse?.course || 'Unknown Course',
-            structure: currentCourse?.comprehensive_lesson_plan || {},
-            current_unit: currentUnit?.unit_title || 'General'
-        };
+        // Render tokens as they arrive; fall back to the blocking endpoint
+        // only if the stream fails before producing any text
+        if (await streamAIResponse(userMessage, courseContext)) return;
+    } catch (error) {
+        console.warn('Streaming chat failed, retrying without streaming:', error);
+    }
 
+    try {
         const response = await fetch('/api/ai/chat', {
             method: 'POST',
             headers: {
@@ -206,6 +222,75 @@ async function generateAIResponse(userMessage) {
     }
 }
 
+// Stream the AI response over Server-Sent Events. Returns true once a
+// message has been rendered, false if the stream produced no text.
+async function streamAIResponse(userMessage, courseContext) {
+    const response = await fetch('/api/ai/chat/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            message: userMessage,
+            course_context: courseContext,
+            chat_history: chatHistory.slice(-10)
+        })
+    });
+
+    if (!response.ok || !response.body) throw new Error(`API error: ${response.status}`);
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const chatMessages = document.getElementById('chatMessages');
+    let buffer = '';
+    let text = '';
+    let messageText = null;
+
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventType = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) eventType = line.slice(6).trim();
+                    else if (line.startsWith('data:')) data += line.slice(5).trim();
+                });
+
+                if (eventType !== 'message' || !data) continue;
+                const payload = JSON.parse(data);
+                if (!payload.delta) continue;
+
+                if (!messageText) {
+                    showLoading(false);
+                    messageText = createMessageElement('assistant');
+                }
+                text += payload.delta;
+                messageText.innerHTML = formatMessage(text);
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            }
+        }
+    } catch (error) {
+        // Keep the partial answer rather than asking the question twice
+        if (!messageText) throw error;
+        console.warn('Chat stream interrupted:', error);
+    }
+
+    if (!messageText) return false;
+
+    chatHistory.push({ sender: 'assistant', text, time: new Date().toISOString() });
+    saveChatHistory();
+    showLoading(false);
+    return true;
+}
+
 // Quiz System - Redirect to Separate Page
 async function quizMe() {
     console.log('🎯 Quiz Me button clicked');
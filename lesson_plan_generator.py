@@ -1,12 +1,53 @@
 # [file name]: enhanced_lesson_plan.py
 
+import io
 import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 
-def generate_comprehensive_lesson_plan(syllabus_file: str = 'generated_syllabus.json'):
+from lesson_plan_model import (
+    Lesson, LessonPlan, TimeBreakdown, Unit, intern_text,
+    generate_assessment_methods, generate_learning_objectives, generate_prerequisites
+)
+
+# Background writer for optional plan exports
+_export_lock = threading.Lock()
+_export_executor = None
+
+# Common concept mappings, keyed by lesson title keyword
+LESSON_CONCEPTS = {
+    'introduction': ['Fundamental Principles', 'Basic Terminology', 'Course Overview'],
+    'basic': ['Core Concepts', 'Fundamental Techniques', 'Essential Skills'],
+    'fundamental': ['Key Principles', 'Basic Operations', 'Core Methodology'],
+    'advanced': ['Complex Techniques', 'Advanced Applications', 'Expert Methods'],
+    'project': ['Practical Implementation', 'Real-world Application', 'Project Development'],
+    'lab': ['Hands-on Practice', 'Experimental Learning', 'Skill Application'],
+    'practice': ['Skill Development', 'Application Exercises', 'Practical Scenarios']
+}
+
+# Unit-specific concepts and topics: (unit title keywords, additions)
+UNIT_CONCEPTS = (
+    (('python', 'programming'), ['Syntax', 'Data Structures', 'Control Flow', 'Functions']),
+    (('data',), ['Data Analysis', 'Data Manipulation', 'Data Visualization']),
+    (('machine learning',), ['Algorithms', 'Model Training', 'Prediction', 'Evaluation']),
+    (('statistics',), ['Descriptive Statistics', 'Probability', 'Inferential Methods'])
+)
+UNIT_TOPICS = (
+    (('python',), ['Code Examples', 'Best Practices', 'Common Pitfalls']),
+    (('data',), ['Data Processing', 'Analysis Techniques', 'Result Interpretation'])
+)
+
+def generate_comprehensive_lesson_plan(syllabus_file: str = 'generated_syllabus.json',
+                                       workers: int = None, verbose: bool = True):
     """
     Generate a comprehensive lesson plan with detailed topics, key concepts, and time estimates
-    for each unit and lesson from the syllabus.
+    for each unit and lesson from the syllabus file, and save it next to the working directory.
     """
     
     try:
@@ -16,80 +57,164 @@ def generate_comprehensive_lesson_plan(syllabus_file: str = 'generated_syllabus.
         print(f"❌ Syllabus file '{syllabus_file}' not found.")
         return
     
-    print("🎓 COMPREHENSIVE LESSON PLAN GENERATOR")
-    print("=" * 60)
+    lesson_plan = build_comprehensive_lesson_plan(syllabus, workers=workers, verbose=verbose)
+    export_lesson_plan(lesson_plan, '.')
+    
+    return lesson_plan
+
+def build_comprehensive_lesson_plan(syllabus: dict, on_unit=None, workers: int = None,
+                                    verbose: bool = True, executor=None) -> dict:
+    """build_lesson_plan as the comprehensive_lesson_plan JSON dict"""
+    return build_lesson_plan(syllabus, on_unit, workers, verbose, executor).to_dict()
+
+def build_lesson_plan(syllabus: dict, on_unit=None, workers: int = None,
+                      verbose: bool = True, executor=None) -> LessonPlan:
+    """
+    Build the comprehensive lesson plan for a syllabus dict entirely in memory.
+    Any duration_constraint on the syllabus is carried through to the plan;
+    on_unit(completed_units, total_units) is called after each unit is built.
+    
+    For very large syllabi, workers > 1 builds chunks of units in a process pool
+    (or pass an existing executor to reuse one across plans); units are merged
+    back in order. verbose=False skips the per-unit and per-lesson console output.
+    """
+    
+    if verbose:
+        print("🎓 COMPREHENSIVE LESSON PLAN GENERATOR")
+        print("=" * 60)
     
     course_goal = syllabus.get('goal', 'Unknown Course')
     units = syllabus.get('units', [])
+    duration_constraint = syllabus.get('duration_constraint')
     
     # Calculate total course duration
     total_course_hours = calculate_total_course_duration(course_goal)
     
-    lesson_plan = {
-        "course": course_goal,
-        "generated_date": datetime.now().strftime("%Y-%m-%d"),
-        "total_estimated_duration": f"{total_course_hours} hours",
-        "total_units": len(units),
-        "comprehensive_lesson_plan": {}
-    }
-    
+    lesson_plan = LessonPlan(
+        course=intern_text(course_goal),
+        generated_date=datetime.now().strftime("%Y-%m-%d"),
+        total_hours=total_course_hours,
+        units=[],
+        duration_constraint=duration_constraint
+    )
+
     # Generate lesson plan for each unit
-    for unit_index, unit in enumerate(units, 1):
-        unit_title = unit.get('title', f'Unit {unit_index}')
-        lessons = unit.get('lessons', [])
-        outcomes = unit.get('outcomes', [])
-        
-        # Calculate unit time
-        unit_hours = total_course_hours / len(units)
-        lesson_hours = unit_hours / len(lessons) if lessons else 0
-        
-        unit_plan = {
-            "unit_title": unit_title,
-            "unit_objective": generate_unit_objective(unit_title, outcomes),
-            "unit_outcomes": outcomes,
-            "unit_duration": f"{unit_hours:.1f} hours",
-            "total_lessons": len(lessons),
-            "lessons": []
-        }
+    unit_hours = total_course_hours / len(units) if units else 0
+    unit_plans = _build_units(units, unit_hours, course_goal, workers, verbose, executor)
+    for unit_index, unit_plan in enumerate(unit_plans, 1):
+        lesson_plan.units.append(unit_plan)
         
+        if on_unit:
+            on_unit(unit_index, len(units))
+    
+    return lesson_plan
+
+def _build_units(units: list, unit_hours: float, course_goal: str, workers, verbose, executor):
+    """Yield the built units in order, serially or from a pool in chunks of units"""
+    if executor is None and (not workers or workers <= 1 or len(units) < 2):
+        for unit_index, unit in enumerate(units, 1):
+            yield build_unit(unit, unit_index, unit_hours, course_goal, verbose)
+        return
+    
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    # A few chunks per worker keeps them balanced without paying IPC per unit
+    chunksize = max(1, len(units) // ((workers or os.cpu_count() or 1) * 4))
+    try:
+        yield from pool.map(
+            build_unit, units, range(1, len(units) + 1),
+            repeat(unit_hours), repeat(course_goal), repeat(verbose),
+            chunksize=chunksize
+        )
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+def build_unit_plan(unit: dict, unit_index: int, unit_hours: float, course_goal: str,
+                    verbose: bool = True) -> dict:
+    """Expand one syllabus unit into its lesson plan entry, spreading unit_hours over its lessons"""
+    return build_unit(unit, unit_index, unit_hours, course_goal, verbose).to_dict()
+
+def build_unit(unit: dict, unit_index: int, unit_hours: float, course_goal: str,
+               verbose: bool = True) -> Unit:
+    """build_unit_plan as a Unit model"""
+    unit_title = intern_text(unit.get('title', f'Unit {unit_index}'))
+    lessons = unit.get('lessons', [])
+    outcomes = unit.get('outcomes', [])
+    
+    lesson_hours = unit_hours / len(lessons) if lessons else 0
+    
+    unit_plan = Unit(
+        unit_title=unit_title,
+        unit_objective=generate_unit_objective(unit_title, outcomes),
+        unit_outcomes=tuple(intern_text(outcome) for outcome in outcomes),
+        unit_hours=unit_hours,
+        lessons=[]
+    )
+    
+    if verbose:
         print(f"\n📚 UNIT {unit_index}: {unit_title}")
         print(f"   ⏰ Duration: {unit_hours:.1f} hours")
-        print(f"   🎯 Objective: {unit_plan['unit_objective']}")
+        print(f"   🎯 Objective: {unit_plan.unit_objective}")
         print(f"   📋 Key Outcomes:")
         for outcome in outcomes:
             print(f"      • {outcome}")
+    
+    # Generate detailed lesson plans
+    for lesson_index, lesson_title in enumerate(lessons, 1):
+        lesson = build_lesson(
+            lesson_title, lesson_index, lesson_hours, 
+            unit_title, course_goal, outcomes
+        )
+        unit_plan.lessons.append(lesson)
         
-        # Generate detailed lesson plans
-        for lesson_index, lesson_title in enumerate(lessons, 1):
-            lesson_details = generate_lesson_details(
-                lesson_title, lesson_index, lesson_hours, 
-                unit_title, course_goal, outcomes
-            )
-            unit_plan["lessons"].append(lesson_details)
-            
-            # Print lesson summary
-            print(f"\n   📖 Lesson {lesson_index}: {lesson_title}")
-            print(f"      ⏰ Duration: {lesson_hours:.1f} hours")
-            print(f"      🎯 Key Concepts:")
-            for concept in lesson_details.get('key_concepts', [])[:3]:
-                print(f"         • {concept}")
-            print(f"      📝 Important Topics:")
-            for topic in lesson_details.get('important_topics', [])[:2]:
-                print(f"         • {topic}")
+        if not verbose:
+            continue
         
-        lesson_plan["comprehensive_lesson_plan"][f"unit_{unit_index}"] = unit_plan
+        # Print lesson summary
+        print(f"\n   📖 Lesson {lesson_index}: {lesson_title}")
+        print(f"      ⏰ Duration: {lesson_hours:.1f} hours")
+        print(f"      🎯 Key Concepts:")
+        for concept in lesson.key_concepts[:3]:
+            print(f"         • {concept}")
+        print(f"      📝 Important Topics:")
+        for topic in lesson.important_topics[:2]:
+            print(f"         • {topic}")
     
-    # Save comprehensive lesson plan
-    output_file = 'comprehensive_lesson_plan.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(lesson_plan, f, indent=2)
+    return unit_plan
+
+def export_lesson_plan(lesson_plan: dict, export_dir: str) -> dict:
+    """Write the JSON and formatted text exports atomically into export_dir"""
+    os.makedirs(export_dir, exist_ok=True)
+    json_file = os.path.join(export_dir, 'comprehensive_lesson_plan.json')
+    text_file = os.path.join(export_dir, 'formatted_lesson_plan.txt')
     
-    print(f"\n✅ Comprehensive lesson plan saved as '{output_file}'")
+    _write_atomically(json_file, json.dumps(lesson_plan, indent=2))
+    print(f"\n✅ Comprehensive lesson plan saved as '{json_file}'")
     
     # Generate formatted text output
-    generate_formatted_output(lesson_plan)
+    generate_formatted_output(lesson_plan, text_file)
     
-    return lesson_plan
+    return {"json": json_file, "text": text_file}
+
+def export_lesson_plan_async(lesson_plan: dict, export_dir: str):
+    """Queue export_lesson_plan on a background thread; returns a Future"""
+    global _export_executor
+    with _export_lock:
+        if _export_executor is None:
+            _export_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='plan-export')
+    return _export_executor.submit(export_lesson_plan, lesson_plan, export_dir)
+
+def _write_atomically(path: str, content: str):
+    """Write to a temp file in the same directory, then rename over path"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 def calculate_total_course_duration(course_goal: str) -> float:
     """Calculate total course duration based on course goal"""
@@ -116,60 +241,33 @@ def generate_unit_objective(unit_title: str, outcomes: list) -> str:
 def generate_lesson_details(lesson_title: str, lesson_index: int, lesson_hours: float, 
                           unit_title: str, course_goal: str, outcomes: list) -> dict:
     """Generate detailed lesson content with topics and key concepts"""
+    return build_lesson(lesson_title, lesson_index, lesson_hours, unit_title, course_goal, outcomes).to_dict()
+
+def build_lesson(lesson_title: str, lesson_index: int, lesson_hours: float, 
+                 unit_title: str, course_goal: str, outcomes: list) -> Lesson:
+    """generate_lesson_details as a Lesson model; the derived text is written by to_dict()"""
     
     # Extract key concepts from lesson title and context
-    key_concepts = extract_key_concepts(lesson_title, unit_title, course_goal)
+    key_concepts = tuple(intern_text(concept) for concept in extract_key_concepts(lesson_title, unit_title, course_goal))
     
     # Generate important topics
-    important_topics = generate_important_topics(lesson_title, unit_title, key_concepts)
-    
-    # Generate time breakdown
-    time_breakdown = generate_time_breakdown(lesson_hours)
+    important_topics = tuple(generate_important_topics(lesson_title, unit_title, key_concepts))
     
-    return {
-        "lesson_number": lesson_index,
-        "lesson_title": lesson_title,
-        "lesson_duration": f"{lesson_hours:.1f} hours",
-        "key_concepts": key_concepts,
-        "important_topics": important_topics,
-        "time_breakdown": time_breakdown,
-        "learning_objectives": generate_learning_objectives(lesson_title, key_concepts),
-        "prerequisites": generate_prerequisites(lesson_index, unit_title),
-        "assessment_methods": generate_assessment_methods(lesson_title)
-    }
+    return Lesson(
+        lesson_number=lesson_index,
+        lesson_title=intern_text(lesson_title),
+        lesson_hours=lesson_hours,
+        unit_title=unit_title,
+        key_concepts=key_concepts,
+        important_topics=important_topics,
+        time_breakdown=TimeBreakdown.for_hours(lesson_hours)
+    )
 
 def extract_key_concepts(lesson_title: str, unit_title: str, course_goal: str) -> list:
     """Extract key concepts from lesson context"""
-    concepts = []
-    
-    # Common concept mappings
-    concept_map = {
-        'introduction': ['Fundamental Principles', 'Basic Terminology', 'Course Overview'],
-        'basic': ['Core Concepts', 'Fundamental Techniques', 'Essential Skills'],
-        'fundamental': ['Key Principles', 'Basic Operations', 'Core Methodology'],
-        'advanced': ['Complex Techniques', 'Advanced Applications', 'Expert Methods'],
-        'project': ['Practical Implementation', 'Real-world Application', 'Project Development'],
-        'lab': ['Hands-on Practice', 'Experimental Learning', 'Skill Application'],
-        'practice': ['Skill Development', 'Application Exercises', 'Practical Scenarios']
-    }
-    
-    lesson_lower = lesson_title.lower()
-    unit_lower = unit_title.lower()
-    
-    # Add concepts based on keywords
-    for keyword, concept_list in concept_map.items():
-        if keyword in lesson_lower:
-            concepts.extend(concept_list)
-    
-    # Add unit-specific concepts
-    if 'python' in unit_lower or 'programming' in unit_lower:
-        concepts.extend(['Syntax', 'Data Structures', 'Control Flow', 'Functions'])
-    if 'data' in unit_lower:
-        concepts.extend(['Data Analysis', 'Data Manipulation', 'Data Visualization'])
-    if 'machine learning' in unit_lower:
-        concepts.extend(['Algorithms', 'Model Training', 'Prediction', 'Evaluation'])
-    if 'statistics' in unit_lower:
-        concepts.extend(['Descriptive Statistics', 'Probability', 'Inferential Methods'])
+    # Add concepts based on keywords, then unit-specific concepts
+    concepts = list(_lesson_concepts(lesson_title))
+    concepts.extend(_unit_concepts(unit_title))
     
     # Ensure we have at least 3 concepts
     while len(concepts) < 3:
@@ -190,64 +288,60 @@ def generate_important_topics(lesson_title: str, unit_title: str, key_concepts:
         topics.append(f"Deep dive into {concept}")
     
     # Add unit-specific topics
-    unit_lower = unit_title.lower()
-    if 'python' in unit_lower:
-        topics.extend(['Code Examples', 'Best Practices', 'Common Pitfalls'])
-    if 'data' in unit_lower:
-        topics.extend(['Data Processing', 'Analysis Techniques', 'Result Interpretation'])
+    topics.extend(_unit_topics(unit_title))
     
     return topics[:6]  # Return max 6 topics
 
-def generate_time_breakdown(lesson_hours: float) -> dict:
-    """Generate detailed time breakdown for the lesson"""
-    total_minutes = lesson_hours * 60
-    
-    return {
-        "theory_concepts": f"{int(total_minutes * 0.3)} minutes",
-        "practical_exercises": f"{int(total_minutes * 0.4)} minutes",
-        "examples_demonstrations": f"{int(total_minutes * 0.2)} minutes",
-        "review_assessment": f"{int(total_minutes * 0.1)} minutes"
-    }
+def _keyword_pattern(keywords):
+    """One regex finding every keyword occurrence, overlapping ones included, like `keyword in text`"""
+    keywords = sorted(set(keywords), key=len, reverse=True)
+    first_chars = ''.join(sorted({re.escape(keyword[0]) for keyword in keywords}))
+    alternation = '|'.join(re.escape(keyword) for keyword in keywords)
+    return re.compile(f'(?=[{first_chars}])(?=({alternation}))')
 
-def generate_learning_objectives(lesson_title: str, key_concepts: list) -> list:
-    """Generate learning objectives for the lesson"""
-    objectives = [
-        f"Understand the core principles of {lesson_title}",
-        f"Apply {key_concepts[0] if key_concepts else 'key concepts'} in practical scenarios",
-        f"Demonstrate proficiency in {lesson_title} techniques"
-    ]
-    
-    if len(key_concepts) > 1:
-        objectives.append(f"Analyze relationships between {key_concepts[0]} and {key_concepts[1]}")
-    
-    return objectives
+def _match_keywords(pattern, text: str) -> set:
+    return set(pattern.findall(text.lower()))
 
-def generate_prerequisites(lesson_index: int, unit_title: str) -> list:
-    """Generate prerequisites for the lesson"""
-    if lesson_index == 1:
-        return ["Basic computer literacy", "Willingness to learn"]
-    else:
-        return [
-            f"Completion of previous lessons in {unit_title}",
-            "Understanding of fundamental concepts covered earlier",
-            "Basic practical skills from preceding lessons"
-        ]
+@lru_cache(maxsize=16384)
+def _lesson_concepts(lesson_title: str) -> tuple:
+    found = _match_keywords(_LESSON_KEYWORD_RE, lesson_title)
+    return tuple(
+        concept
+        for keyword, concept_list in LESSON_CONCEPTS.items() if keyword in found
+        for concept in concept_list
+    )
+
+@lru_cache(maxsize=4096)
+def _unit_concepts(unit_title: str) -> tuple:
+    found = _match_keywords(_UNIT_CONCEPT_RE, unit_title)
+    return tuple(
+        concept
+        for keywords, concept_list in UNIT_CONCEPTS if found.intersection(keywords)
+        for concept in concept_list
+    )
 
-def generate_assessment_methods(lesson_title: str) -> list:
-    """Generate assessment methods for the lesson"""
-    return [
-        f"Practical exercise on {lesson_title}",
-        "Concept understanding quiz",
-        "Hands-on project application",
-        "Peer review and discussion"
-    ]
+@lru_cache(maxsize=4096)
+def _unit_topics(unit_title: str) -> tuple:
+    found = _match_keywords(_UNIT_TOPIC_RE, unit_title)
+    return tuple(
+        topic
+        for keywords, topic_list in UNIT_TOPICS if found.intersection(keywords)
+        for topic in topic_list
+    )
 
-def generate_formatted_output(lesson_plan: dict):
+# Built once at import; results are memoized per lesson and unit title above
+_LESSON_KEYWORD_RE = _keyword_pattern(LESSON_CONCEPTS)
+_UNIT_CONCEPT_RE = _keyword_pattern(k for keywords, _ in UNIT_CONCEPTS for k in keywords)
+_UNIT_TOPIC_RE = _keyword_pattern(k for keywords, _ in UNIT_TOPICS for k in keywords)
+
+def generate_time_breakdown(lesson_hours: float) -> dict:
+    """Generate detailed time breakdown for the lesson"""
+    return TimeBreakdown.for_hours(lesson_hours).to_dict()
+
+def generate_formatted_output(lesson_plan: dict, output_file: str = 'formatted_lesson_plan.txt'):
     """Generate a beautifully formatted text output of the lesson plan"""
     
-    output_file = 'formatted_lesson_plan.txt'
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with io.StringIO() as f:
         f.write("🎓 COMPREHENSIVE LESSON PLAN\n")
         f.write("=" * 60 + "\n\n")
         
@@ -296,6 +390,8 @@ def generate_formatted_output(lesson_plan: dict):
                 f.write("\n" + "  " + "-" * 40 + "\n\n")
             
             f.write("=" * 60 + "\n\n")
+        
+        _write_atomically(output_file, f.getvalue())
     
     print(f"✅ Formatted lesson plan saved as '{output_file}'")
 
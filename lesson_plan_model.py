@@ -0,0 +1,152 @@
+# [file name]: lesson_plan_model.py
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+def intern_text(value):
+    """Intern strings that repeat across lessons and cached plans; other values pass through"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def to_plain(plan):
+    """JSON-ready dict for a LessonPlan; plain dict plans are returned unchanged"""
+    return plan.to_dict() if hasattr(plan, 'to_dict') else plan
+
+
+@dataclass(slots=True, frozen=True)
+class TimeBreakdown:
+    """Minutes per activity; every lesson of the same length shares one instance"""
+    theory_concepts: int
+    practical_exercises: int
+    examples_demonstrations: int
+    review_assessment: int
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def for_hours(lesson_hours: float) -> 'TimeBreakdown':
+        total_minutes = lesson_hours * 60
+        return TimeBreakdown(
+            int(total_minutes * 0.3),
+            int(total_minutes * 0.4),
+            int(total_minutes * 0.2),
+            int(total_minutes * 0.1)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "theory_concepts": f"{self.theory_concepts} minutes",
+            "practical_exercises": f"{self.practical_exercises} minutes",
+            "examples_demonstrations": f"{self.examples_demonstrations} minutes",
+            "review_assessment": f"{self.review_assessment} minutes"
+        }
+
+
+@dataclass(slots=True)
+class Lesson:
+    """
+    One lesson of a unit. Only what the text is derived from is stored:
+    durations, objectives, prerequisites and assessment methods are written
+    out by to_dict().
+    """
+    lesson_number: int
+    lesson_title: str
+    lesson_hours: float
+    unit_title: str
+    key_concepts: tuple
+    important_topics: tuple
+    time_breakdown: TimeBreakdown
+
+    def to_dict(self) -> dict:
+        return {
+            "lesson_number": self.lesson_number,
+            "lesson_title": self.lesson_title,
+            "lesson_duration": f"{self.lesson_hours:.1f} hours",
+            "key_concepts": list(self.key_concepts),
+            "important_topics": list(self.important_topics),
+            "time_breakdown": self.time_breakdown.to_dict(),
+            "learning_objectives": generate_learning_objectives(self.lesson_title, self.key_concepts),
+            "prerequisites": generate_prerequisites(self.lesson_number, self.unit_title),
+            "assessment_methods": generate_assessment_methods(self.lesson_title)
+        }
+
+
+@dataclass(slots=True)
+class Unit:
+    unit_title: str
+    unit_objective: str
+    unit_outcomes: tuple
+    unit_hours: float
+    lessons: list
+
+    def to_dict(self) -> dict:
+        return {
+            "unit_title": self.unit_title,
+            "unit_objective": self.unit_objective,
+            "unit_outcomes": list(self.unit_outcomes),
+            "unit_duration": f"{self.unit_hours:.1f} hours",
+            "total_lessons": len(self.lessons),
+            "lessons": [lesson.to_dict() for lesson in self.lessons]
+        }
+
+
+@dataclass(slots=True)
+class LessonPlan:
+    """
+    Compact in-memory lesson plan. to_dict() gives the comprehensive_lesson_plan
+    JSON shape the routes, exports and chat index work with; call it only at
+    those boundaries.
+    """
+    course: str
+    generated_date: str
+    total_hours: float
+    units: list
+    duration_constraint: dict = None
+
+    def to_dict(self) -> dict:
+        lesson_plan = {
+            "course": self.course,
+            "generated_date": self.generated_date,
+            "total_estimated_duration": f"{self.total_hours} hours",
+            "total_units": len(self.units),
+            "comprehensive_lesson_plan": {
+                f"unit_{unit_index}": unit.to_dict() for unit_index, unit in enumerate(self.units, 1)
+            }
+        }
+        if self.duration_constraint:
+            lesson_plan["duration_constraint"] = self.duration_constraint
+        return lesson_plan
+
+
+def generate_learning_objectives(lesson_title: str, key_concepts) -> list:
+    """Generate learning objectives for the lesson"""
+    objectives = [
+        f"Understand the core principles of {lesson_title}",
+        f"Apply {key_concepts[0] if key_concepts else 'key concepts'} in practical scenarios",
+        f"Demonstrate proficiency in {lesson_title} techniques"
+    ]
+
+    if len(key_concepts) > 1:
+        objectives.append(f"Analyze relationships between {key_concepts[0]} and {key_concepts[1]}")
+
+    return objectives
+
+def generate_prerequisites(lesson_index: int, unit_title: str) -> list:
+    """Generate prerequisites for the lesson"""
+    if lesson_index == 1:
+        return ["Basic computer literacy", "Willingness to learn"]
+    else:
+        return [
+            f"Completion of previous lessons in {unit_title}",
+            "Understanding of fundamental concepts covered earlier",
+            "Basic practical skills from preceding lessons"
+        ]
+
+def generate_assessment_methods(lesson_title: str) -> list:
+    """Generate assessment methods for the lesson"""
+    return [
+        f"Practical exercise on {lesson_title}",
+        "Concept understanding quiz",
+        "Hands-on project application",
+        "Peer review and discussion"
+    ]
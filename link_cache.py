@@ -0,0 +1,102 @@
+# [file name]: link_cache.py
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_YOUTUBE_HOSTS = {'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com'}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share one cache entry"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    path = parts.path
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    # YouTube: every spelling of a video becomes its watch?v= URL
+    if host == 'youtu.be' and path.strip('/'):
+        return f"https://www.youtube.com/watch?v={path.strip('/').split('/')[0]}"
+    if host in _YOUTUBE_HOSTS and path == '/watch':
+        video_ids = [v for k, v in query if k == 'v']
+        if video_ids:
+            return f"https://www.youtube.com/watch?v={video_ids[0]}"
+
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted((k, v) for k, v in query if not k.lower().startswith('utm_'))
+
+    return urlunsplit((scheme, netloc, path or '/', urlencode(query), ''))
+
+
+class LinkVerificationCache:
+    """SQLite-backed verdicts for probed URLs, keyed by canonical URL"""
+
+    def __init__(self, db_path, ok_ttl, dead_ttl):
+        self.db_path = db_path
+        self.ok_ttl = ok_ttl
+        self.dead_ttl = dead_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def get_many(self, urls) -> dict:
+        """Return {canonical_url: (verified, status_code)} for fresh entries"""
+        urls = list(set(urls))
+        if not urls:
+            return {}
+        now = time.time()
+        try:
+            with self._lock:
+                rows = self._db().execute(
+                    f"SELECT url, verified, status_code, checked_at FROM link_checks "
+                    f"WHERE url IN ({','.join('?' * len(urls))})",
+                    urls
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Link cache read failed: {e}")
+            return {}
+
+        fresh = {}
+        for url, verified, status_code, checked_at in rows:
+            ttl = self.ok_ttl if verified else self.dead_ttl
+            if checked_at + ttl > now:
+                fresh[url] = (bool(verified), status_code)
+        return fresh
+
+    def set(self, url, verified, status_code):
+        """Record the verdict for a canonical URL"""
+        try:
+            with self._lock:
+                conn = self._db()
+                conn.execute(
+                    'INSERT OR REPLACE INTO link_checks (url, verified, status_code, checked_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (url, int(bool(verified)), status_code, time.time())
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Link cache write failed: {e}")
+
+    def _db(self):
+        # sqlite connections must not cross a fork
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS link_checks ('
+                'url TEXT PRIMARY KEY, verified INTEGER, status_code INTEGER, checked_at REAL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
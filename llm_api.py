@@ -1,28 +1,26 @@
-import google.generativeai as genai
 import json
-from config import GEMINI_API_KEY
+import llm_gateway
+import metrics
 
 class GeminiAPI:
     def __init__(self):
-        if GEMINI_API_KEY:
-            genai.configure(api_key=GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        else:
-            self.model = None
+        # The SDK and model are loaded by the gateway on the first call
+        self.available = llm_gateway.is_available()
+        if not self.available:
             print("⚠️  No Gemini API key found. Using fallback responses.")
 
-    def generate_response(self, prompt: str) -> str:
-        if not self.model:
+    def generate_response(self, prompt: str, cache_namespace: str = None) -> str:
+        if not self.available:
             return self._get_fallback_syllabus()
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return llm_gateway.generate_text(prompt, cache_namespace=cache_namespace)
         except Exception as e:
             print(f"❌ Gemini API error: {e}")
             return self._get_fallback_syllabus()
 
     def _get_fallback_syllabus(self) -> str:
+        metrics.FALLBACKS.inc('_get_fallback_syllabus')
         return '''{
   "goal": "python programming",
   "units": [
@@ -46,5 +44,5 @@ class GeminiAPI:
 
 gemini_api = GeminiAPI()
 
-def chat(prompt: str) -> str:
-    return gemini_api.generate_response(prompt)
\ No newline at end of file
+def chat(prompt: str, cache_namespace: str = None) -> str:
+    return gemini_api.generate_response(prompt, cache_namespace)
\ No newline at end of file
@@ -0,0 +1,139 @@
+# [file name]: llm_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LLMCache:
+    """Two-tier response cache: bounded in-memory LRU in front of a SQLite file"""
+
+    def __init__(self, db_path=None, max_entries=512):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()  # key -> (expires_at, text)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._writes = 0
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0
+        }
+
+    @staticmethod
+    def make_key(model_name, prompt, generation_config=None):
+        """Content address for (model, normalized prompt, generation params)"""
+        normalized_prompt = ' '.join(prompt.split())
+        payload = json.dumps(
+            [model_name, normalized_prompt, generation_config or {}],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached text for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, text = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return text
+                del self._memory[key]
+
+            row = self._db_get(key, now)
+            if row is not None:
+                expires_at, text = row
+                self._remember(key, expires_at, text)
+                self.stats['disk_hits'] += 1
+                return text
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key, text, ttl, namespace=''):
+        """Store text under key for ttl seconds in both tiers"""
+        if ttl <= 0 or text is None:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(key, expires_at, text)
+            self._db_set(key, namespace, text, now, expires_at)
+            self.stats['stores'] += 1
+
+    def snapshot(self):
+        """Counters plus current memory-tier size"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _remember(self, key, expires_at, text):
+        self._memory[key] = (expires_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _db(self):
+        if not self.db_path:
+            return None
+        # sqlite connections must not cross a fork
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache ('
+                'key TEXT PRIMARY KEY, namespace TEXT, response TEXT, '
+                'created_at REAL, expires_at REAL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _db_get(self, key, now):
+        try:
+            conn = self._db()
+            if conn is None:
+                return None
+            row = conn.execute(
+                'SELECT expires_at, response FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache read failed: {e}")
+            return None
+        if row is None or row[0] <= now:
+            return None
+        return row
+
+    def _db_set(self, key, namespace, text, now, expires_at):
+        try:
+            conn = self._db()
+            if conn is None:
+                return
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, namespace, response, created_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, namespace, text, now, expires_at)
+            )
+            self._writes += 1
+            # Purge expired rows every so often instead of on every write
+            if self._writes % 100 == 0:
+                conn.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM cache write failed: {e}")
@@ -0,0 +1,230 @@
+# [file name]: llm_gateway.py
+import os
+import threading
+
+from config import (
+    GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TRANSPORT, LLM_BACKEND,
+    LLM_CACHE_ENABLED, LLM_CACHE_DB, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTLS,
+    GEMINI_RATE_LIMIT_RPM, GEMINI_RATE_LIMIT_BURST, GEMINI_MAX_CONCURRENCY,
+    GEMINI_MAX_QUEUE_WAIT, GEMINI_MAX_RETRIES, GEMINI_SINGLE_FLIGHT_TIMEOUT
+)
+import metrics
+from llm_cache import LLMCache
+from rate_limiter import AdaptiveRateLimiter, RateLimitExceeded, is_rate_limit_error, retry_after_hint
+from service_registry import services
+from single_flight import SingleFlight
+
+# One Gemini gateway per process: app.py routes, llm_api and ai_service all go
+# through here so the SDK is configured once, the transport channel is opened
+# once and model handles are reused instead of rebuilt on every request.
+_lock = threading.RLock()
+_configured_pid = None
+_models = {}
+_cache = LLMCache(LLM_CACHE_DB, LLM_CACHE_MAX_ENTRIES) if LLM_CACHE_ENABLED else None
+_limiter = AdaptiveRateLimiter(
+    GEMINI_RATE_LIMIT_RPM, GEMINI_RATE_LIMIT_BURST, GEMINI_MAX_CONCURRENCY,
+    GEMINI_MAX_QUEUE_WAIT, max_retries=GEMINI_MAX_RETRIES
+)
+_single_flight = SingleFlight()
+
+
+def _load_sdk():
+    if LLM_BACKEND == 'fake':
+        # Offline stand-in with the same surface, for benchmarks
+        import fake_gemini
+        return fake_gemini, fake_gemini
+    # The SDK takes about a second to import, so it is only loaded on first use
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+    return genai, genai_client
+
+
+services.register('gemini_sdk', _load_sdk)
+
+
+def is_available() -> bool:
+    """Check whether model calls can be made: a Gemini API key, or the fake backend"""
+    return LLM_BACKEND == 'fake' or bool(GEMINI_API_KEY)
+
+
+def configure() -> bool:
+    """Configure the SDK and open the shared transport (once per worker process)"""
+    global _configured_pid
+    if not is_available():
+        return False
+
+    pid = os.getpid()
+    if _configured_pid == pid:
+        return True
+
+    genai, genai_client = services.get('gemini_sdk')
+    with _lock:
+        if _configured_pid != pid:
+            # A forked worker must not reuse its parent's channel
+            _models.clear()
+            genai.configure(api_key=GEMINI_API_KEY, transport=GEMINI_TRANSPORT)
+            # Create the generative client eagerly so concurrent first
+            # requests don't race to build separate connections
+            genai_client.get_default_generative_client()
+            _configured_pid = pid
+    return True
+
+
+def get_model(model_name: str = None, generation_config: dict = None):
+    """Return the shared model handle for a model name and generation config"""
+    if not configure():
+        raise RuntimeError("GEMINI_API_KEY not configured")
+
+    model_name = model_name or GEMINI_MODEL
+    key = (model_name, _config_key(generation_config))
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                genai, _ = services.get('gemini_sdk')
+                model = genai.GenerativeModel(model_name, generation_config=generation_config)
+                _models[key] = model
+    return model
+
+
+def generate_text(prompt: str, model_name: str = None, generation_config: dict = None,
+                  cache_namespace: str = None) -> str:
+    """Run a single generate_content call and return the response text
+
+    Passing a cache_namespace (an LLM_CACHE_TTLS key) serves byte-identical
+    prompts from the response cache for that endpoint's TTL. Identical
+    prompts already in flight share one upstream call.
+    """
+    model_name = model_name or GEMINI_MODEL
+    key = _cache_key(model_name, prompt, generation_config)
+    ttl = LLM_CACHE_TTLS.get(cache_namespace, 0) if _cache and cache_namespace else 0
+    if ttl > 0:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
+    namespace = cache_namespace or 'none'
+
+    def attempt(model):
+        with metrics.gemini_call('generate', namespace, is_rate_limited):
+            return model.generate_content(prompt).text
+
+    def fetch():
+        model = get_model(model_name, generation_config)
+        text = _limiter.call(attempt, model)
+        metrics.GEMINI_PROMPT_CHARS.observe(len(prompt), 'generate', namespace)
+        metrics.GEMINI_RESPONSE_CHARS.observe(len(text or ''), 'generate', namespace)
+        if ttl > 0:
+            _cache.set(key, text, ttl, cache_namespace)
+        return text
+
+    return _single_flight.do(key, fetch, timeout=GEMINI_SINGLE_FLIGHT_TIMEOUT)
+
+
+def stream_text(prompt: str, model_name: str = None, generation_config: dict = None,
+                cache_namespace: str = None):
+    """Yield response text chunks as the model generates them
+
+    With a cache_namespace a cached response is yielded as a single chunk,
+    and a stream that runs to completion is cached like generate_text.
+    """
+    model_name = model_name or GEMINI_MODEL
+    key = _cache_key(model_name, prompt, generation_config)
+    ttl = LLM_CACHE_TTLS.get(cache_namespace, 0) if _cache and cache_namespace else 0
+    if ttl > 0:
+        cached = _cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    model = get_model(model_name, generation_config)
+    # The stream holds its limiter slot until the last chunk arrives
+    _limiter.acquire()
+    throttled, retry_after = False, None
+    namespace = cache_namespace or 'none'
+    parts = []
+    try:
+        with metrics.gemini_call('stream', namespace, is_rate_limited):
+            for chunk in model.generate_content(prompt, stream=True):
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+    except Exception as e:
+        throttled = is_rate_limit_error(e)
+        retry_after = retry_after_hint(e) if throttled else None
+        raise
+    finally:
+        _limiter.release(throttled=throttled, retry_after=retry_after)
+        metrics.GEMINI_PROMPT_CHARS.observe(len(prompt), 'stream', namespace)
+        metrics.GEMINI_RESPONSE_CHARS.observe(sum(map(len, parts)), 'stream', namespace)
+
+    if ttl > 0:
+        _cache.set(key, ''.join(parts), ttl, cache_namespace)
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True if the call failed on quota, either upstream or in our limiter"""
+    return isinstance(error, RateLimitExceeded) or is_rate_limit_error(error)
+
+
+def split_quota(workers: int):
+    """
+    Give this process its share of the Gemini budget when `workers` processes
+    each run their own limiter, so together they stay under the configured quota.
+    """
+    workers = max(1, workers)
+    _limiter.set_budget(
+        GEMINI_RATE_LIMIT_RPM / workers,
+        max(1, GEMINI_RATE_LIMIT_BURST // workers),
+        max(1, GEMINI_MAX_CONCURRENCY // workers)
+    )
+
+
+def limiter_stats() -> dict:
+    """Current state of this worker's Gemini rate limiter and request coalescing"""
+    return dict(_limiter.snapshot(), single_flight=_single_flight.snapshot())
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the response cache"""
+    if _cache is None:
+        return {'enabled': False}
+    return dict(_cache.snapshot(), enabled=True)
+
+
+@metrics.register_collector
+def _collect_metrics():
+    limiter = _limiter.snapshot()
+    coalescing = _single_flight.snapshot()
+    families = [
+        ('edugpt_gemini_limiter_events_total', 'counter',
+         'Rate limiter admissions (calls), 429 backoffs (throttled) and calls refused for lack of a slot (rejected)',
+         [({'event': event}, limiter[event]) for event in ('calls', 'throttled', 'rejected')]),
+        ('edugpt_gemini_limiter_in_flight', 'gauge', 'Gemini calls holding a limiter slot', [({}, limiter['in_flight'])]),
+        ('edugpt_gemini_limiter_concurrency_limit', 'gauge', 'Current adaptive concurrency cap',
+         [({}, limiter['concurrency_limit'])]),
+        ('edugpt_gemini_coalesced_total', 'counter', 'Requests that shared an identical in-flight prompt',
+         [({}, coalescing['coalesced'])]),
+    ]
+    if _cache is not None:
+        cache = _cache.snapshot()
+        families.append((
+            'edugpt_llm_cache_events_total', 'counter', 'Response cache hits by tier, misses and stores',
+            [({'event': event}, cache[event]) for event in ('memory_hits', 'disk_hits', 'misses', 'stores')]
+        ))
+    return families
+
+
+def _config_key(generation_config):
+    if not generation_config:
+        return None
+    return tuple(sorted(generation_config.items()))
+
+
+def _cache_key(model_name, prompt, generation_config):
+    # Canned responses must never be served as real ones, even from a shared cache file
+    if LLM_BACKEND != 'gemini':
+        model_name = f"{LLM_BACKEND}:{model_name}"
+    return LLMCache.make_key(model_name, prompt, generation_config)
@@ -0,0 +1,273 @@
+# [file name]: metrics.py
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Request and Gemini latencies: from cached responses up to slow plan generations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Prompt and response sizes in characters
+SIZE_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+_metrics = []
+_collectors = []
+# Set in gunicorn workers: directory where every worker publishes its samples
+_multiprocess_dir = None
+_flush_lock = threading.Lock()
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        _metrics.append(self)
+
+    def samples(self):
+        """(suffix, label pairs, value) for every series"""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [('', list(zip(self.labelnames, labels)), value) for labels, value in items]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set: Counter(...).inc('label', 'values')"""
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set: observe(value, 'label', 'values')"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                # per-bucket counts (last one is +Inf), then sum
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        samples = []
+        for labels, (counts, total) in items:
+            pairs = list(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(bound)
+                samples.append(('_bucket', pairs + [('le', le)], cumulative))
+            samples.append(('_sum', pairs, total))
+            samples.append(('_count', pairs, cumulative))
+        return samples
+
+
+def register_collector(collect):
+    """
+    Add a callable run at scrape time that returns (name, kind, help, samples)
+    tuples, samples being (labels dict, value) pairs. Used to export counters
+    other modules already keep (cache, rate limiter, plan store).
+    """
+    _collectors.append(collect)
+    return collect
+
+
+def _families():
+    """This process's metrics as [name, kind, help, [[suffix, label pairs, value]]]"""
+    families = [[metric.name, metric.kind, metric.help_text, metric.samples()] for metric in _metrics]
+    for collect in _collectors:
+        try:
+            collected = collect()
+        except Exception as e:
+            print(f"⚠️ Metrics collector {getattr(collect, '__name__', collect)} failed: {e}")
+            continue
+        for name, kind, help_text, samples in collected:
+            families.append([name, kind, help_text, [('', list(labels.items()), value) for labels, value in samples]])
+    return families
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format, summed over workers when enabled"""
+    if _multiprocess_dir:
+        flush()
+        families = _merge(_read_families(path) for path in glob.glob(os.path.join(_multiprocess_dir, '*.json')))
+    else:
+        families = _families()
+
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, pairs, value in samples:
+            names = [label for label, _ in pairs]
+            values = [label_value for _, label_value in pairs]
+            lines.append(f"{name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------------------------------------------------------------------
+# Several worker processes (gunicorn): each one publishes its samples to
+# <directory>/worker-<pid>.json and a scrape of any worker sums all files.
+# When a worker exits its counters are folded into retired.json, so totals
+# never go backwards; its gauges are dropped.
+
+def enable_multiprocess(directory, interval=5.0):
+    """Publish this worker's samples to directory every interval seconds"""
+    global _multiprocess_dir
+    os.makedirs(directory, exist_ok=True)
+    _multiprocess_dir = directory
+    flush()
+
+    def publish():
+        while True:
+            time.sleep(interval)
+            flush()
+
+    threading.Thread(target=publish, name='metrics-publisher', daemon=True).start()
+
+
+def flush():
+    """Write this worker's current samples to its file in the metrics directory"""
+    if not _multiprocess_dir:
+        return
+    with _flush_lock:
+        _write_families(_worker_path(_multiprocess_dir, os.getpid()), _families())
+
+
+def reset_multiprocess(directory):
+    """Forget samples of a previous server run (call in the master before workers start)"""
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+
+def retire_process(directory, pid):
+    """Fold an exited worker's counters and histograms into retired.json (call in the master)"""
+    path = _worker_path(directory, pid)
+    if not os.path.exists(path):
+        return
+    retired_path = os.path.join(directory, 'retired.json')
+    finished = [family for family in _read_families(path) if family[1] != 'gauge']
+    _write_families(retired_path, _merge([_read_families(retired_path), finished]))
+    os.remove(path)
+
+
+def _worker_path(directory, pid):
+    return os.path.join(directory, f'worker-{pid}.json')
+
+
+def _read_families(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Missing, or a worker that died before its first complete write
+        return []
+
+
+def _write_families(path, families):
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(families, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def _merge(sources):
+    """Sum samples with the same name, suffix and labels across processes"""
+    merged = {}
+    for families in sources:
+        for name, kind, help_text, samples in families:
+            family = merged.setdefault(name, [name, kind, help_text, {}])
+            for suffix, pairs, value in samples:
+                key = (suffix, tuple(tuple(pair) for pair in pairs))
+                family[3][key] = family[3].get(key, 0) + value
+    return [
+        [name, kind, help_text, [(suffix, list(pairs), value) for (suffix, pairs), value in samples.items()]]
+        for name, kind, help_text, samples in merged.values()
+    ]
+
+
+HTTP_REQUESTS = Counter(
+    'edugpt_http_requests_total', 'HTTP requests by route template, method and status',
+    ('route', 'method', 'status')
+)
+HTTP_LATENCY = Histogram(
+    'edugpt_http_request_duration_seconds', 'Time from request start until the response (or stream) finished',
+    ('route', 'method')
+)
+HTTP_IN_FLIGHT = Gauge('edugpt_http_requests_in_flight', 'Requests currently being served', ('route',))
+
+GEMINI_CALLS = Counter(
+    'edugpt_gemini_calls_total', 'Upstream Gemini calls by kind, cache namespace and outcome (ok, rate_limited, error)',
+    ('kind', 'namespace', 'outcome')
+)
+GEMINI_LATENCY = Histogram(
+    'edugpt_gemini_call_duration_seconds', 'Upstream Gemini call latency, each retry counted separately',
+    ('kind', 'namespace')
+)
+GEMINI_PROMPT_CHARS = Histogram(
+    'edugpt_gemini_prompt_chars', 'Prompt size in characters', ('kind', 'namespace'), SIZE_BUCKETS
+)
+GEMINI_RESPONSE_CHARS = Histogram(
+    'edugpt_gemini_response_chars', 'Response size in characters', ('kind', 'namespace'), SIZE_BUCKETS
+)
+
+FALLBACKS = Counter('edugpt_fallback_total', 'Requests served by a non-AI fallback path', ('path',))
+
+
+@contextmanager
+def gemini_call(kind, namespace, is_rate_limited):
+    """Time one upstream Gemini call and count it by outcome"""
+    namespace = namespace or 'none'
+    start = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except Exception as e:
+        outcome = 'rate_limited' if is_rate_limited(e) else 'error'
+        raise
+    finally:
+        GEMINI_LATENCY.observe(time.perf_counter() - start, kind, namespace)
+        GEMINI_CALLS.inc(kind, namespace, outcome)
@@ -0,0 +1,161 @@
+# [file name]: plan_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+def estimate_size(obj) -> int:
+    """Approximate memory footprint of a plan as its compact JSON length"""
+    return len(_dumps(obj))
+
+
+def _json_default(value):
+    return str(value)
+
+
+class PlanStore:
+    """
+    Thread-safe, size-bounded LRU of generated plans keyed by plan ID.
+    Replaces the single global current_data dict so concurrent users
+    never see each other's syllabus. Plans are JSON-shaped dicts (callers
+    convert LessonPlan models with to_plain first), so get() returns the
+    same shape whether the plan comes from memory or from the file.
+
+    With a db_path every plan is also written, as JSON, to a SQLite file
+    shared by all worker processes, so a plan stays downloadable from any
+    worker for ttl seconds.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, db_path=None, ttl=86400):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.ttl = ttl
+        self._plans = OrderedDict()  # plan_id -> (size, record)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._writes = 0
+        self.stats = {'stored': 0, 'evicted': 0, 'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def new_plan_id() -> str:
+        return uuid.uuid4().hex
+
+    def put(self, plan_id, syllabus, lesson_plan) -> str:
+        """Store a syllabus and lesson plan under plan_id, evicting old plans as needed"""
+        record = {'syllabus': syllabus, 'lesson_plan': lesson_plan}
+        if self.db_path:
+            serialized = _dumps(record)
+            size = len(serialized)
+            self._db_set(plan_id, serialized)
+        else:
+            size = estimate_size(syllabus) + estimate_size(lesson_plan)
+        self._remember(plan_id, size, record, stored=True)
+        return plan_id
+
+    def _remember(self, plan_id, size, record, stored=False):
+        with self._lock:
+            if plan_id in self._plans:
+                self._bytes -= self._plans.pop(plan_id)[0]
+            self._plans[plan_id] = (size, record)
+            self._bytes += size
+            if stored:
+                self.stats['stored'] += 1
+            # Always keep the newest plan, even if it alone exceeds the budget
+            while len(self._plans) > 1 and (
+                len(self._plans) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (evicted_size, _) = self._plans.popitem(last=False)
+                self._bytes -= evicted_size
+                self.stats['evicted'] += 1
+
+    def get(self, plan_id):
+        """Return {'syllabus', 'lesson_plan'} for plan_id, or None"""
+        with self._lock:
+            entry = self._plans.get(plan_id)
+            if entry is not None:
+                self._plans.move_to_end(plan_id)
+                self.stats['hits'] += 1
+                return entry[1]
+
+        # Built by another worker, or evicted from this one's memory
+        serialized = self._db_get(plan_id)
+        if serialized is None:
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+        record = json.loads(serialized)
+        self._remember(plan_id, len(serialized), record)
+        with self._lock:
+            self.stats['disk_hits'] += 1
+        return record
+
+    def snapshot(self):
+        with self._lock:
+            return dict(
+                self.stats,
+                plans=len(self._plans),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                shared=bool(self.db_path)
+            )
+
+    def _db(self):
+        # sqlite connections must not cross a fork
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS plans ('
+                'plan_id TEXT PRIMARY KEY, record TEXT, created_at REAL)'
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _db_get(self, plan_id):
+        if not self.db_path:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db().execute(
+                    'SELECT record FROM plans WHERE plan_id = ? AND created_at > ?',
+                    (plan_id, time.time() - self.ttl)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Plan store read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def _db_set(self, plan_id, serialized):
+        now = time.time()
+        try:
+            with self._db_lock:
+                conn = self._db()
+                conn.execute(
+                    'INSERT OR REPLACE INTO plans (plan_id, record, created_at) VALUES (?, ?, ?)',
+                    (plan_id, serialized, now)
+                )
+                self._writes += 1
+                # Purge expired plans every so often instead of on every write
+                if self._writes % 100 == 0:
+                    conn.execute('DELETE FROM plans WHERE created_at <= ?', (now - self.ttl,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Plan store write failed: {e}")
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=_json_default)
@@ -0,0 +1,151 @@
+# [file name]: rate_limiter.py
+import random
+import re
+import threading
+import time
+
+_RETRY_HINT_PATTERNS = [
+    re.compile(r'retry in\s*([\d.]+)\s*s', re.IGNORECASE),
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)', re.IGNORECASE),
+    re.compile(r'retry-after:?\s*([\d.]+)', re.IGNORECASE),
+]
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot get a slot within its wait budget"""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for 429 / quota errors from the Gemini SDK"""
+    if getattr(error, 'code', None) == 429:
+        return True
+    message = str(error)
+    return '429' in message or 'resource exhausted' in message.lower()
+
+
+def retry_after_hint(error: Exception):
+    """Seconds the server asked us to wait, if the error carries a hint"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('Retry-After'):
+            return float(headers['Retry-After'])
+    except (TypeError, ValueError):
+        pass
+    message = str(error)
+    for pattern in _RETRY_HINT_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket for request rate plus an AIMD concurrency cap, shared by the
+    threads of one worker process (other workers keep their own state).
+    A 429 halves the cap and pauses new calls process-wide until the
+    server's retry hint (with jitter) has passed; each success grows the
+    cap again by roughly one slot per window.
+    """
+
+    def __init__(self, rate_per_minute, burst, max_concurrency, max_wait,
+                 max_retries=1, base_backoff=2.0, min_concurrency=1):
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_concurrency = max(min_concurrency, max_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self.stats = {'calls': 0, 'throttled': 0, 'rejected': 0}
+
+    def set_budget(self, rate_per_minute, burst, max_concurrency):
+        """Change the rate, burst and concurrency ceiling of a running limiter"""
+        with self._cond:
+            self._refill(time.monotonic())
+            self.rate = rate_per_minute / 60.0
+            self.burst = max(1, burst)
+            self.max_concurrency = max(self.min_concurrency, max_concurrency)
+            self._tokens = min(self._tokens, self.burst)
+            self._limit = min(self._limit, self.max_concurrency)
+            self._cond.notify_all()
+
+    def acquire(self, timeout=None):
+        """Wait for a token and a concurrency slot, or raise RateLimitExceeded"""
+        timeout = self.max_wait if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._paused_until:
+                    wait_for = self._paused_until - now
+                elif self._in_flight >= int(self._limit):
+                    wait_for = None  # woken by release()
+                elif self._tokens < 1:
+                    wait_for = (1 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.stats['calls'] += 1
+                    return
+
+                remaining = deadline - now
+                if remaining <= 0 or (wait_for is not None and wait_for > remaining):
+                    # Don't park a worker for a wait we know outlasts its budget
+                    self.stats['rejected'] += 1
+                    raise RateLimitExceeded("Gemini rate limit: no slot available")
+                self._cond.wait(remaining if wait_for is None else min(wait_for, remaining))
+
+    def release(self, throttled=False, retry_after=None):
+        """Return the slot and adapt the concurrency cap"""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if throttled:
+                self.stats['throttled'] += 1
+                self._limit = max(self.min_concurrency, self._limit / 2)
+                delay = retry_after if retry_after is not None else self.base_backoff
+                delay *= 1 + random.uniform(0, 0.25)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                self._tokens = min(self._tokens, 0)
+            else:
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn under the limiter, retrying 429s while the wait budget allows"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                throttled = is_rate_limit_error(e)
+                self.release(throttled=throttled, retry_after=retry_after_hint(e) if throttled else None)
+                if throttled and attempt < self.max_retries:
+                    print(f"⏳ Gemini rate limited — queued retry (attempt {attempt + 1})")
+                    continue
+                raise
+            self.release()
+            return result
+
+    def snapshot(self):
+        with self._cond:
+            return dict(
+                self.stats,
+                concurrency_limit=int(self._limit),
+                in_flight=self._in_flight,
+                paused_for=round(max(0.0, self._paused_until - time.monotonic()), 2)
+            )
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
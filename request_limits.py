@@ -0,0 +1,81 @@
+# [file name]: request_limits.py
+import json
+import threading
+
+
+class LongRequestLimiter:
+    """
+    WSGI middleware capping how many long-running requests (LLM calls, plan
+    generation, streams) a worker serves at once. Requests under one of the
+    path prefixes wait up to wait_timeout for a slot and otherwise get a 503,
+    so the remaining threads stay free for health checks, polling and static
+    files. A streamed response keeps its slot until the stream is closed.
+    on_reject(environ) is called for each request turned away.
+    """
+
+    def __init__(self, wsgi_app, prefixes, slots, wait_timeout=5.0, retry_after=5, on_reject=None):
+        self.wsgi_app = wsgi_app
+        self.prefixes = tuple(prefixes)
+        self.slots = slots
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self.on_reject = on_reject
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self.stats = {'active': 0, 'admitted': 0, 'rejected': 0}
+
+    def __call__(self, environ, start_response):
+        if not environ.get('PATH_INFO', '').startswith(self.prefixes):
+            return self.wsgi_app(environ, start_response)
+
+        if not self._semaphore.acquire(timeout=self.wait_timeout):
+            with self._lock:
+                self.stats['rejected'] += 1
+            if self.on_reject:
+                self.on_reject(environ)
+            body = json.dumps({'error': 'Server is busy with other AI requests, please retry shortly'}).encode('utf-8')
+            start_response('503 Service Unavailable', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(body))),
+                ('Retry-After', str(self.retry_after))
+            ])
+            return [body]
+
+        with self._lock:
+            self.stats['active'] += 1
+            self.stats['admitted'] += 1
+        try:
+            return _ReleasingIterable(self.wsgi_app(environ, start_response), self._release)
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self):
+        with self._lock:
+            self.stats['active'] -= 1
+        self._semaphore.release()
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, slots=self.slots)
+
+
+class _ReleasingIterable:
+    """Response body wrapper that frees the slot once the server closes it"""
+
+    def __init__(self, iterable, release):
+        self._iterable = iterable
+        self._release = release
+        self._released = False
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def close(self):
+        try:
+            if hasattr(self._iterable, 'close'):
+                self._iterable.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
@@ -0,0 +1,137 @@
+# [file name]: request_profiler.py
+import cProfile
+import hmac
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'  # X-Profile-Token
+_SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+
+
+class RequestProfiler:
+    """
+    WSGI middleware that runs a single request under cProfile when it carries
+    an X-Profile-Token header matching the admin token, and saves the stats
+    (pstats format, for snakeviz / `python -m pstats`) into a directory that
+    keeps only the newest max_files profiles. Streamed responses are profiled
+    until the stream closes. Without a configured token, or for requests
+    without the header, the only cost is one environ lookup.
+
+    cProfile sees the thread serving the request; work a request hands to
+    thread pools (plan bundle parts, link checks) shows up as waiting.
+    """
+
+    def __init__(self, wsgi_app, directory, admin_token, max_files=20):
+        self.wsgi_app = wsgi_app
+        self.directory = directory
+        self.admin_token = admin_token or ''
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.admin_token)
+
+    def is_authorized(self, token) -> bool:
+        return self.enabled and bool(token) and hmac.compare_digest(token, self.admin_token)
+
+    def __call__(self, environ, start_response):
+        token = environ.get(PROFILE_HEADER)
+        if token is None or not self.is_authorized(token):
+            return self.wsgi_app(environ, start_response)
+
+        name = self._profile_name(environ)
+
+        def start_with_profile_id(status, headers, exc_info=None):
+            return start_response(status, list(headers) + [('X-Profile-Id', name)], exc_info)
+
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            body = self.wsgi_app(environ, start_with_profile_id)
+        except BaseException:
+            profile.disable()
+            self._save(profile, name, started)
+            raise
+        profile.disable()
+        return _ProfiledIterable(body, profile, lambda: self._save(profile, name, started))
+
+    def list_profiles(self):
+        """Saved profiles, newest first"""
+        profiles = []
+        for entry in self._entries():
+            stat = entry.stat()
+            profiles.append({
+                'name': entry.name,
+                'size_bytes': stat.st_size,
+                'created': datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+            })
+        return profiles
+
+    def _profile_name(self, environ):
+        route = _SLUG_RE.sub('-', environ.get('PATH_INFO', '')).strip('-') or 'root'
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{environ.get('REQUEST_METHOD', 'GET')}_{route[:60]}"
+
+    def _save(self, profile, name, started):
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{name}_{elapsed_ms}ms.prof")
+            profile.dump_stats(path)
+            print(f"🔬 Saved request profile {path}")
+            self._prune()
+        except OSError as e:
+            print(f"⚠️ Could not save request profile {name}: {e}")
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.prof')]
+        return sorted(entries, key=lambda entry: entry.name, reverse=True)
+
+    def _prune(self):
+        with self._lock:
+            for entry in self._entries()[self.max_files:]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class _ProfiledIterable:
+    """Keeps profiling while the server iterates a streamed body; saves on close"""
+
+    def __init__(self, iterable, profile, save):
+        self._iterable = iterable
+        self._profile = profile
+        self._save = save
+        self._saved = False
+
+    def __iter__(self):
+        iterator = iter(self._iterable)
+        while True:
+            self._profile.enable()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._profile.disable()
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self._iterable, 'close'):
+                self._profile.enable()
+                try:
+                    self._iterable.close()
+                finally:
+                    self._profile.disable()
+        finally:
+            if not self._saved:
+                self._saved = True
+                self._save()
@@ -0,0 +1,170 @@
+# [file name]: resource_validator.py
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from urllib.parse import quote
+
+from config import (
+    LLM_BACKEND, LINK_CHECK_TIMEOUT, LINK_CHECK_WORKERS, LINK_CHECK_DEADLINE,
+    LINK_CACHE_DB, LINK_CACHE_OK_TTL, LINK_CACHE_DEAD_TTL
+)
+from link_cache import LinkVerificationCache, canonicalize_url
+from service_registry import services
+
+# Shared across requests: one keep-alive session with a connection pool per
+# host, and one bounded pool of probe threads
+_lock = threading.Lock()
+_executor = None
+_verification_cache = LinkVerificationCache(LINK_CACHE_DB, LINK_CACHE_OK_TTL, LINK_CACHE_DEAD_TTL)
+
+
+def _open_session():
+    """(session, exception class raised for network errors)"""
+    if LLM_BACKEND == 'fake':
+        # Offline benchmarks answer link probes locally too
+        import fake_gemini
+        return fake_gemini.FakeSession(), fake_gemini.FakeLinkError
+    # requests is only imported once the first link check runs
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=LINK_CHECK_WORKERS,
+        pool_maxsize=LINK_CHECK_WORKERS,
+        max_retries=0
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'EduGPT-LinkCheck/1.0'
+    return session, requests.RequestException
+
+
+services.register('http_session', _open_session)
+
+
+def get_session():
+    """Return the shared HTTP session used for link probes"""
+    return services.get('http_session')[0]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=LINK_CHECK_WORKERS,
+                    thread_name_prefix='link-check'
+                )
+    return _executor
+
+
+def is_youtube(r_type: str, r_url: str) -> bool:
+    return r_type.lower() == "youtube" or "youtube.com" in r_url or "youtu.be" in r_url
+
+
+def probe_url(r_url: str, r_type: str = ""):
+    """
+    Probe a single resource URL; YouTube links go through oEmbed.
+    Returns (verified, status_code); status_code is None on network errors.
+    """
+    session, request_error = services.get('http_session')
+
+    if is_youtube(r_type, r_url):
+        # Use YouTube oEmbed to check existence
+        oembed_url = f"https://www.youtube.com/oembed?url={quote(r_url, safe='')}&format=json"
+        try:
+            resp = session.get(oembed_url, timeout=LINK_CHECK_TIMEOUT)
+            return resp.status_code == 200, resp.status_code
+        except request_error as re:
+            print("⚠️ YouTube oEmbed check failed:", re)
+            return False, None
+
+    # For articles / pdfs, try a HEAD request (some servers may not support HEAD)
+    try:
+        head = session.head(r_url, allow_redirects=True, timeout=LINK_CHECK_TIMEOUT)
+        if 200 <= head.status_code < 400:
+            return True, head.status_code
+        # Try GET as fallback (some servers block HEAD); don't download the body
+        with session.get(r_url, timeout=LINK_CHECK_TIMEOUT, stream=True) as getr:
+            return 200 <= getr.status_code < 400, getr.status_code
+    except request_error as re:
+        print("⚠️ Link validation failed for", r_url, re)
+        return False, None
+
+
+def _record_probe(canonical_url, future):
+    # Runs on the probe thread, so late probes still warm the cache
+    if future.cancelled() or future.exception() is not None:
+        return
+    verified, status_code = future.result()
+    # Network errors are usually transient; only cache real HTTP answers
+    if status_code is not None:
+        _verification_cache.set(canonical_url, verified, status_code)
+
+
+def validate_resources(resources_list: list, deadline: float = LINK_CHECK_DEADLINE) -> list:
+    """
+    Validate AI-suggested resources concurrently.
+    Returns [ {title,type,url,verified} ] in the original order; probes still
+    running when the batch deadline expires count as unverified.
+    """
+    entries = []
+    for r in resources_list:
+        try:
+            r_title = r.get("title", "").strip()
+            r_type = r.get("type", "").strip()
+            r_url = r.get("url", "").strip()
+        except Exception as e:
+            print("⚠️ Error validating resource entry:", r, e)
+            continue
+
+        if not r_url:
+            continue
+
+        entries.append({
+            "title": r_title or r_url,
+            "type": "YouTube" if "youtube" in r_type.lower() or "youtu" in r_url else (r_type or "Article"),
+            "url": r_url,
+            "verified": False,
+            "_raw_type": r_type
+        })
+
+    # Known-good links skip the network and known-dead ones are dropped
+    for entry in entries:
+        try:
+            entry["_canonical"] = canonicalize_url(entry["url"])
+        except ValueError as e:
+            # e.g. a non-numeric port; left unverified instead of failing the batch
+            print("⚠️ Malformed resource URL:", entry["url"], e)
+            entry["_canonical"] = None
+    known = _verification_cache.get_many(entry["_canonical"] for entry in entries if entry["_canonical"])
+
+    executor = _get_executor()
+    futures = {}
+    for entry in entries:
+        if entry["_canonical"] is None:
+            continue
+        if entry["_canonical"] in known:
+            entry["verified"] = known[entry["_canonical"]][0]
+            continue
+        future = executor.submit(probe_url, entry["url"], entry["_raw_type"])
+        future.add_done_callback(partial(_record_probe, entry["_canonical"]))
+        futures[future] = entry
+
+    done, not_done = wait(futures, timeout=deadline) if futures else (set(), set())
+
+    for future in done:
+        try:
+            futures[future]["verified"] = future.result()[0]
+        except Exception as e:
+            print("⚠️ Error validating resource entry:", futures[future]["url"], e)
+    for future in not_done:
+        future.cancel()
+        print("⏰ Link check deadline exceeded for", futures[future]["url"])
+
+    for entry in entries:
+        del entry["_raw_type"]
+        del entry["_canonical"]
+    return entries
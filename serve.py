@@ -0,0 +1,48 @@
+# [file name]: serve.py
+"""
+Production launcher: runs the Flask app under gunicorn with the settings from
+gunicorn.conf.py (and so from config.py / the environment).
+
+    python serve.py
+    python serve.py --bind 0.0.0.0:8000 --workers 4 --threads 16
+"""
+import argparse
+import runpy
+from pathlib import Path
+
+from gunicorn.app.base import BaseApplication
+
+CONFIG_FILE = Path(__file__).resolve().parent / 'gunicorn.conf.py'
+
+
+class EduGPTServer(BaseApplication):
+    def __init__(self, overrides):
+        self.overrides = overrides
+        super().__init__()
+
+    def load_config(self):
+        # Same settings and hooks as `gunicorn -c gunicorn.conf.py app:app`
+        settings = runpy.run_path(str(CONFIG_FILE))
+        settings.update((key, value) for key, value in self.overrides.items() if value is not None)
+        for key, value in settings.items():
+            if key in self.cfg.settings:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bind')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads', type=int)
+    parser.add_argument('--timeout', type=int)
+    args = parser.parse_args()
+
+    EduGPTServer(vars(args)).run()
+
+
+if __name__ == '__main__':
+    main()
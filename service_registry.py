@@ -0,0 +1,100 @@
+# [file name]: service_registry.py
+import threading
+import time
+
+from config import SERVICE_RETRY_AFTER
+
+
+class ServiceUnavailable(RuntimeError):
+    """Raised by get() for a service whose initialization failed"""
+
+
+class _Service:
+    __slots__ = ('factory', 'lock', 'ready', 'value', 'error', 'failed_at', 'load_seconds')
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.ready = False
+        self.value = None
+        self.error = None
+        self.failed_at = None
+        self.load_seconds = None
+
+
+class ServiceRegistry:
+    """
+    Named, lazily built singletons (SDK clients, assistants). A factory runs on
+    the first get(); its result is reused for the life of the process, and an
+    exception it raised is remembered so requests don't retry a broken import
+    or missing key every time. Failures are retried after retry_after seconds.
+    """
+
+    def __init__(self, retry_after=300):
+        self.retry_after = retry_after
+        self._services = {}
+
+    def register(self, name, factory):
+        """Register factory() as the builder for name; nothing runs until get()"""
+        self._services[name] = _Service(factory)
+
+    def get(self, name):
+        """Return the service, building it on first use"""
+        service = self._services[name]
+        if service.ready:
+            return service.value
+
+        with service.lock:
+            if service.ready:
+                return service.value
+            if service.error is not None and time.monotonic() - service.failed_at < self.retry_after:
+                raise ServiceUnavailable(f"{name} unavailable: {service.error}") from service.error
+
+            start = time.perf_counter()
+            try:
+                service.value = service.factory()
+            except Exception as e:
+                service.error = e
+                service.failed_at = time.monotonic()
+                print(f"❌ {name} failed to initialize: {e}")
+                raise ServiceUnavailable(f"{name} unavailable: {e}") from e
+            finally:
+                service.load_seconds = time.perf_counter() - start
+            service.error = None
+            service.ready = True
+            return service.value
+
+    def warm_up(self, *targets, delay=0.0):
+        """
+        Build services in a daemon thread so the first request doesn't pay for
+        them. targets are service names or plain callables; delay lets the
+        server bind its port first. Returns the thread.
+        """
+        def run():
+            time.sleep(delay)
+            start = time.perf_counter()
+            for target in targets:
+                try:
+                    target() if callable(target) else self.get(target)
+                except Exception as e:
+                    print(f"⚠️  Warm-up of {getattr(target, '__name__', target)} failed: {e}")
+            print(f"🔥 Services warmed up in {time.perf_counter() - start:.2f}s")
+
+        thread = threading.Thread(target=run, name='service-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self):
+        states = {}
+        for name, service in self._services.items():
+            if service.ready:
+                states[name] = {'state': 'ready', 'load_seconds': round(service.load_seconds, 3)}
+            elif service.error is not None:
+                states[name] = {'state': 'failed', 'error': str(service.error)}
+            else:
+                states[name] = {'state': 'not_loaded'}
+        return states
+
+
+# Per-process registry shared by the gateway and the app
+services = ServiceRegistry(SERVICE_RETRY_AFTER)
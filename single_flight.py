@@ -0,0 +1,64 @@
+# [file name]: single_flight.py
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key: the first caller runs the
+    function, later callers wait for it and receive the same result or the
+    same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'leaders': 0, 'coalesced': 0, 'timeouts': 0}
+
+    def do(self, key, fn, timeout=None):
+        """Run fn once per key among concurrent callers and share its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['leaders'] += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+                leader = False
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        # The leader keeps running if we give up; only this waiter times out
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.stats['timeouts'] += 1
+            raise TimeoutError(f"Timed out after {timeout}s waiting for an identical in-flight request")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats, in_flight=len(self._calls))
@@ -1,8 +1,10 @@
-import json
+import llm_gateway
+import metrics
+from json_extractor import JSONExtractionError, JSONStreamExtractor, extract_json
 from llm_api import chat
 
-def create_syllabus(goal: str) -> dict:
-    prompt = f"""
+def syllabus_prompt(goal: str) -> str:
+    return f"""
 Create a comprehensive learning syllabus for: {goal}
 
 Return the response as valid JSON in this exact format:
@@ -19,30 +21,72 @@ Return the response as valid JSON in this exact format:
 
 Make it practical and well-structured for the learning goal.
 """
-    
+
+def create_syllabus(goal: str) -> dict:
     print("🔄 Generating syllabus...")
-    response = chat(prompt)
-    
+    response = chat(syllabus_prompt(goal), cache_namespace='syllabus')
+
     try:
-        # Clean the response
-        cleaned_response = response.strip()
-        if cleaned_response.startswith('```json'):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith('```'):
-            cleaned_response = cleaned_response[:-3]
-        
-        syllabus = json.loads(cleaned_response)
+        syllabus = extract_json(response)
         print("✅ Syllabus generated successfully!")
         return syllabus
-        
-    except json.JSONDecodeError as e:
+
+    except JSONExtractionError as e:
         print(f"❌ Failed to parse syllabus: {e}")
         print("Using fallback syllabus...")
-        return {
-            "goal": goal,
-            "units": [{
-                "title": f"{goal} Fundamentals",
-                "lessons": ["Introduction", "Basic Concepts", "Getting Started"],
-                "outcomes": ["Understand basics", "Learn fundamentals"]
-            }]
-        }
\ No newline at end of file
+        return fallback_syllabus(goal)
+
+def stream_syllabus(goal: str):
+    """
+    Yield ('unit', unit) for each syllabus unit as soon as the model has
+    finished writing it, then ('syllabus', syllabus) with the whole syllabus.
+    Units recovered from a truncated response are yielded at the end.
+    """
+    if not llm_gateway.is_available():
+        yield from _yield_syllabus(create_syllabus(goal))
+        return
+
+    print("🔄 Streaming syllabus...")
+    extractor = JSONStreamExtractor(array_key='units')
+    emitted = 0
+    try:
+        for chunk in llm_gateway.stream_text(syllabus_prompt(goal), cache_namespace='syllabus'):
+            for unit in extractor.feed(chunk):
+                emitted += 1
+                yield 'unit', unit
+    except Exception as e:
+        print(f"❌ Syllabus stream failed after {emitted} units: {e}")
+
+    try:
+        syllabus = extractor.finish()
+    except JSONExtractionError as e:
+        print(f"❌ Failed to parse syllabus: {e}")
+        syllabus = None
+
+    if not isinstance(syllabus, dict) or not syllabus.get('units'):
+        if emitted:
+            syllabus = {"goal": goal, "units": []}
+        else:
+            print("Using fallback syllabus...")
+            syllabus = fallback_syllabus(goal)
+
+    yield from _yield_syllabus(syllabus, skip=emitted)
+    print("✅ Syllabus generated successfully!")
+
+def _yield_syllabus(syllabus: dict, skip: int = 0):
+    for unit in syllabus.get('units', [])[skip:]:
+        # A unit cut off mid-stream is only worth keeping if it got that far
+        if isinstance(unit, dict) and (unit.get('title') or unit.get('lessons')):
+            yield 'unit', unit
+    yield 'syllabus', syllabus
+
+def fallback_syllabus(goal: str) -> dict:
+    metrics.FALLBACKS.inc('fallback_syllabus')
+    return {
+        "goal": goal,
+        "units": [{
+            "title": f"{goal} Fundamentals",
+            "lessons": ["Introduction", "Basic Concepts", "Getting Started"],
+            "outcomes": ["Understand basics", "Learn fundamentals"]
+        }]
+    }
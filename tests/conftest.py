@@ -0,0 +1,6 @@
+# [file name]: tests/conftest.py
+import sys
+from pathlib import Path
+
+# The backend modules live one directory up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
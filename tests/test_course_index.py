@@ -0,0 +1,19 @@
+# [file name]: tests/test_course_index.py
+import course_digest
+from course_digest import CourseDigestCache
+
+
+def test_plan_id_key_reuses_the_digest_without_hashing(monkeypatch):
+    cache = CourseDigestCache(build=lambda structure: object())
+    digest = cache.get({'unit_1': {'unit_title': 'Basics'}}, 'plan-1')
+
+    monkeypatch.setattr(course_digest, 'course_hash', lambda structure: 1 / 0)
+    assert cache.get({'unit_1': {'unit_title': 'Basics'}}, 'plan-1') is digest
+    assert cache.snapshot()['hits'] == 1
+
+
+def test_structure_without_plan_id_is_keyed_by_content():
+    cache = CourseDigestCache()
+    outline = cache.get({'unit_1': {'unit_title': 'Basics', 'lessons': ['Setup']}})
+    assert cache.get({'unit_1': {'lessons': ['Setup'], 'unit_title': 'Basics'}}) == outline
+    assert cache.snapshot() == {'hits': 1, 'misses': 1, 'entries': 1, 'max_entries': 128}
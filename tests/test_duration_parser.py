@@ -0,0 +1,41 @@
+# [file name]: tests/test_duration_parser.py
+import pytest
+
+from duration_parser import DurationParser, clean_study_schedule_content
+
+
+@pytest.mark.parametrize('goal, expected', [
+    # An explicit hour count wins over any days, weeks or months in the goal
+    ("Learn Rust in 3 days, 2 hours/day", (2, "2 hours")),
+    ("Python basics: 5 days at 3hrs a day", (3, "3 hours")),
+    ("2 weeks of SQL, 10h total", (10, "10 hours")),
+    ("Docker in 1 month, 1 hour", (1, "1 hour")),
+    # Without hours, days come before weeks and weeks before months
+    ("Learn Go in 3 days", (72, "3 days")),
+    ("Kotlin in 2 weeks, about 4 days of practice", (96, "4 days")),
+    ("Rust in 1 month and 2 weeks", (336, "2 weeks")),
+    ("Haskell in 2 months", (1440, "2 months")),
+    # The first number of the winning unit is used
+    ("10 hours, or 20 hours if needed", (10, "10 hours")),
+])
+def test_conflicting_units_resolve_hours_first(goal, expected):
+    assert DurationParser.parse_duration(goal) == expected
+
+
+@pytest.mark.parametrize('goal, expected', [
+    ("Introduction to Rust", (8, "8 hours")),
+    ("Intermediate Rust", (20, "20 hours")),
+    ("Master Rust", (40, "40 hours")),
+    ("Rust", (24, "24 hours")),
+])
+def test_goals_without_a_duration_use_the_complexity_default(goal, expected):
+    assert DurationParser.parse_duration(goal) == expected
+
+
+def test_parse_many_keeps_order():
+    assert DurationParser.parse_many(["3 days", "4 hours"]) == [(72, "3 days"), (4, "4 hours")]
+
+
+def test_schedule_headers_are_removed():
+    content = "Day 1 3h Study Period Daily Commitment  Variables and   loops"
+    assert clean_study_schedule_content(content) == "Day 1 Variables and loops"
@@ -0,0 +1,39 @@
+# [file name]: tests/test_job_queue.py
+import time
+
+from job_queue import JobQueue
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job and job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_is_visible_to_another_queue_on_the_same_file(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    owner = JobQueue(max_workers=1, db_path=db_path)
+
+    def build(goal, progress):
+        progress('syllabus', 'done', units=3)
+        return {'goal': goal}
+
+    job_id = owner.submit(build, 'Rust', stages=('syllabus',))
+    wait_for(owner, job_id)
+
+    # A second queue stands in for another worker process polling the job
+    job = JobQueue(max_workers=1, db_path=db_path).get(job_id)
+    assert job['status'] == 'succeeded'
+    assert job['result'] == {'goal': 'Rust'}
+    assert job['stages'] == [{'status': 'done', 'units': 3, 'name': 'syllabus'}]
+    owner.shutdown()
+
+
+def test_unknown_job_without_db_is_none():
+    queue = JobQueue(max_workers=1)
+    assert queue.get('missing') is None
+    queue.shutdown()
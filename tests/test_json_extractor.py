@@ -0,0 +1,53 @@
+# [file name]: tests/test_json_extractor.py
+import pytest
+
+import syllabus_agent
+from json_extractor import JSONExtractionError, JSONStreamExtractor, extract_json
+
+
+def test_trailing_comma_raises_extraction_error():
+    with pytest.raises(JSONExtractionError):
+        extract_json('{"a": 1,}')
+
+
+def test_invalid_element_is_not_emitted_while_streaming():
+    extractor = JSONStreamExtractor(array_key='units')
+    assert extractor.feed('{"goal": "x", "units": [{"title": "a", "lessons": ["l"],}]}') == []
+    with pytest.raises(JSONExtractionError):
+        extractor.finish()
+
+
+def test_invalid_syllabus_uses_fallback(monkeypatch):
+    monkeypatch.setattr(syllabus_agent, 'chat', lambda *args, **kwargs: '{"goal":"x","units":[{"title":"a","lessons":["l"],}]}')
+    syllabus = syllabus_agent.create_syllabus('x')
+    assert syllabus['units'][0]['title'] == 'x Fundamentals'
+
+
+def test_brackets_in_prose_before_fence_are_skipped():
+    text = 'Options [1] and [2] below:\n```json\n{"units": [{"t": 1}, {"t": 2}]}\n```'
+    assert extract_json(text) == {'units': [{'t': 1}, {'t': 2}]}
+
+
+def test_unclosed_bracket_in_prose_before_fence_is_skipped():
+    assert extract_json('See [the docs for details\n```json\n{"a": 2}\n```') == {'a': 2}
+
+
+def test_fence_split_across_chunks():
+    extractor = JSONStreamExtractor(array_key='units')
+    text = 'Here [1] it is:\n```json\n{"units": [{"t": 1}, {"t": 2}]}\n```'
+    elements = []
+    for char in text:
+        elements.extend(extractor.feed(char))
+    assert elements == [{'t': 1}, {'t': 2}]
+    assert extractor.finish() == {'units': [{'t': 1}, {'t': 2}]}
+
+
+def test_inline_document_after_prose():
+    assert extract_json('Sure! {"a": 3} Hope [this] helps') == {'a': 3}
+
+
+def test_truncated_document_is_repaired():
+    extractor = JSONStreamExtractor()
+    extractor.feed('{"a": [1, 2')
+    assert extractor.finish() == {'a': [1, 2]}
+    assert extractor.repaired
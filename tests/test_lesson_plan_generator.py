@@ -0,0 +1,15 @@
+# [file name]: tests/test_lesson_plan_generator.py
+from lesson_plan_generator import build_comprehensive_lesson_plan
+
+
+def test_duration_constraint_is_kept_but_does_not_set_course_length():
+    syllabus = {
+        'goal': 'Introduction to Rust',
+        'units': [{'title': 'Basics', 'lessons': ['Setup', 'Syntax'], 'outcomes': []}],
+        'duration_constraint': {'study_hours': 100},
+    }
+    plan = build_comprehensive_lesson_plan(syllabus, verbose=False)
+
+    without_constraint = build_comprehensive_lesson_plan(dict(syllabus, duration_constraint=None), verbose=False)
+    assert plan['total_estimated_duration'] == without_constraint['total_estimated_duration']
+    assert plan['duration_constraint'] == {'study_hours': 100}
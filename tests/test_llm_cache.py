@@ -0,0 +1,54 @@
+# [file name]: tests/test_llm_cache.py
+import time
+
+from llm_cache import LLMCache
+
+
+def test_key_ignores_whitespace_and_config_order():
+    key = LLMCache.make_key('gemini', 'Explain  loops\n in Rust', {'temperature': 0.2, 'top_p': 0.9})
+    assert key == LLMCache.make_key('gemini', ' Explain loops in\tRust ', {'top_p': 0.9, 'temperature': 0.2})
+
+
+def test_key_depends_on_model_prompt_and_params():
+    key = LLMCache.make_key('gemini', 'Explain loops', {'temperature': 0.2})
+    assert key != LLMCache.make_key('other-model', 'Explain loops', {'temperature': 0.2})
+    assert key != LLMCache.make_key('gemini', 'Explain Loops', {'temperature': 0.2})
+    assert key != LLMCache.make_key('gemini', 'Explain loops', {'temperature': 0.7})
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = LLMCache(max_entries=2)
+    cache.set('a', 'A', ttl=60)
+    cache.set('b', 'B', ttl=60)
+    cache.get('a')
+    cache.set('c', 'C', ttl=60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A'
+    assert cache.get('c') == 'C'
+    assert cache.snapshot()['memory_entries'] == 2
+
+
+def test_responses_survive_a_restart_through_sqlite(tmp_path):
+    db_path = str(tmp_path / 'llm_cache.sqlite3')
+    LLMCache(db_path).set('key', 'cached answer', ttl=60, namespace='chat')
+
+    # A new cache stands in for a restarted process with an empty memory tier
+    cache = LLMCache(db_path)
+    assert cache.get('key') == 'cached answer'
+    assert cache.get('key') == 'cached answer'
+    stats = cache.snapshot()
+    assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+
+
+def test_expired_and_disabled_entries_are_not_served(tmp_path):
+    db_path = str(tmp_path / 'llm_cache.sqlite3')
+    cache = LLMCache(db_path)
+    cache.set('old', 'stale', ttl=0.01)
+    cache.set('off', 'never stored', ttl=0)
+    time.sleep(0.02)
+
+    assert cache.get('old') is None
+
+    assert LLMCache(db_path).get('old') is None
+    assert LLMCache(db_path).get('off') is None
@@ -0,0 +1,71 @@
+# [file name]: tests/test_metrics.py
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    # Metrics created by a test stay out of the app's registry
+    monkeypatch.setattr(metrics, '_metrics', [])
+    monkeypatch.setattr(metrics, '_collectors', [])
+    monkeypatch.setattr(metrics, '_multiprocess_dir', None)
+
+
+def test_workers_are_summed_and_exited_workers_keep_their_counters(registry, tmp_path, monkeypatch):
+    requests = metrics.Counter('test_requests_total', 'Requests', ('route',))
+    in_flight = metrics.Gauge('test_in_flight', 'In flight')
+    directory = str(tmp_path)
+
+    # Two workers, pids 101 and 102, each publish their own samples
+    for pid, count in ((101, 2), (102, 3)):
+        monkeypatch.setattr(metrics.os, 'getpid', lambda pid=pid: pid)
+        requests._values.clear()
+        in_flight._values.clear()
+        requests.inc('/api/health', amount=count)
+        in_flight.inc()
+        monkeypatch.setattr(metrics, '_multiprocess_dir', directory)
+        metrics.flush()
+
+    text = metrics.render()
+    assert 'test_requests_total{route="/api/health"} 5' in text
+    assert 'test_in_flight 2' in text
+
+    metrics.retire_process(directory, 101)
+    text = metrics.render()
+    assert 'test_requests_total{route="/api/health"} 5' in text
+    assert 'test_in_flight 1' in text
+
+
+def test_exposition_format(registry):
+    requests = metrics.Counter('test_requests_total', 'Requests by route', ('route', 'status'))
+    latency = metrics.Histogram('test_latency_seconds', 'Latency', ('route',), buckets=(0.1, 1))
+    metrics.register_collector(lambda: [('test_plans', 'gauge', 'Stored plans', [({}, 3)])])
+
+    requests.inc('/api/x', '200')
+    requests.inc('/api/"q"', '500', amount=2)
+    latency.observe(0.05, '/api/x')
+    latency.observe(0.5, '/api/x')
+
+    assert metrics.render().splitlines() == [
+        '# HELP test_requests_total Requests by route',
+        '# TYPE test_requests_total counter',
+        'test_requests_total{route="/api/\\"q\\"",status="500"} 2',
+        'test_requests_total{route="/api/x",status="200"} 1',
+        '# HELP test_latency_seconds Latency',
+        '# TYPE test_latency_seconds histogram',
+        'test_latency_seconds_bucket{route="/api/x",le="0.1"} 1',
+        'test_latency_seconds_bucket{route="/api/x",le="1"} 2',
+        'test_latency_seconds_bucket{route="/api/x",le="+Inf"} 2',
+        'test_latency_seconds_sum{route="/api/x"} 0.55',
+        'test_latency_seconds_count{route="/api/x"} 2',
+        '# HELP test_plans Stored plans',
+        '# TYPE test_plans gauge',
+        'test_plans 3',
+    ]
+
+
+def test_failing_collector_is_skipped(registry):
+    metrics.Gauge('test_up', 'Up').inc()
+    metrics.register_collector(lambda: 1 / 0)
+    assert metrics.render() == '# HELP test_up Up\n# TYPE test_up gauge\ntest_up 1\n'
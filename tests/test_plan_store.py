@@ -0,0 +1,33 @@
+# [file name]: tests/test_plan_store.py
+from plan_store import PlanStore
+
+
+def test_plan_is_visible_to_another_store_on_the_same_file(tmp_path):
+    db_path = str(tmp_path / 'plans.sqlite3')
+    PlanStore(db_path=db_path).put('plan-1', {'goal': 'Rust'}, {'unit_1': {}})
+
+    # A second store stands in for another worker process
+    plan = PlanStore(db_path=db_path).get('plan-1')
+    assert plan == {'syllabus': {'goal': 'Rust'}, 'lesson_plan': {'unit_1': {}}}
+
+
+def test_memory_and_file_reads_return_the_same_plan(tmp_path):
+    db_path = str(tmp_path / 'plans.sqlite3')
+    store = PlanStore(db_path=db_path)
+    store.put('plan-1', {'goal': 'Rust'}, {'course': 'Rust', 'comprehensive_lesson_plan': {}})
+
+    assert store.get('plan-1') == PlanStore(db_path=db_path).get('plan-1')
+
+
+def test_expired_plan_is_not_returned(tmp_path):
+    db_path = str(tmp_path / 'plans.sqlite3')
+    PlanStore(db_path=db_path).put('plan-1', {'goal': 'Rust'}, {})
+    assert PlanStore(db_path=db_path, ttl=-1).get('plan-1') is None
+
+
+def test_memory_only_store_evicts_oldest():
+    store = PlanStore(max_entries=1)
+    store.put('old', {'goal': 'a'}, {})
+    store.put('new', {'goal': 'b'}, {})
+    assert store.get('old') is None
+    assert store.get('new')['syllabus'] == {'goal': 'b'}
@@ -0,0 +1,88 @@
+# [file name]: tests/test_rate_limiter.py
+import pytest
+
+from rate_limiter import AdaptiveRateLimiter, RateLimitExceeded, is_rate_limit_error, retry_after_hint
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+class _Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_429_halves_the_cap_and_pauses_new_calls():
+    limiter = AdaptiveRateLimiter(6000, burst=10, max_concurrency=8, max_wait=0.05)
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=30)
+
+    state = limiter.snapshot()
+    assert state['concurrency_limit'] == 4
+    assert state['throttled'] == 1
+    assert state['paused_for'] >= 30
+    # The pause outlasts the wait budget, so the call is refused at once
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire()
+    assert limiter.snapshot()['rejected'] == 1
+
+
+def test_successes_grow_the_cap_back_without_passing_the_maximum():
+    limiter = AdaptiveRateLimiter(6000, burst=100, max_concurrency=4, max_wait=1)
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0)
+    assert limiter.snapshot()['concurrency_limit'] == 2
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.snapshot()['concurrency_limit'] == 4
+
+
+def test_call_retries_a_429_and_returns_the_result():
+    limiter = AdaptiveRateLimiter(6000, burst=10, max_concurrency=4, max_wait=1, max_retries=1)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise QuotaError("429 Resource has been exhausted. Please retry in 0.01s.")
+        return 'ok'
+
+    assert limiter.call(flaky) == 'ok'
+    assert len(attempts) == 2
+    assert limiter.snapshot()['in_flight'] == 0
+
+
+@pytest.mark.parametrize('error, expected', [
+    (QuotaError("429 Resource has been exhausted. Please retry in 7.5s."), 7.5),
+    (Exception("429 Quota exceeded\nretry_delay {\n  seconds: 12\n}"), 12.0),
+    (Exception("Too many requests, Retry-After: 3"), 3.0),
+    (Exception("429 Resource exhausted"), None),
+])
+def test_retry_after_hint_from_message(error, expected):
+    assert retry_after_hint(error) == expected
+
+
+def test_retry_after_header_wins_over_the_message():
+    error = QuotaError("retry in 99s")
+    error.response = _Response({'Retry-After': '4'})
+    assert retry_after_hint(error) == 4.0
+
+
+def test_rate_limit_errors_are_recognized():
+    assert is_rate_limit_error(QuotaError("quota"))
+    assert is_rate_limit_error(Exception("Resource exhausted for this project"))
+    assert not is_rate_limit_error(ValueError("bad JSON"))
+
+
+def test_set_budget_lowers_concurrency_and_burst():
+    limiter = AdaptiveRateLimiter(600, burst=10, max_concurrency=8, max_wait=0.05)
+    limiter.set_budget(600 / 4, burst=10 // 4, max_concurrency=8 // 4)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.snapshot()['concurrency_limit'] == 2
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire()
@@ -0,0 +1,21 @@
+# [file name]: tests/test_request_limits.py
+from request_limits import LongRequestLimiter
+
+
+def _app(environ, start_response):
+    start_response('200 OK', [])
+    return [b'ok']
+
+
+def test_rejected_request_is_reported():
+    rejected = []
+    limiter = LongRequestLimiter(_app, ('/api/ai/',), slots=1, wait_timeout=0.01,
+                                 on_reject=lambda environ: rejected.append(environ['PATH_INFO']))
+    limiter._semaphore.acquire()
+
+    statuses = []
+    body = limiter({'PATH_INFO': '/api/ai/chat'}, lambda status, headers: statuses.append(status))
+    assert statuses == ['503 Service Unavailable']
+    assert b'busy' in b''.join(body)
+    assert rejected == ['/api/ai/chat']
+    assert limiter.snapshot()['rejected'] == 1
@@ -0,0 +1,60 @@
+# [file name]: tests/test_request_profiler.py
+import os
+
+from request_profiler import RequestProfiler
+
+
+def _app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
+
+
+def _call(profiler, token=None, path='/api/health'):
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}
+    if token is not None:
+        environ['HTTP_X_PROFILE_TOKEN'] = token
+    headers = []
+    body = profiler(environ, lambda status, response_headers, exc_info=None: headers.extend(response_headers))
+    data = b''.join(body)
+    if hasattr(body, 'close'):
+        body.close()
+    return data, dict(headers)
+
+
+def test_wrong_or_missing_token_is_not_profiled(tmp_path):
+    profiler = RequestProfiler(_app, str(tmp_path), 'secret')
+    for token in (None, '', 'wrong', 'secret-but-longer'):
+        data, headers = _call(profiler, token)
+        assert data == b'ok'
+        assert 'X-Profile-Id' not in headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_profiling_is_off_without_an_admin_token(tmp_path):
+    profiler = RequestProfiler(_app, str(tmp_path), '')
+    assert not profiler.enabled
+    assert not profiler.is_authorized('')
+    _call(profiler, '')
+    assert os.listdir(tmp_path) == []
+
+
+def test_matching_token_saves_a_profile(tmp_path):
+    profiler = RequestProfiler(_app, str(tmp_path), 'secret')
+    data, headers = _call(profiler, 'secret', '/api/ai/chat')
+    assert data == b'ok'
+    [profile] = profiler.list_profiles()
+    assert profile['name'].startswith(headers['X-Profile-Id'])
+    assert '_GET_api-ai-chat_' in profile['name']
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    for name in ('20260101-000000-000001_GET_a_1ms.prof', '20260101-000000-000002_GET_b_1ms.prof'):
+        (tmp_path / name).write_bytes(b'')
+    (tmp_path / 'notes.txt').write_text('kept')
+    profiler = RequestProfiler(_app, str(tmp_path), 'secret', max_files=2)
+
+    _call(profiler, 'secret')
+    names = [profile['name'] for profile in profiler.list_profiles()]
+    assert len(names) == 2
+    assert '20260101-000000-000001_GET_a_1ms.prof' not in names
+    assert (tmp_path / 'notes.txt').exists()
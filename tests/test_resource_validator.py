@@ -0,0 +1,16 @@
+# [file name]: tests/test_resource_validator.py
+import resource_validator
+
+
+def test_malformed_url_is_unverified_without_failing_the_batch(monkeypatch, tmp_path):
+    monkeypatch.setattr(resource_validator, 'probe_url', lambda url, r_type='': (True, 200))
+    monkeypatch.setattr(resource_validator._verification_cache, 'db_path', str(tmp_path / 'links.sqlite3'))
+    monkeypatch.setattr(resource_validator._verification_cache, '_conn', None)
+
+    validated = resource_validator.validate_resources([
+        {'title': 'Bad port', 'type': 'Article', 'url': 'http://x:abc/'},
+        {'title': 'Bad host', 'type': 'Article', 'url': 'http://[::1/'},
+        {'title': 'Docs', 'type': 'Article', 'url': 'https://docs.example.org/guide'},
+    ])
+
+    assert [entry['verified'] for entry in validated] == [False, False, True]
@@ -0,0 +1,62 @@
+# [file name]: tests/test_service_registry.py
+import threading
+
+import pytest
+
+from service_registry import ServiceRegistry, ServiceUnavailable
+
+
+def test_factory_runs_once_on_first_use():
+    calls = []
+    registry = ServiceRegistry()
+    registry.register('client', lambda: calls.append(1) or object())
+    assert calls == []
+    assert registry.snapshot() == {'client': {'state': 'not_loaded'}}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get('client'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+    assert registry.snapshot()['client']['state'] == 'ready'
+
+
+def test_failure_is_remembered_until_retry_after(monkeypatch):
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ImportError("SDK not installed")
+        return 'client'
+
+    now = [1000.0]
+    monkeypatch.setattr('service_registry.time.monotonic', lambda: now[0])
+    registry = ServiceRegistry(retry_after=300)
+    registry.register('client', factory)
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailable):
+            registry.get('client')
+    assert len(attempts) == 1
+    assert registry.snapshot()['client'] == {'state': 'failed', 'error': 'SDK not installed'}
+
+    now[0] += 301
+    assert registry.get('client') == 'client'
+    assert len(attempts) == 2
+
+
+def test_warm_up_builds_services_in_the_background():
+    registry = ServiceRegistry()
+    registry.register('client', lambda: 'client')
+    registry.register('broken', lambda: 1 / 0)
+    warmed = []
+
+    registry.warm_up('client', 'broken', lambda: warmed.append(1)).join(5)
+    assert registry.snapshot()['client']['state'] == 'ready'
+    assert registry.snapshot()['broken']['state'] == 'failed'
+    assert warmed == [1]
@@ -0,0 +1,110 @@
+# [file name]: tests/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def _start_waiters(flight, key, count, fn, timeout=5):
+    outcomes = []
+    lock = threading.Lock()
+
+    def wait():
+        try:
+            result = flight.do(key, fn, timeout)
+        except Exception as e:
+            result = e
+        with lock:
+            outcomes.append(result)
+
+    threads = [threading.Thread(target=wait) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def _leader(flight, key, release, result=None, error=None):
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    thread = threading.Thread(target=lambda: _swallow(flight.do, key, fn))
+    thread.start()
+    started.wait(5)
+    return thread
+
+
+def _swallow(fn, *args):
+    try:
+        fn(*args)
+    except Exception:
+        pass
+
+
+def _wait_for_waiters(flight, count):
+    for _ in range(500):
+        if flight.snapshot()['coalesced'] >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError("waiters never joined the call")
+
+
+def test_waiters_share_the_leaders_result():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = _leader(flight, 'prompt', release, result='answer')
+    threads, outcomes = _start_waiters(flight, 'prompt', 3, lambda: 'not called')
+    _wait_for_waiters(flight, 3)
+
+    release.set()
+    for thread in threads + [leader]:
+        thread.join(5)
+    assert outcomes == ['answer'] * 3
+    assert flight.snapshot() == {'leaders': 1, 'coalesced': 3, 'timeouts': 0, 'in_flight': 0}
+
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+    release = threading.Event()
+    error = RuntimeError("upstream failed")
+    leader = _leader(flight, 'prompt', release, error=error)
+    threads, outcomes = _start_waiters(flight, 'prompt', 3, lambda: 'not called')
+    _wait_for_waiters(flight, 3)
+
+    release.set()
+    for thread in threads + [leader]:
+        thread.join(5)
+    assert outcomes == [error] * 3
+    # The failed call is forgotten, so the next caller runs fn again
+    assert flight.do('prompt', lambda: 'retried') == 'retried'
+
+
+def test_waiter_times_out_while_the_leader_keeps_running():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = _leader(flight, 'prompt', release, result='late answer')
+
+    with pytest.raises(TimeoutError):
+        flight.do('prompt', lambda: 'not called', timeout=0.05)
+    assert flight.snapshot()['timeouts'] == 1
+    assert flight.snapshot()['in_flight'] == 1
+
+    release.set()
+    leader.join(5)
+    assert flight.snapshot()['in_flight'] == 0
+
+
+def test_different_keys_do_not_wait_on_each_other():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = _leader(flight, 'a', release, result='a')
+    assert flight.do('b', lambda: 'b', timeout=0.05) == 'b'
+    release.set()
+    leader.join(5)